@@ -2,14 +2,20 @@ import pygame
 import sys
 import math
 import os
+import random
+import threading
 import time
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import game_assets
+import search_stats
+
 # --- Game Setup ---
-pygame.init()
+# pygame and the window are only set up in main(), so the engine can be imported headless.
 WIDTH, HEIGHT = 600, 600
 CELL_SIZE = WIDTH // 8
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Chess: Wehrmacht vs the British")
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
+screen = None
 
 # Colors
 WHITE = (240, 217, 181)
@@ -18,36 +24,49 @@ HIGHLIGHT = (186, 202, 68)
 CHECK_RED = (255, 0, 0)
 TEXT_COLOR = (40, 40, 40)
 
-# Font for messages
-MSG_FONT = pygame.font.SysFont("Arial", 40)
-
 # --- Asset Loading ---
 PIECES = {}
 def load_piece_images():
+    """Loads all 12 piece images at once (cached on disk, converted to the display format)."""
     sides = ["wehrmacht", "british"]
     types = ["Pawn", "Rook", "Knight", "Bishop", "Queen", "King"] 
     kind_to_file = {'Pawn': 'pawn', 'Rook': 'rook', 'Knight': 'knight', 
                     'Bishop': 'bishop', 'Queen': 'queen', 'King': 'king'}
 
+    specs = {}
     for side in sides:
-        PIECES[side] = {}
         for kind in types:
-            file_name = kind_to_file[kind]
-            path = os.path.join("assets", side, f"{file_name}.png")
-            try:
-                img = pygame.image.load(path)
-                img = pygame.transform.scale(img, (CELL_SIZE, CELL_SIZE))
-                PIECES[side][kind] = img
-            except pygame.error:
-                PIECES[side][kind] = None 
+            path = os.path.join("assets", side, f"{kind_to_file[kind]}.png")
+            specs[(side, kind)] = game_assets.ImageSpec(path, (CELL_SIZE, CELL_SIZE), smooth=False)
+
+    images = game_assets.load_images(specs, GAME_DIR)
+    for side in sides:
+        PIECES[side] = {kind: images[(side, kind)] for kind in types}
 
-# Attempt to load images on startup
-load_piece_images()
+def init_game_window():
+    """Opens the window and loads the piece images. Called once from main()."""
+    global screen
+    screen = game_assets.init_display(WIDTH, HEIGHT, "Chess: Wehrmacht vs the British")
+    load_piece_images()
 
 
 
 # --- Chess Logic Classes ---
 
+# Zobrist keys: one random 64-bit number per (side, kind, square), XORed together into a
+# position hash that make_move/undo_move update incrementally (fixed seed: keys are stable
+# across runs, so hashes can be stored).
+SIDES = ("wehrmacht", "british")
+KINDS = ("Pawn", "Knight", "Bishop", "Rook", "Queen", "King")
+_zobrist_rng = random.Random(1940)
+ZOBRIST = {(side, kind): [_zobrist_rng.getrandbits(64) for _ in range(64)] for side in SIDES for kind in KINDS}
+ZOBRIST_BRITISH_TO_MOVE = _zobrist_rng.getrandbits(64)
+
+ORTHOGONALS = [(1,0),(-1,0),(0,1),(0,-1)]
+DIAGONALS = [(1,1),(-1,-1),(1,-1),(-1,1)]
+KNIGHT_STEPS = [(2,1),(2,-1),(-2,1),(-2,-1),(1,2),(1,-2),(-1,2),(-1,-2)]
+KING_STEPS = [(-1,-1),(-1,0),(-1,1),(0,-1),(0,1),(1,-1),(1,0),(1,1)]
+
 class Piece:
     def __init__(self, side, kind):
         self.side = side 
@@ -61,6 +80,12 @@ class Move:
         self.piece_captured = board[self.end_row][self.end_col]
         self.is_promotion = is_promotion
         self.promotion_piece = Piece(self.piece_moved.side, "Queen") if is_promotion else None
+        self.prev_hash = None  # position hash before make_move, restored by undo_move
+
+    def __repr__(self):
+        # Coordinate notation, e.g. e7e5 (row 0 is the British back rank, i.e. rank 8)
+        return "abcdefgh"[self.start_col] + str(8 - self.start_row) + \
+               "abcdefgh"[self.end_col] + str(8 - self.end_row)
 
     def __eq__(self, other):
         if isinstance(other, Move):
@@ -76,6 +101,30 @@ class GameState:
         self.british_king_loc = (0, 4)
         self.checkmate = False
         self.stalemate = False
+        self.hash = self._compute_hash()
+        self.nnue = None  # nnue.Accumulator kept in step with the board, when a network evaluates
+
+    def _compute_hash(self):
+        h = 0
+        for r in range(8):
+            for c in range(8):
+                piece = self.board[r][c]
+                if piece:
+                    h ^= ZOBRIST[piece.side, piece.kind][r * 8 + c]
+        return h
+
+    def position_key(self):
+        """Zobrist hash of the pieces and the side to move (for the transposition table)."""
+        return self.hash if self.white_to_move else self.hash ^ ZOBRIST_BRITISH_TO_MOVE
+
+    def copy(self):
+        """Independent position for a search (pieces are shared; moves never change them)."""
+        gs = GameState.__new__(GameState)
+        gs.__dict__.update(self.__dict__)
+        gs.board = [row[:] for row in self.board]
+        if self.nnue is not None:
+            gs.nnue = self.nnue.copy()
+        return gs
 
     def _init_board(self):
         board = [[None]*8 for _ in range(8)]
@@ -99,8 +148,14 @@ class GameState:
 
     def make_move(self, move, screen=None):
         """Executes a move but DOES NOT change self.white_to_move."""
+        piece = move.piece_moved
+        captured = move.piece_captured
+        move.prev_hash = h = self.hash
+        h ^= ZOBRIST[piece.side, piece.kind][move.start_row * 8 + move.start_col]
+        if captured:
+            h ^= ZOBRIST[captured.side, captured.kind][move.end_row * 8 + move.end_col]
         self.board[move.start_row][move.start_col] = None
-        self.board[move.end_row][move.end_col] = move.piece_moved
+        self.board[move.end_row][move.end_col] = piece
 
         # Update King location
         if move.piece_moved.kind == 'King':
@@ -116,15 +171,26 @@ class GameState:
 
                 if screen:  # Human player -> ask choice
                     choice = ask_promotion_choice(screen, move.piece_moved.side)
-                else:       # AI auto-queen
-                    choice = "Queen"
+                else:       # AI auto-queen (unless the move already names its piece)
+                    choice = move.promotion_piece.kind if move.promotion_piece else "Queen"
 
-                move.piece_moved.kind = choice
+                # A new piece replaces the pawn, so undo_move can put the pawn back unchanged
+                if move.promotion_piece is None or move.promotion_piece.kind != choice:
+                    move.promotion_piece = Piece(piece.side, choice)
+                piece = move.promotion_piece
+                self.board[move.end_row][move.end_col] = piece
+
+        self.hash = h ^ ZOBRIST[piece.side, piece.kind][move.end_row * 8 + move.end_col]
+        if self.nnue is not None:
+            self.nnue.make_move(move, piece)
 
     def undo_move(self, move):
         """Reverts a move, crucial for Minimax."""
+        if self.nnue is not None:
+            self.nnue.undo_move(move, self.board[move.end_row][move.end_col])
         self.board[move.start_row][move.start_col] = move.piece_moved
         self.board[move.end_row][move.end_col] = move.piece_captured 
+        self.hash = move.prev_hash
 
         # Revert King location
         if move.piece_moved.kind == 'King':
@@ -139,23 +205,10 @@ class GameState:
     def get_valid_moves(self):
         #Returns all moves that DO NOT leave the player's own King in check.
         moves = self.get_pseudo_legal_moves()
-        legal_moves = []
         current_player_side = "wehrmacht" if self.white_to_move else "british"
-        
-        for move in moves:
-            # 1. Temporarily make the move
-            self.make_move(move)
-            
-            # 2. Check if the current player's King is in check 
-            #    We use is_square_attacked and tell it the opponent's side
-            king_r, king_c = self.wehrmacht_king_loc if self.white_to_move else self.british_king_loc
-            
-            # The square is attacked by the opponent if the opponent's moves can reach it
-            if not self.is_square_attacked(king_r, king_c, current_player_side):
-                legal_moves.append(move)
-                
-            # 3. Undo the move (backtrack)
-            self.undo_move(move)
+        nnue, self.nnue = self.nnue, None  # the trial moves below don't need the accumulator
+        legal_moves = [move for move in moves if self.is_legal(move)]
+        self.nnue = nnue
             
         # Check for game over conditions
         if len(legal_moves) == 0:
@@ -167,6 +220,13 @@ class GameState:
                 
         return legal_moves
 
+    def is_legal(self, move):
+        """True if a pseudo-legal move of the side to move doesn't leave its own King attacked."""
+        self.make_move(move)
+        legal = not self.is_in_check()
+        self.undo_move(move)
+        return legal
+
     def is_in_check(self, king_side=None):
         """Checks if the specified side's King is currently under attack."""
         if king_side is None:
@@ -178,40 +238,83 @@ class GameState:
 
     def is_square_attacked(self, r, c, target_side):
         """Checks if the square (r, c) is attacked by the OPPONENT of target_side."""
+        attacker_side = "british" if target_side == "wehrmacht" else "wehrmacht"
+        return self.least_valuable_attacker(r, c, attacker_side) is not None
+
+    def least_valuable_attacker(self, r, c, attacker_side):
+        """(row, col) of the cheapest attacker_side piece attacking (r, c), or None.
+
+        Looks outwards from the square (pawn and knight squares, the first piece along each
+        ray, the king) instead of generating the attacker's moves.
+        """
+        board = self.board
+        # A wehrmacht pawn attacks upwards (towards row 0), so it stands one row below
+        pr = r + 1 if attacker_side == "wehrmacht" else r - 1
+        if 0 <= pr < 8:
+            for pc in (c - 1, c + 1):
+                if 0 <= pc < 8:
+                    piece = board[pr][pc]
+                    if piece and piece.side == attacker_side and piece.kind == "Pawn":
+                        return pr, pc
+        for dr, dc in KNIGHT_STEPS:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < 8 and 0 <= nc < 8:
+                piece = board[nr][nc]
+                if piece and piece.side == attacker_side and piece.kind == "Knight":
+                    return nr, nc
+        queen = None
+        for directions, kind in ((DIAGONALS, "Bishop"), (ORTHOGONALS, "Rook")):
+            for dr, dc in directions:
+                nr, nc = r + dr, c + dc
+                while 0 <= nr < 8 and 0 <= nc < 8:
+                    piece = board[nr][nc]
+                    if piece:
+                        if piece.side == attacker_side:
+                            if piece.kind == kind:
+                                return nr, nc
+                            if piece.kind == "Queen" and queen is None:
+                                queen = nr, nc
+                        break
+                    nr += dr
+                    nc += dc
+        if queen is not None:
+            return queen
+        for dr, dc in KING_STEPS:
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < 8 and 0 <= nc < 8:
+                piece = board[nr][nc]
+                if piece and piece.side == attacker_side and piece.kind == "King":
+                    return nr, nc
+        return None
         
-        # We need to know who the attacker is (the opponent)
-        # So we temporarily set 'white_to_move' to the attacker's turn
-        attacker_is_white = (target_side == "british") 
-        original_white_to_move = self.white_to_move 
-        
-        self.white_to_move = attacker_is_white 
-        
-        # Generate the attacker's pseudo-legal moves
-        attacker_moves = self.get_pseudo_legal_moves()
-        
-        # Restore the original turn state immediately after generating moves
-        self.white_to_move = original_white_to_move
+    def get_pseudo_legal_moves(self, captures=True, quiets=True):
+        """Generates all possible moves for the current player, ignoring King safety.
 
-        for move in attacker_moves:
-            if move.end_row == r and move.end_col == c:
-                return True
-        return False
-        
-    def get_pseudo_legal_moves(self):
-        """Generates all possible moves for the current player, ignoring King safety."""
+        captures/quiets select the tactical moves (captures and promotions) and the rest.
+        """
         moves = []
         current_side = "wehrmacht" if self.white_to_move else "british"
         for r in range(8):
             for c in range(8):
                 piece = self.board[r][c]
                 if piece and piece.side == current_side:
-                    self._generate_piece_moves(r, c, moves)
+                    self._generate_piece_moves(r, c, moves, captures, quiets)
         return moves
 
+    def pseudo_legal_move(self, key):
+        """The pseudo-legal move (r0, c0, r1, c1) of the side to move, or None (for hash and killer moves)."""
+        r0, c0, r1, c1 = key
+        piece = self.board[r0][c0]
+        if not piece or piece.side != ("wehrmacht" if self.white_to_move else "british"):
+            return None
+        moves = []
+        self._generate_piece_moves(r0, c0, moves)
+        return next((move for move in moves if move.end_row == r1 and move.end_col == c1), None)
+
     # --- Piece-specific Move Generation (Standard Chess Rules) ---
-    # (Remains unchanged as movement logic was already sound)
+    # (captures also covers promotions, so a staged search can ask for them first)
     
-    def _generate_piece_moves(self, r, c, moves):
+    def _generate_piece_moves(self, r, c, moves, captures=True, quiets=True):
         piece = self.board[r][c]
         side = piece.side
         kind = piece.kind
@@ -223,22 +326,24 @@ class GameState:
 
             if 0 <= r + dir < 8 and not self.board[r + dir][c]:
                 is_promotion = (r + dir == 0) or (r + dir == 7)
-                moves.append(Move((r, c), (r + dir, c), self.board, is_promotion))
-                if r == start_row and not self.board[r + 2 * dir][c]:
+                if captures if is_promotion else quiets:
+                    moves.append(Move((r, c), (r + dir, c), self.board, is_promotion))
+                if quiets and r == start_row and not self.board[r + 2 * dir][c]:
                     moves.append(Move((r, c), (r + 2 * dir, c), self.board))
 
-            for dc in [-1, 1]:
-                if 0 <= c + dc < 8 and 0 <= r + dir < 8:
-                    target = self.board[r + dir][c + dc]
-                    if target and target.side == opponent_side:
-                        is_promotion = (r + dir == 0) or (r + dir == 7)
-                        moves.append(Move((r, c), (r + dir, c + dc), self.board, is_promotion))
+            if captures:
+                for dc in [-1, 1]:
+                    if 0 <= c + dc < 8 and 0 <= r + dir < 8:
+                        target = self.board[r + dir][c + dc]
+                        if target and target.side == opponent_side:
+                            is_promotion = (r + dir == 0) or (r + dir == 7)
+                            moves.append(Move((r, c), (r + dir, c + dc), self.board, is_promotion))
 
         elif kind in ["Rook", "Bishop", "Queen"]:
             directions = {
-                "Rook": [(1,0),(-1,0),(0,1),(0,-1)],
-                "Bishop": [(1,1),(-1,-1),(1,-1),(-1,1)],
-                "Queen": [(1,0),(-1,0),(0,1),(0,-1),(1,1),(-1,-1),(1,-1),(-1,1)]
+                "Rook": ORTHOGONALS,
+                "Bishop": DIAGONALS,
+                "Queen": ORTHOGONALS + DIAGONALS
             }[kind]
             
             for dr, dc in directions:
@@ -247,31 +352,23 @@ class GameState:
                     if 0 <= end_r < 8 and 0 <= end_c < 8:
                         target = self.board[end_r][end_c]
                         if not target:
-                            moves.append(Move((r, c), (end_r, end_c), self.board))
+                            if quiets:
+                                moves.append(Move((r, c), (end_r, end_c), self.board))
                         elif target.side == opponent_side:
-                            moves.append(Move((r, c), (end_r, end_c), self.board))
+                            if captures:
+                                moves.append(Move((r, c), (end_r, end_c), self.board))
                             break 
                         else: 
                             break
                     else:
                         break
 
-        elif kind == "Knight":
-            candidates = [(2,1),(2,-1),(-2,1),(-2,-1),(1,2),(1,-2),(-1,2),(-1,-2)]
-            for dr, dc in candidates:
+        else:  # Knight or King
+            for dr, dc in KNIGHT_STEPS if kind == "Knight" else KING_STEPS:
                 end_r, end_c = r + dr, c + dc
                 if 0 <= end_r < 8 and 0 <= end_c < 8:
                     target = self.board[end_r][end_c]
-                    if not target or target.side == opponent_side:
-                        moves.append(Move((r, c), (end_r, end_c), self.board))
-
-        elif kind == "King":
-            candidates = [(-1,-1),(-1,0),(-1,1),(0,-1),(0,1),(1,-1),(1,0),(1,1)]
-            for dr, dc in candidates:
-                end_r, end_c = r + dr, c + dc
-                if 0 <= end_r < 8 and 0 <= end_c < 8:
-                    target = self.board[end_r][end_c]
-                    if not target or target.side == opponent_side:
+                    if (quiets and not target) or (captures and target and target.side == opponent_side):
                         moves.append(Move((r, c), (end_r, end_c), self.board))
 
 
@@ -279,12 +376,48 @@ class GameState:
 
 PIECE_VALUES = {"Pawn":1, "Knight":3, "Bishop":3, "Rook":5, "Queen":9, "King":1000}
 
+STATS = None  # search_stats.SearchStats while a traced find_ai_move runs
+
+def see(gs, move):
+    """Static exchange evaluation: material the mover wins with a capture, in pawns.
+
+    Both sides keep recapturing on the target square with their cheapest attacker (each
+    may stop when that would lose material); pieces lined up behind a capturer join in
+    because attackers are looked up again after every capture.
+    """
+    board = gs.board
+    piece, captured = move.piece_moved, move.piece_captured
+    r, c = move.end_row, move.end_col
+    board[move.start_row][move.start_col] = None
+    board[r][c] = piece
+    score = PIECE_VALUES[captured.kind] - _exchange(gs, r, c, "british" if piece.side == "wehrmacht" else "wehrmacht")
+    board[r][c] = captured
+    board[move.start_row][move.start_col] = piece
+    return score
+
+def _exchange(gs, r, c, side):
+    """What `side` gains by capturing on (r, c) with its cheapest attacker, 0 if it shouldn't."""
+    attacker = gs.least_valuable_attacker(r, c, side)
+    if attacker is None:
+        return 0
+    board = gs.board
+    ar, ac = attacker
+    piece, target = board[ar][ac], board[r][c]
+    board[ar][ac] = None
+    board[r][c] = piece
+    gain = PIECE_VALUES[target.kind] - _exchange(gs, r, c, "british" if side == "wehrmacht" else "wehrmacht")
+    board[r][c] = target
+    board[ar][ac] = piece
+    return max(0, gain)
+
 def evaluate(gs):
     """Scores the board from the British (AI/Black) perspective."""
     if gs.checkmate:
         return 1000000 if gs.white_to_move else -1000000
     if gs.stalemate:
         return 0
+    if gs.nnue is not None:  # neural evaluation from the incrementally updated accumulator
+        return gs.nnue.evaluate()
 
     score = 0
     for row in gs.board:
@@ -294,21 +427,437 @@ def evaluate(gs):
                 score += val if piece.side == "british" else -val
     return score
 
-def find_ai_move(gs, depth=7):
-    """AI entry point, calls Minimax."""
+# --- AI with Principal Variation Search ---
+# Negamax form: every score is from the point of view of the side to move. The first move
+# at a node is searched with the full window, the others with a null window (alpha, alpha + 1)
+# that only proves they are no better; a move that does beat alpha is searched again with
+# the full window. Null-move pruning and late-move reductions shrink the tree further, and a
+# transposition table (Zobrist keys) carries best moves from one deepening iteration to the next.
+
+AI_DEPTH = 4         # plies searched by the AI in the game
+AI_TIME_LIMIT = 3.0  # seconds; iterative deepening stops at the last finished depth
+
+MATE = 1000000
+MATE_BOUND = MATE - 1000  # scores beyond this are mates, MATE - plies to the mate
+EXACT, LOWER, UPPER = 0, 1, 2  # transposition-table bounds
+
+def reduction_table(base=0.75, divisor=2.25, max_depth=32, max_moves=64):
+    """table[depth][move_number]: plies taken off a late quiet move, base + ln(depth) * ln(n) / divisor."""
+    table = [[0] * max_moves for _ in range(max_depth)]
+    for depth in range(1, max_depth):
+        for n in range(1, max_moves):
+            table[depth][n] = max(0, int(base + math.log(depth) * math.log(n) / divisor))
+    return table
+
+class SearchConfig:
+    """Pruning settings of the search (the defaults are used by the game)."""
+
+    def __init__(self, null_move=True, null_reduction=2, null_min_depth=3,
+                 lmr=True, lmr_min_depth=3, lmr_min_moves=3, lmr_base=0.75, lmr_divisor=2.25,
+                 reductions=None, tt_size=1 << 20, network=None):
+        self.null_move = null_move
+        self.null_reduction = null_reduction  # R: the null-move search is depth - 1 - R plies
+        self.null_min_depth = null_min_depth
+        self.lmr = lmr
+        self.lmr_min_depth = lmr_min_depth    # no reductions closer to the leaves than this
+        self.lmr_min_moves = lmr_min_moves    # the first lmr_min_moves moves are never reduced
+        self.reductions = reductions or reduction_table(lmr_base, lmr_divisor)
+        self.tt_size = tt_size
+        self.network = network  # nnue.Network evaluating the leaves, or None for material
+
+class TranspositionTable:
+    """Position key -> (depth, bound, score, best move as (r0, c0, r1, c1)); cleared when full."""
+
+    def __init__(self, max_entries=1 << 20):
+        self.entries = {}
+        self.max_entries = max_entries
+
+    def get(self, key):
+        return self.entries.get(key)
+
+    def put(self, key, depth, bound, score, move):
+        entries = self.entries
+        old = entries.get(key)
+        if old is not None:
+            if old[0] > depth and bound != EXACT:
+                return  # keep the deeper result
+            if move is None:
+                move = old[3]
+        elif len(entries) >= self.max_entries:
+            entries.clear()
+        entries[key] = (depth, bound, score, move)
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+class SearchAborted(Exception):
+    """Raised inside the search when its time runs out or stop() is called."""
+
+def _move_key(move):
+    return (move.start_row, move.start_col, move.end_row, move.end_col) if move else None
+
+def _capture_order(move):
+    """Most valuable victim first, then least valuable attacker; promotions after captures."""
+    captured = move.piece_captured
+    if captured:
+        return 16 * PIECE_VALUES[captured.kind] - min(PIECE_VALUES[move.piece_moved.kind], 10)
+    return -16
+
+def _has_pieces(gs, side):
+    """True if `side` has a piece besides pawns and the king (null moves are unsafe in pawn endings)."""
+    for row in gs.board:
+        for piece in row:
+            if piece and piece.side == side and piece.kind not in ("Pawn", "King"):
+                return True
+    return False
+
+class Searcher:
+    """Iterative-deepening PVS with counters for its re-searches and prunings."""
+
+    def __init__(self, config=None, tt=None):
+        self.config = config or SearchConfig()
+        self.tt = tt if tt is not None else TranspositionTable(self.config.tt_size)
+        self.deadline = None
+        self.node_limit = math.inf
+        self.stopped = False
+        self.root_move = None
+        self.nodes = 0
+        self.scout_searches = 0   # null-window searches of the moves after the first
+        self.pvs_researches = 0   # ... that landed inside the window and were searched again
+        self.null_tries = 0
+        self.null_cutoffs = 0
+        self.lmr_reductions = 0
+        self.lmr_researches = 0   # reduced searches that beat alpha and were redone at full depth
+        self.move_nodes = 0       # nodes that went through their moves
+        self.quiet_generations = 0  # ... of which got as far as generating quiet moves
+        self.killers = {}         # ply -> the last two quiet moves that caused a cutoff there
+
+    def stop(self):
+        self.stopped = True
+
+    def counters(self):
+        rate = lambda part, whole: round(part / whole, 4) if whole else 0.0
+        return {
+            "search_nodes": self.nodes,
+            "scout_searches": self.scout_searches,
+            "pvs_researches": self.pvs_researches,
+            "pvs_research_rate": rate(self.pvs_researches, self.scout_searches),
+            "null_tries": self.null_tries,
+            "null_cutoffs": self.null_cutoffs,
+            "null_cutoff_rate": rate(self.null_cutoffs, self.null_tries),
+            "lmr_reductions": self.lmr_reductions,
+            "lmr_researches": self.lmr_researches,
+            "lmr_research_rate": rate(self.lmr_researches, self.lmr_reductions),
+            "quiet_generations": self.quiet_generations,
+            "quiet_generation_rate": rate(self.quiet_generations, self.move_nodes),
+        }
+
+    def prepare(self, time_limit=None, max_nodes=None):
+        """Clears the stop flag and sets the limits of the next search."""
+        self.stopped = False
+        self.killers = {}
+        self.deadline = time.perf_counter() + time_limit if time_limit else None
+        self.node_limit = self.nodes + max_nodes if max_nodes else math.inf
+
+    def search(self, gs, max_depth, time_limit=None, max_nodes=None, prepared=False):
+        """Deepens 1, 2, ... max_depth plies (or until time_limit seconds or max_nodes nodes).
+
+        With prepared=True the limits of an earlier prepare() call are kept: a search run in
+        another thread must not reset a deadline or stop() set from the calling thread.
+        Returns (move, score, depth reached).
+        """
+        gs = gs.copy()  # an aborted search leaves its moves on the board
+        if self.config.network is not None and gs.nnue is None:
+            gs.nnue = self.config.network.accumulator(gs)
+        if not prepared:
+            self.prepare(time_limit, max_nodes)
+        best_move, best_score, reached = None, None, 0
+        for depth in range(1, max_depth + 1):
+            self.root_move = None
+            try:
+                score = self.pvs(gs, depth, -MATE - 1, MATE + 1, 0, True, None)
+            except SearchAborted:
+                if self.root_move is not None:  # searched fully before the abort: at least as good
+                    best_move = self.root_move
+                break
+            best_move, best_score, reached = self.root_move, score, depth
+            if STATS is not None:
+                STATS.iteration_done(depth)
+            if best_move is None or abs(score) > MATE_BOUND:
+                break  # no legal moves, or a forced mate found
+        return best_move, best_score, reached
+
+    def staged_moves(self, gs, hash_move, ply, depth):
+        """Pseudo-legal moves in search order, generated a stage at a time.
+
+        Hash move; captures that don't lose material (SEE) and promotions, by MVV/LVA; the
+        killer moves of this ply; quiet moves; losing captures. A cutoff stops the generator,
+        so a node refuted by an early move never generates its quiet moves. One ply from the
+        leaves no recapture is searched, so captures stay in MVV/LVA order there.
+        """
+        seen = []
+        if hash_move is not None:
+            move = gs.pseudo_legal_move(hash_move)
+            if move is not None:
+                seen.append(hash_move)
+                yield move
+        tactical = gs.get_pseudo_legal_moves(True, False)
+        tactical.sort(key=_capture_order, reverse=True)
+        losing = []
+        for move in tactical:
+            if seen and _move_key(move) in seen:
+                continue
+            captured = move.piece_captured
+            if (depth > 1 and captured and PIECE_VALUES[move.piece_moved.kind] > PIECE_VALUES[captured.kind]
+                    and see(gs, move) < 0):
+                losing.append(move)
+                continue
+            yield move
+        for killer in self.killers.get(ply, ()):
+            if killer not in seen:
+                move = gs.pseudo_legal_move(killer)
+                if move is not None and move.piece_captured is None and not move.is_promotion:
+                    seen.append(killer)
+                    yield move
+        self.quiet_generations += 1
+        for move in gs.get_pseudo_legal_moves(False, True):
+            if not seen or _move_key(move) not in seen:
+                yield move
+        yield from losing
+
+    def pvs(self, gs, depth, alpha, beta, ply, allow_null, in_check):
+        self.nodes += 1
+        if self.stopped or self.nodes > self.node_limit or (self.deadline is not None and self.nodes & 63 == 0
+                                                            and time.perf_counter() > self.deadline):
+            raise SearchAborted
+        stats = STATS
+        if stats is not None:
+            stats.visit(ply)
+        pv_node = beta - alpha > 1
+
+        # Transposition table: a deep enough result may answer this node outright
+        key = gs.position_key()
+        entry = self.tt.get(key)
+        hash_move = None
+        if stats is not None:
+            stats.tt_probes += 1
+            stats.tt_hits += entry is not None
+        if entry is not None:
+            hash_move = entry[3]
+            if ply > 0 and not pv_node and entry[0] >= depth:
+                score = entry[2]
+                if score > MATE_BOUND:
+                    score -= ply
+                elif score < -MATE_BOUND:
+                    score += ply
+                bound = entry[1]
+                if bound == EXACT or (bound == LOWER and score >= beta) or (bound == UPPER and score <= alpha):
+                    return score
+
+        if depth <= 0:
+            if stats is not None:
+                stats.leaves += 1
+            score = evaluate(gs)
+            return -score if gs.white_to_move else score
+
+        side = "wehrmacht" if gs.white_to_move else "british"
+        config = self.config
+        if in_check is None and depth >= min(config.null_min_depth, config.lmr_min_depth):
+            in_check = gs.is_in_check(side)  # otherwise only needed when there are no moves
+
+        # Null move: let the opponent move twice; if we still reach beta, this node will too
+        if (allow_null and config.null_move and not pv_node and not in_check and depth >= config.null_min_depth
+                and abs(beta) < MATE_BOUND and _has_pieces(gs, side)):
+            self.null_tries += 1
+            gs.white_to_move = not gs.white_to_move
+            score = -self.pvs(gs, depth - 1 - config.null_reduction, -beta, -beta + 1, ply + 1, False, False)
+            gs.white_to_move = not gs.white_to_move
+            if score >= beta:
+                self.null_cutoffs += 1
+                return beta
+
+        self.move_nodes += 1
+        reductions = config.reductions
+        max_depth, max_moves = len(reductions) - 1, len(reductions[0]) - 1
+        original_alpha = alpha
+        best_score, best_move = -MATE - 1, None
+        searched = 0  # legal moves tried (illegal ones are only found when their turn comes)
+        for move in self.staged_moves(gs, hash_move, ply, depth):
+            gs.make_move(move)
+            if gs.is_in_check(side):  # leaves the own king attacked
+                gs.undo_move(move)
+                continue
+            gs.white_to_move = not gs.white_to_move
+            i = searched
+            searched += 1
+            if i == 0:
+                score = -self.pvs(gs, depth - 1, -beta, -alpha, ply + 1, True, None)
+            else:
+                # Late quiet moves that don't give check are searched shallower first
+                r = 0
+                gives_check = None
+                if (config.lmr and depth >= config.lmr_min_depth and i >= config.lmr_min_moves and not in_check
+                        and move.piece_captured is None and not move.is_promotion):
+                    gives_check = gs.is_in_check()
+                    if not gives_check:
+                        r = min(reductions[min(depth, max_depth)][min(i, max_moves)] - pv_node, depth - 1)
+                self.scout_searches += 1
+                if r > 0:
+                    self.lmr_reductions += 1
+                    score = -self.pvs(gs, depth - 1 - r, -alpha - 1, -alpha, ply + 1, True, gives_check)
+                    if score > alpha:
+                        self.lmr_researches += 1
+                        score = -self.pvs(gs, depth - 1, -alpha - 1, -alpha, ply + 1, True, gives_check)
+                else:
+                    score = -self.pvs(gs, depth - 1, -alpha - 1, -alpha, ply + 1, True, gives_check)
+                if alpha < score < beta:
+                    self.pvs_researches += 1
+                    score = -self.pvs(gs, depth - 1, -beta, -alpha, ply + 1, True, gives_check)
+            gs.white_to_move = not gs.white_to_move
+            gs.undo_move(move)
+
+            if score > best_score:
+                best_score, best_move = score, move
+                if ply == 0:
+                    self.root_move = move
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        if stats is not None:
+                            stats.cutoffs += 1
+                        if move.piece_captured is None and not move.is_promotion:
+                            killer = _move_key(move)
+                            killers = self.killers.get(ply, ())
+                            if killer not in killers:
+                                self.killers[ply] = (killer,) + killers[:1]
+                        break
+
+        if stats is not None:
+            stats.expand(searched)
+        if searched == 0:
+            if stats is not None:
+                stats.leaves += 1
+            if in_check is None:
+                in_check = gs.is_in_check(side)
+            return -(MATE - ply) if in_check else 0
+
+        bound = LOWER if best_score >= beta else EXACT if best_score > original_alpha else UPPER
+        stored = best_score
+        if stored > MATE_BOUND:
+            stored += ply
+        elif stored < -MATE_BOUND:
+            stored -= ply
+        self.tt.put(key, depth, bound, stored, _move_key(best_move) if bound != UPPER else None)
+        return best_score
+
+SEARCH_CONFIG = SearchConfig()
+TT = TranspositionTable(SEARCH_CONFIG.tt_size)  # kept between moves
+LAST_SEARCH = None  # depth, score and counters of the last find_ai_move
+
+@search_stats.traced("chess", "find_ai_move")
+def find_ai_move(gs, depth=AI_DEPTH, time_limit=None, config=None):
+    """AI entry point: best move for the side to move, by iterative-deepening PVS."""
+    global next_move, LAST_SEARCH
+    if STATS is not None:
+        STATS.root_depth = depth
+    searcher = Searcher(config or SEARCH_CONFIG, TT)
+    next_move, score, reached = searcher.search(gs, depth, time_limit)
+    LAST_SEARCH = {"depth": reached, "score": score, **searcher.counters()}
+    if STATS is not None:
+        STATS.extra.update(LAST_SEARCH)
+    return next_move
+
+# --- Pondering ---
+# While the human thinks, the AI searches the position after the reply it expects (the
+# second move of its principal variation), filling the shared transposition table. If the
+# human plays that move, the search already under way becomes the AI's answer; otherwise it
+# is stopped and the AI searches afresh (still helped by what the table learned).
+
+PONDER = True  # search on the human's time in the game
+
+def predicted_reply(gs):
+    """The opponent's expected move in gs (the transposition table's best move there), or None."""
+    entry = TT.get(gs.position_key())
+    if entry is None or entry[3] is None:
+        return None
+    return next((m for m in gs.get_valid_moves() if _move_key(m) == entry[3]), None)
+
+class Ponderer:
+    """Background search of the position after the predicted reply."""
+
+    def __init__(self, gs, depth=AI_DEPTH, config=None):
+        self.depth = depth
+        self.searcher = Searcher(config or SEARCH_CONFIG, TT)
+        self.predicted = predicted_reply(gs)
+        self.key = None
+        self.result = (None, None, 0)
+        self.thread = None
+        self.started = None
+        if self.predicted is not None:
+            self.position = gs.copy()
+            self.position.make_move(self.predicted)
+            self.position.white_to_move = not self.position.white_to_move
+            self.key = self.position.position_key()
+
+    def start(self):
+        if self.predicted is not None:
+            self.started = time.perf_counter()
+            self.searcher.prepare()  # here, so the thread never overwrites finish()'s deadline
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+        return self
+
+    def _run(self):
+        self.result = self.searcher.search(self.position, self.depth, prepared=True)
+
+    def stop(self):
+        if self.thread is not None:
+            self.searcher.stop()
+            self.thread.join()
+            self.thread = None
+
+    def finish(self, gs, time_limit=AI_TIME_LIMIT):
+        """Called once the human has moved in gs. Returns the AI's reply on a ponder hit, else None.
+
+        On a hit the search may go on until time_limit seconds after pondering began, so the
+        reply comes at once if the human took longer than that.
+        """
+        if self.thread is None or gs.position_key() != self.key:
+            self.stop()
+            return None
+        self.searcher.deadline = self.started + time_limit if time_limit else None
+        self.thread.join()
+        self.thread = None
+        global LAST_SEARCH
+        move, score, reached = self.result
+        LAST_SEARCH = {"depth": reached, "score": score, "ponder_hit": True, **self.searcher.counters()}
+        return move
+
+# --- Plain Minimax (reference for the benchmark) ---
+
+@search_stats.traced("chess", "find_ai_move_plain")
+def find_ai_move_plain(gs, depth=2):
+    """Full-window minimax with alpha-beta, the British maximizing; kept to compare against PVS."""
     global next_move
     next_move = None
-    
-    # British (AI) is the maximizing player
+    if STATS is not None:
+        STATS.root_depth = depth
     minimax_alpha_beta(gs, depth, -math.inf, math.inf, True)
     return next_move
 
-def minimax_alpha_beta(gs, depth, alpha, beta, maximizing):
+def minimax_alpha_beta(gs, depth, alpha, beta, maximizing, ply=0):
     """Minimax with Alpha-Beta Pruning."""
     global next_move
+    if STATS is not None:
+        STATS.visit(ply)
     
     # Base Case
     if depth == 0 or gs.checkmate or gs.stalemate:
+        if STATS is not None:
+            STATS.leaves += 1
         return evaluate(gs)
 
     # Temporarily switch turn to ensure get_valid_moves works for the current side
@@ -320,8 +869,9 @@ def minimax_alpha_beta(gs, depth, alpha, beta, maximizing):
     # Restore the turn state
     gs.white_to_move = original_white_to_move 
 
-    import random
     random.shuffle(valid_moves)
+    if STATS is not None:
+        STATS.expand(len(valid_moves))
 
     if maximizing: # British (AI) turn - Maximize
         max_eval = -math.inf
@@ -331,7 +881,7 @@ def minimax_alpha_beta(gs, depth, alpha, beta, maximizing):
             gs.white_to_move = not gs.white_to_move 
             
             # 2. Recurse (now minimizing)
-            eval = minimax_alpha_beta(gs, depth-1, alpha, beta, False)
+            eval = minimax_alpha_beta(gs, depth-1, alpha, beta, False, ply+1)
             
             # 3. Undo move and flip turn back manually
             gs.white_to_move = not gs.white_to_move
@@ -339,11 +889,13 @@ def minimax_alpha_beta(gs, depth, alpha, beta, maximizing):
             
             if eval > max_eval:
                 max_eval = eval
-                if depth == 2: 
+                if ply == 0: # Remember the best move at the root
                     next_move = move
             
             alpha = max(alpha, max_eval)
             if beta <= alpha:
+                if STATS is not None:
+                    STATS.cutoffs += 1
                 break 
         return max_eval
     else: # Wehrmacht (Human) turn - Minimize
@@ -354,7 +906,7 @@ def minimax_alpha_beta(gs, depth, alpha, beta, maximizing):
             gs.white_to_move = not gs.white_to_move 
             
             # 2. Recurse (now maximizing)
-            eval = minimax_alpha_beta(gs, depth-1, alpha, beta, True)
+            eval = minimax_alpha_beta(gs, depth-1, alpha, beta, True, ply+1)
             
             # 3. Undo move and flip turn back manually
             gs.white_to_move = not gs.white_to_move
@@ -365,6 +917,8 @@ def minimax_alpha_beta(gs, depth, alpha, beta, maximizing):
                 
             beta = min(beta, eval)
             if beta <= alpha:
+                if STATS is not None:
+                    STATS.cutoffs += 1
                 break
         return min_eval
 
@@ -382,6 +936,9 @@ def draw_pieces(screen, gs):
 
 def draw_board(gs, selected_sq, legal_moves):
     """Draws the board, highlights, and pieces."""
+    # Check the current player's King location once per frame, not once per square
+    king_r, king_c = gs.wehrmacht_king_loc if gs.white_to_move else gs.british_king_loc
+    king_in_check = gs.is_in_check()
     for r in range(8):
         for c in range(8):
             color = WHITE if (r+c)%2==0 else BROWN
@@ -395,9 +952,7 @@ def draw_board(gs, selected_sq, legal_moves):
                 screen.blit(s, (c*CELL_SIZE, r*CELL_SIZE))
 
             # Highlight King if in check
-            # Check the current player's King location
-            king_r, king_c = gs.wehrmacht_king_loc if gs.white_to_move else gs.british_king_loc
-            if gs.is_in_check() and (r,c) == (king_r, king_c):
+            if king_in_check and (r,c) == (king_r, king_c):
                 s = pygame.Surface((CELL_SIZE, CELL_SIZE))
                 s.set_alpha(150)
                 s.fill(CHECK_RED)
@@ -475,11 +1030,18 @@ def ask_promotion_choice(screen, side):
 # --- Main Loop ---
 def main():
     global next_move
+    if os.environ.get("CHESS_NNUE"):  # weights file for the neural evaluator (needs NumPy)
+        import nnue
+        SEARCH_CONFIG.network = nnue.load_network(os.environ["CHESS_NNUE"])
+    init_game_window()
     gs = GameState()
     running = True
     selected_sq = None
     player_clicks = []
     ai_thinking = False
+    ponder = None     # Ponderer running on the human's time
+    ai_reply = None   # AI move already found by a ponder hit
+    clock = pygame.time.Clock()
     
     valid_moves = gs.get_valid_moves()
     highlight_moves = []
@@ -513,6 +1075,9 @@ def main():
                             # Execute the move and flip the turn
                             gs.make_move(move, screen)
                             gs.white_to_move = not gs.white_to_move # Flip turn for the AI
+                            if ponder is not None:
+                                ai_reply = ponder.finish(gs)  # None unless the AI predicted this move
+                                ponder = None
                             
                             valid_moves = gs.get_valid_moves() 
                             selected_sq = None
@@ -532,6 +1097,9 @@ def main():
             
             if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
                 # Restart the game
+                if ponder is not None:
+                    ponder.stop()
+                ponder = ai_reply = None
                 gs = GameState()
                 selected_sq = None
                 player_clicks = []
@@ -543,10 +1111,11 @@ def main():
         if not gs.white_to_move and not gs.checkmate and not gs.stalemate and not ai_thinking:
             ai_thinking = True
             
-            time.sleep(0.1) 
-            
-            # AI (Black/British) plays
-            ai_move = find_ai_move(gs, depth=2) 
+            # AI (Black/British) plays: the pondered reply, or a fresh search
+            ai_move, ai_reply = ai_reply, None
+            if ai_move is None:
+                time.sleep(0.1) 
+                ai_move = find_ai_move(gs, AI_DEPTH, AI_TIME_LIMIT)
             
             if ai_move:
                 # Execute the move and flip the turn
@@ -554,6 +1123,8 @@ def main():
                 gs.white_to_move = not gs.white_to_move # Flip turn for the Human
                 
                 valid_moves = gs.get_valid_moves()
+                if PONDER and valid_moves:
+                    ponder = Ponderer(gs).start()  # think about the reply while the human thinks
                 
             ai_thinking = False
 
@@ -561,7 +1132,10 @@ def main():
         draw_board(gs, selected_sq, highlight_moves)
         draw_game_over_message(screen, gs)
         pygame.display.flip()
+        clock.tick(60)  # leave the CPU to the ponder search between frames
     
+    if ponder is not None:
+        ponder.stop()
     pygame.quit()
     sys.exit()
 
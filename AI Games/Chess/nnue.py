@@ -0,0 +1,187 @@
+"""Small NNUE-style neural evaluator for chess.py (needs NumPy).
+
+Input: 768 piece-square features, one per (side, kind, square), set when that piece
+stands on that square. The first layer's output (the accumulator) is the sum of the weight
+rows of the pieces on the board, so a move changes it by a few row additions and
+subtractions: make_move/undo_move keep it up to date instead of recomputing it per leaf.
+First-layer weights are stored as integers (scaled by QUANT), which keeps the additions
+and subtractions exact. The two small layers after it run in NumPy at evaluation time:
+
+    accumulator (H) -> clipped ReLU -> H x H2 -> clipped ReLU -> H2 x 1 -> score
+
+The score is in pawns from the British (AI) side, like chess.evaluate.
+
+    network = load_network("weights.npz")       # w1 (768, H), b1, w2 (H, H2), b2, w3 (H2,), b3
+    chess.SEARCH_CONFIG.network = network        # or: CHESS_NNUE=weights.npz python chess.py
+
+    python nnue.py --bench                       # evals/sec against the material evaluator
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import chess
+
+QUANT = 1024          # first-layer weights are stored as round(w * QUANT)
+N_FEATURES = 768
+
+# FEATURE_BASE[side, kind] + square (row * 8 + col) is a piece's feature index
+FEATURE_BASE = {(side, kind): 64 * (6 * s + k)
+                for s, side in enumerate(chess.SIDES) for k, kind in enumerate(chess.KINDS)}
+
+
+def features(board):
+    """Indexes of the active features of a board."""
+    return [FEATURE_BASE[piece.side, piece.kind] + r * 8 + c
+            for r, row in enumerate(board) for c, piece in enumerate(row) if piece]
+
+
+class Network:
+    """Weights of the evaluator; accumulator(gs) starts the incremental state for a position."""
+
+    def __init__(self, w1, b1, w2, b2, w3, b3):
+        w1 = np.asarray(w1, dtype=np.float64)
+        if w1.shape[0] != N_FEATURES:
+            raise ValueError(f"first layer needs {N_FEATURES} rows, got {w1.shape[0]}")
+        self.w1 = np.round(w1 * QUANT).astype(np.int32)
+        self.b1 = np.asarray(b1, dtype=np.float32)
+        self.w2 = np.asarray(w2, dtype=np.float32)
+        self.b2 = np.asarray(b2, dtype=np.float32)
+        self.w3 = np.asarray(w3, dtype=np.float32).reshape(-1)
+        self.b3 = float(b3)
+        if not (self.b1.shape == (self.w1.shape[1],) and self.w2.shape == (self.w1.shape[1], self.b2.shape[0])
+                and self.w3.shape == self.b2.shape):
+            raise ValueError("layer shapes don't chain: w1 (768, H), b1 (H), w2 (H, H2), b2 (H2), w3 (H2)")
+
+    @property
+    def hidden(self):
+        return self.w1.shape[1]
+
+    def refresh(self, board):
+        """Accumulator of a board computed from scratch."""
+        return self.w1[features(board)].sum(axis=0, dtype=np.int32)
+
+    def forward(self, acc):
+        h = np.clip(acc * (1.0 / QUANT) + self.b1, 0.0, 1.0)
+        h = np.clip(h @ self.w2 + self.b2, 0.0, 1.0)
+        return float(h @ self.w3) + self.b3
+
+    def evaluate_board(self, board):
+        return self.forward(self.refresh(board))
+
+    def accumulator(self, gs):
+        return Accumulator(self, self.refresh(gs.board))
+
+    def save(self, path):
+        np.savez(path, w1=self.w1 / QUANT, b1=self.b1, w2=self.w2, b2=self.b2, w3=self.w3, b3=self.b3)
+
+
+class Accumulator:
+    """First-layer output for the current board, updated by GameState.make_move/undo_move."""
+
+    __slots__ = ("network", "acc")
+
+    def __init__(self, network, acc):
+        self.network = network
+        self.acc = acc
+
+    def copy(self):
+        return Accumulator(self.network, self.acc.copy())
+
+    def make_move(self, move, placed):
+        """`placed` is the piece that ends on the target square (the promoted piece on a promotion)."""
+        w1, acc, to_sq = self.network.w1, self.acc, move.end_row * 8 + move.end_col
+        moved, captured = move.piece_moved, move.piece_captured
+        acc -= w1[FEATURE_BASE[moved.side, moved.kind] + move.start_row * 8 + move.start_col]
+        acc += w1[FEATURE_BASE[placed.side, placed.kind] + to_sq]
+        if captured:
+            acc -= w1[FEATURE_BASE[captured.side, captured.kind] + to_sq]
+
+    def undo_move(self, move, placed):
+        w1, acc, to_sq = self.network.w1, self.acc, move.end_row * 8 + move.end_col
+        moved, captured = move.piece_moved, move.piece_captured
+        acc += w1[FEATURE_BASE[moved.side, moved.kind] + move.start_row * 8 + move.start_col]
+        acc -= w1[FEATURE_BASE[placed.side, placed.kind] + to_sq]
+        if captured:
+            acc += w1[FEATURE_BASE[captured.side, captured.kind] + to_sq]
+
+    def evaluate(self):
+        return self.network.forward(self.acc)
+
+
+def load_network(path):
+    """Reads an .npz file with arrays w1 (768, H), b1 (H), w2 (H, H2), b2 (H2), w3 (H2) and b3."""
+    with np.load(path) as data:
+        missing = {"w1", "b1", "w2", "b2", "w3", "b3"} - set(data.files)
+        if missing:
+            raise ValueError(f"{path} lacks {', '.join(sorted(missing))}")
+        return Network(data["w1"], data["b1"], data["w2"], data["b2"], data["w3"], data["b3"])
+
+
+def random_network(hidden=128, hidden2=32, seed=0):
+    """Untrained network with the right shapes (for benchmarks and tests)."""
+    rng = np.random.default_rng(seed)
+    return Network(rng.normal(0, 0.1, (N_FEATURES, hidden)), rng.normal(0, 0.1, hidden),
+                   rng.normal(0, 0.3, (hidden, hidden2)), np.zeros(hidden2), rng.normal(0, 1, hidden2), 0.0)
+
+
+# --- Benchmark ---
+
+def benchmark(network, min_time=0.5, depth=3):
+    """Evals/sec of the material evaluator, the incremental network and a from-scratch network."""
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    import benchmark as game_benchmark  # the positions of ../benchmark.py
+    states = [game_benchmark.chess_position(chess, moves) for moves in game_benchmark.CHESS_POSITIONS.values()]
+    with_nnue = []
+    for gs in states:
+        g = gs.copy()
+        g.nnue = network.accumulator(g)
+        with_nnue.append(g)
+
+    def rate(fn, positions):
+        calls, start = 0, time.perf_counter()
+        while time.perf_counter() - start < min_time:
+            for gs in positions:
+                fn(gs)
+            calls += len(positions)
+        return calls / (time.perf_counter() - start)
+
+    print(f"network 768 -> {network.hidden} -> {network.b2.shape[0]} -> 1")
+    print(f"material evaluate     : {rate(chess.evaluate, states):10.0f} evals/s")
+    print(f"network, accumulator  : {rate(chess.evaluate, with_nnue):10.0f} evals/s")
+    print(f"network, from scratch : {rate(lambda gs: network.evaluate_board(gs.board), states):10.0f} evals/s")
+
+    gs = with_nnue[1]
+    move = gs.get_valid_moves()[0]
+    pairs, start = 0, time.perf_counter()
+    while time.perf_counter() - start < min_time:
+        gs.make_move(move)
+        gs.undo_move(move)
+        pairs += 1
+    print(f"make+undo with accumulator: {1e6 * (time.perf_counter() - start) / pairs:.1f} us")
+    for name, config in (("material", chess.SearchConfig()), ("network", chess.SearchConfig(network=network))):
+        searcher = chess.Searcher(config)
+        start = time.perf_counter()
+        for g in states:
+            searcher.search(g, depth)
+        elapsed = time.perf_counter() - start
+        print(f"depth-{depth} searches, {name:8s}: {searcher.nodes / elapsed:8.0f} nodes/s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NNUE-style evaluator for chess.py.")
+    parser.add_argument("--weights", help=".npz weights (default: a random network)")
+    parser.add_argument("--bench", action="store_true", help="compare evals/sec with the material evaluator")
+    parser.add_argument("--save-random", metavar="FILE", help="write a random network's weights to FILE")
+    args = parser.parse_args()
+    network = load_network(args.weights) if args.weights else random_network()
+    if args.save_random:
+        random_network().save(args.save_random)
+        print(f"random weights written to {args.save_random}")
+    if args.bench or not args.save_random:
+        benchmark(network)
@@ -0,0 +1,305 @@
+"""Batch analysis of PGN games with the chess AI's search, in a process pool.
+
+Games are read one at a time from PGN files, replayed through chess.GameState, and every
+position (before each move, and the final one) is searched under a per-position budget by
+a pool of worker processes. One JSON line per game is appended to the output as soon as
+its positions are done: the engine's best move and evaluation for each position, how
+much each played move lost against the best one, and blunder flags.
+
+    python pgn_analysis.py games.pgn --out analysis.jsonl --workers 8 --time 0.5
+    python pgn_analysis.py pgn_dir/ --out analysis.jsonl --nodes 20000 --depth 6
+
+Runs are resumable: games already in the output file (keyed on the PGN's absolute path and
+the game's index in it) are skipped, so an interrupted run just starts again with the same
+command. GameState has no castling or en passant, so a game that needs one is analysed up
+to that move and recorded with "stopped" giving the reason.
+
+Scores are in pawns from White's (Wehrmacht's) point of view; a forced mate is reported as
+"mate" (plies, positive when White mates) with the eval clamped to +-MATE_PAWNS.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import chess
+
+MATE_PAWNS = 100          # eval given to a forced mate
+BLUNDER_PAWNS = 2.0       # default loss that marks a move as a blunder
+FILES = "abcdefgh"
+
+# --- FEN ---
+
+FEN_LETTERS = {"Pawn": "p", "Knight": "n", "Bishop": "b", "Rook": "r", "Queen": "q", "King": "k"}
+FEN_KINDS = {letter: kind for kind, letter in FEN_LETTERS.items()}
+
+
+def to_fen(gs, fullmove=1):
+    """FEN of a GameState (Wehrmacht = White, upper case). Castling and en passant are always '-'."""
+    rows = []
+    for r in range(8):
+        row, empty = "", 0
+        for c in range(8):
+            piece = gs.board[r][c]
+            if piece is None:
+                empty += 1
+                continue
+            if empty:
+                row += str(empty)
+                empty = 0
+            letter = FEN_LETTERS[piece.kind]
+            row += letter.upper() if piece.side == "wehrmacht" else letter
+        rows.append(row + (str(empty) if empty else ""))
+    return f"{'/'.join(rows)} {'w' if gs.white_to_move else 'b'} - - 0 {fullmove}"
+
+
+def from_fen(fen):
+    """GameState for a FEN (only the placement and side to move are used)."""
+    fields = fen.split()
+    gs = chess.GameState()
+    gs.board = [[None] * 8 for _ in range(8)]
+    for r, row in enumerate(fields[0].split("/")):
+        c = 0
+        for ch in row:
+            if ch.isdigit():
+                c += int(ch)
+                continue
+            side = "wehrmacht" if ch.isupper() else "british"
+            gs.board[r][c] = chess.Piece(side, FEN_KINDS[ch.lower()])
+            if ch == "K":
+                gs.wehrmacht_king_loc = (r, c)
+            elif ch == "k":
+                gs.british_king_loc = (r, c)
+            c += 1
+    gs.white_to_move = len(fields) < 2 or fields[1] == "w"
+    gs.hash = gs._compute_hash()
+    return gs
+
+
+# --- PGN reading ---
+
+HEADER_RE = re.compile(r'^\[(\w+)\s+"(.*)"\]\s*$')
+COMMENT_RE = re.compile(r"\{[^}]*\}|;[^\n]*")
+NOISE_RE = re.compile(r"\$\d+|\d+\.(?:\.\.)?|1-0|0-1|1/2-1/2|\*")  # NAGs, move numbers, results
+SAN_RE = re.compile(r"^([NBRQK])?([a-h])?([1-8])?(x)?([a-h][1-8])(?:=?([NBRQ]))?[+#]?[!?]*$")
+SAN_KINDS = {"N": "Knight", "B": "Bishop", "R": "Rook", "Q": "Queen", "K": "King"}
+
+
+def read_games(path):
+    """Yields (headers, SAN moves) for each game of a PGN file, reading it line by line."""
+    headers, lines = {}, []
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            match = HEADER_RE.match(line.strip())
+            if match:
+                if lines:
+                    yield headers, _san_moves("".join(lines))
+                    headers, lines = {}, []
+                headers[match.group(1)] = match.group(2)
+            elif line.strip() and not line.startswith("%"):
+                lines.append(line)
+    if headers or lines:
+        yield headers, _san_moves("".join(lines))
+
+
+def _san_moves(text):
+    text = COMMENT_RE.sub(" ", text)
+    depth, kept = 0, []  # drop variations, which may nest
+    for ch in text:
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth = max(0, depth - 1)
+        elif depth == 0:
+            kept.append(ch)
+    return NOISE_RE.sub(" ", "".join(kept)).split()
+
+
+def pgn_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(".pgn"):
+                    yield os.path.join(path, name)
+        else:
+            yield path
+
+
+class UnsupportedMove(Exception):
+    """A SAN move GameState can't play (castling, en passant) or doesn't recognise."""
+
+
+def parse_san(gs, san):
+    """The legal Move of the side to move that `san` names."""
+    if san.startswith(("O-O", "0-0")):
+        raise UnsupportedMove(f"castling ({san})")
+    match = SAN_RE.match(san)
+    if not match:
+        raise UnsupportedMove(f"unreadable move {san!r}")
+    letter, from_file, from_rank, capture, target, promotion = match.groups()
+    kind = SAN_KINDS[letter] if letter else "Pawn"
+    end = (8 - int(target[1]), FILES.index(target[0]))
+    candidates = [m for m in gs.get_valid_moves()
+                  if m.piece_moved.kind == kind and (m.end_row, m.end_col) == end
+                  and (from_file is None or m.start_col == FILES.index(from_file))
+                  and (from_rank is None or m.start_row == 8 - int(from_rank))]
+    if len(candidates) != 1:
+        if kind == "Pawn" and capture and gs.board[end[0]][end[1]] is None:
+            raise UnsupportedMove(f"en passant ({san})")
+        raise UnsupportedMove(f"{'ambiguous' if candidates else 'illegal'} move {san!r}")
+    move = candidates[0]
+    if move.is_promotion:
+        move.promotion_piece = chess.Piece(move.piece_moved.side, SAN_KINDS[promotion or "Q"])
+    return move
+
+
+def replay(headers, sans):
+    """FENs of the positions before each move and after the last one, plus why replay stopped (or None)."""
+    gs = from_fen(headers["FEN"]) if headers.get("SetUp") == "1" and "FEN" in headers else chess.GameState()
+    fullmove = int(headers["FEN"].split()[5]) if "FEN" in headers and len(headers["FEN"].split()) > 5 else 1
+    fens, coords, stopped = [], [], None
+    for ply, san in enumerate(sans, 1):
+        fens.append(to_fen(gs, fullmove))
+        try:
+            move = parse_san(gs, san)
+        except UnsupportedMove as e:
+            stopped = f"{e} at ply {ply}"
+            fens.pop()
+            break
+        coords.append(repr(move))
+        gs.make_move(move)
+        gs.white_to_move = not gs.white_to_move
+        if gs.white_to_move:
+            fullmove += 1
+    fens.append(to_fen(gs, fullmove))
+    return fens, coords, stopped
+
+
+# --- Workers ---
+
+def analyse_position(fen, depth, time_limit, max_nodes):
+    """Searches one position within the budget; the score is in pawns for the side to move."""
+    gs = from_fen(fen)
+    searcher = chess.Searcher(chess.SEARCH_CONFIG, chess.TranspositionTable())
+    started = time.perf_counter()
+    move, score, reached = searcher.search(gs, depth, time_limit, max_nodes)
+    if score is None:  # not even one ply finished: fall back to the static evaluation
+        score = chess.evaluate(gs) * (-1 if gs.white_to_move else 1)
+    return {"best": repr(move) if move else None, "score": score, "depth": reached,
+            "nodes": searcher.nodes, "seconds": round(time.perf_counter() - started, 4)}
+
+
+def _white_eval(score, white_to_move):
+    """(eval in pawns for White, mate in plies or None) from a side-to-move score."""
+    sign = 1 if white_to_move else -1
+    if abs(score) > chess.MATE_BOUND:
+        plies = chess.MATE - abs(score)
+        return sign * (MATE_PAWNS if score > 0 else -MATE_PAWNS), sign * (plies if score > 0 else -plies)
+    return sign * score, None
+
+
+def game_record(source, index, headers, sans, coords, fens, results, stopped, blunder):
+    moves = []
+    evals = []
+    for fen, result in zip(fens, results):
+        white_eval, mate = _white_eval(result["score"], fen.split()[1] == "w")
+        evals.append(white_eval)
+        moves.append({"fen": fen, "best": result["best"], "eval": white_eval, "mate": mate,
+                      "depth": result["depth"], "nodes": result["nodes"]})
+    for ply, entry in enumerate(moves[:-1]):
+        white = entry["fen"].split()[1] == "w"
+        # loss = what the mover gave up: eval before (best play) minus eval after the played move
+        loss = (evals[ply] - evals[ply + 1]) if white else (evals[ply + 1] - evals[ply])
+        entry.update(ply=ply + 1, san=sans[ply], played=coords[ply], loss=max(0, loss),
+                     blunder=loss >= blunder)
+    final = moves[-1]
+    final["ply"] = len(coords) + 1
+    return {"source": source, "game": index, "headers": headers, "plies": len(coords),
+            "stopped": stopped, "blunders": sum(1 for m in moves[:-1] if m["blunder"]), "positions": moves}
+
+
+# --- Driver ---
+
+def completed_games(out_path):
+    """(source, game) pairs already in the output; a torn last line is cut off."""
+    done = set()
+    if not os.path.exists(out_path):
+        return done
+    with open(out_path, "rb+") as f:
+        data = f.read()
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            f.truncate(end)
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            done.add((record["source"], record["game"]))
+    return done
+
+
+def analyse(paths, out_path, workers=None, depth=4, time_limit=None, max_nodes=None,
+            blunder=BLUNDER_PAWNS, max_games=None, progress=True):
+    """Analyses every game in the PGN paths, appending one JSON line per game to out_path."""
+    done = completed_games(out_path)
+    started, positions, written = time.perf_counter(), 0, 0
+    workers = workers or os.cpu_count() or 1
+    limit = 4 * workers  # positions in flight before waiting on the oldest game
+    window = deque()     # games in flight, in input order: (game info, futures)
+    with ProcessPoolExecutor(workers) as pool, open(out_path, "a", encoding="utf-8") as out:
+
+        def flush(wait_for):
+            nonlocal positions, written
+            while window and (wait_for > 0 or all(f.done() for f in window[0][1])):
+                info, futures = window.popleft()
+                wait_for -= len(futures)
+                results = [f.result() for f in futures]
+                positions += len(results)
+                out.write(json.dumps(game_record(*info[:6], results, info[6], blunder)) + "\n")
+                out.flush()
+                written += 1
+                if progress:
+                    rate = positions / (time.perf_counter() - started)
+                    print(f"\r{written} games, {positions} positions ({rate:.1f}/s)", end="", file=sys.stderr)
+
+        count = 0
+        for path in pgn_files(paths):
+            source = os.path.abspath(path)  # same-named files in other folders are other games
+            for index, (headers, sans) in enumerate(read_games(path)):
+                if max_games is not None and count >= max_games:
+                    break
+                count += 1
+                if (source, index) in done:
+                    continue
+                fens, coords, stopped = replay(headers, sans)
+                futures = [pool.submit(analyse_position, fen, depth, time_limit, max_nodes) for fen in fens]
+                window.append(((source, index, headers, sans, coords, fens, stopped), futures))
+                in_flight = sum(len(f) for _, f in window)
+                flush(in_flight - limit)
+        flush(sum(len(f) for _, f in window))
+    if progress:
+        print(file=sys.stderr)
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Annotate PGN games with the chess AI (resumable JSON lines).")
+    parser.add_argument("pgn", nargs="+", help="PGN files or folders of .pgn files")
+    parser.add_argument("--out", required=True, help="JSON-lines output; games already in it are skipped")
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per core)")
+    parser.add_argument("--depth", type=int, default=4, help="deepest iteration per position")
+    parser.add_argument("--time", type=float, default=None, help="seconds per position")
+    parser.add_argument("--nodes", type=int, default=None, help="search nodes per position")
+    parser.add_argument("--blunder", type=float, default=BLUNDER_PAWNS, help="loss in pawns that flags a blunder")
+    parser.add_argument("--max-games", type=int, default=None)
+    args = parser.parse_args()
+    written = analyse(args.pgn, args.out, args.workers, args.depth, args.time, args.nodes,
+                      args.blunder, args.max_games)
+    print(f"{written} games analysed into {args.out}")
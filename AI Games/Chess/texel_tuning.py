@@ -0,0 +1,265 @@
+"""Texel-style tuning of the chess evaluation on labelled positions, vectorized with NumPy.
+
+Positions are converted once into packed (N, 12, 64) piece-square bit tensors, stored as
+uint8 (N, 12, 8) in a .npy file that later runs memory-map, next to the game results
+(1 = White won, 0.5 = draw, 0 = Black won). Planes are side * 6 + kind in chess.SIDES /
+chess.KINDS order (Wehrmacht = White), squares are row * 8 + col with row 0 = rank 8.
+
+The evaluation is linear in the weights: piece values, plus (with --pst) a piece-square
+table per kind, mirrored for Black. Tuning minimises the Texel error
+mean((result - sigmoid(K * eval)) ** 2) by full-batch gradient descent (Adam) over the
+memory-mapped tensors, after fitting K to the starting weights.
+
+    python texel_tuning.py positions.epd games.pgn --cache texel_data     # build the cache
+    python texel_tuning.py --cache texel_data --pst --epochs 300 --out tuned.json
+
+Position files hold one "FEN result" per line, the result as 1-0 / 0-1 / 1/2-1/2 or [1.0]
+/ [0.5] / [0.0]; every position of a PGN game is labelled with the game's result.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import chess
+
+PLANE = {(side, kind): 6 * s + k for s, side in enumerate(chess.SIDES) for k, kind in enumerate(chess.KINDS)}
+FEN_PLANE = {("PNBRQK"[k] if s == 0 else "pnbrqk"[k]): 6 * s + k for s in range(2) for k in range(6)}
+RESULTS = {"1-0": 1.0, "0-1": 0.0, "1/2-1/2": 0.5}
+RESULT_RE = re.compile(r"(1-0|0-1|1/2-1/2)|\[([01](?:\.\d+)?)\]")
+CHUNK = 1 << 16
+
+
+# --- Building the cache ---
+
+def fen_masks(placement):
+    """12 bitboards (bit row * 8 + col) of a FEN piece placement."""
+    masks = [0] * 12
+    square = 0
+    for ch in placement:
+        if ch == "/":
+            continue
+        if ch.isdigit():
+            square += int(ch)
+        else:
+            masks[FEN_PLANE[ch]] |= 1 << square
+            square += 1
+    return masks
+
+
+def board_masks(board):
+    masks = [0] * 12
+    for r, row in enumerate(board):
+        for c, piece in enumerate(row):
+            if piece:
+                masks[PLANE[piece.side, piece.kind]] |= 1 << (r * 8 + c)
+    return masks
+
+
+def labelled_positions(path):
+    """(12 bitboards, result) for each position of an .epd/.txt or .pgn file."""
+    if path.lower().endswith(".pgn"):
+        import pgn_analysis
+        for headers, sans in pgn_analysis.read_games(path):
+            result = RESULTS.get(headers.get("Result"))
+            if result is None:
+                continue
+            fens, _, _ = pgn_analysis.replay(headers, sans)
+            for fen in fens:
+                yield fen_masks(fen.split()[0]), result
+        return
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            fields = line.split()
+            match = RESULT_RE.search(line)
+            if not fields or not match:
+                continue
+            yield fen_masks(fields[0]), RESULTS[match.group(1)] if match.group(1) else float(match.group(2))
+
+
+def build_cache(sources, cache_dir):
+    """Packs every labelled position of the sources into cache_dir/features.npy and results.npy."""
+    os.makedirs(cache_dir, exist_ok=True)
+    raw_path = os.path.join(cache_dir, "features.raw")
+    results = []
+    with open(raw_path, "wb") as raw:
+        masks = []
+        for path in sources:
+            for position, result in labelled_positions(path):
+                masks.extend(position)
+                results.append(result)
+                if len(masks) >= 12 * CHUNK:
+                    raw.write(np.array(masks, dtype="<u8").tobytes())
+                    masks = []
+        raw.write(np.array(masks, dtype="<u8").tobytes())
+    count = len(results)
+    # little-endian 64-bit masks are already the packed (12, 8) bytes of each position
+    features = np.lib.format.open_memmap(os.path.join(cache_dir, "features.npy"), mode="w+",
+                                         dtype=np.uint8, shape=(count, 12, 8))
+    packed = np.memmap(raw_path, dtype=np.uint8, mode="r", shape=(count, 12, 8)) if count else None
+    for start in range(0, count, CHUNK):
+        features[start:start + CHUNK] = packed[start:start + CHUNK]
+    features.flush()
+    del features, packed
+    os.remove(raw_path)
+    np.save(os.path.join(cache_dir, "results.npy"), np.array(results, dtype=np.float32))
+    return count
+
+
+def load_cache(cache_dir):
+    """(packed features memmap (N, 12, 8), results (N,))."""
+    return (np.load(os.path.join(cache_dir, "features.npy"), mmap_mode="r"),
+            np.load(os.path.join(cache_dir, "results.npy")))
+
+
+# --- Vectorized evaluation ---
+
+def design(packed, pst):
+    """Per-position inputs of the linear evaluation (float32), White minus Black.
+
+    Without pst: piece counts, (n, 6). With pst: piece-square occupancy with Black's
+    squares mirrored, (n, 6 * 64); its sum over squares gives the counts again. Byte r of
+    a packed plane is row r, so mirroring is reversing the bytes before unpacking.
+    """
+    packed = np.asarray(packed)
+    white = np.unpackbits(packed[:, :6], axis=2, bitorder="little").astype(np.float32)
+    black = np.unpackbits(packed[:, 6:, ::-1] if pst else packed[:, 6:], axis=2, bitorder="little")
+    if not pst:
+        return white.sum(axis=2) - black.sum(axis=2)
+    return (white - black).reshape(len(packed), 6 * 64)
+
+
+def weight_vector(values, table=None):
+    """Flat weights for design(): piece values, plus the piece-square table if given."""
+    values = np.asarray(values, dtype=np.float64)
+    if table is None:
+        return values
+    return (values[:, None] + np.asarray(table, dtype=np.float64)).reshape(-1)
+
+
+def evaluate_batch(packed, values, table=None, batch=CHUNK):
+    """White-view evaluation of every packed position.
+
+    With chess.PIECE_VALUES and no table this is -chess.evaluate of a position that is not
+    checkmate or stalemate.
+    """
+    w = weight_vector(values, table).astype(np.float32)
+    out = np.empty(len(packed), dtype=np.float64)
+    for start in range(0, len(packed), batch):
+        out[start:start + batch] = design(packed[start:start + batch], table is not None) @ w
+    return out
+
+
+def sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-np.clip(x, -50.0, 50.0)))
+
+
+def texel_error(packed, results, values, table=None, k=1.0):
+    evals = evaluate_batch(packed, values, table)
+    return float(np.mean((results - sigmoid(k * evals)) ** 2))
+
+
+def fit_k(packed, results, values, table=None, low=0.05, high=5.0, iterations=40):
+    """Golden-section search for the K minimising the error of the given weights."""
+    evals = evaluate_batch(packed, values, table)
+    error = lambda k: np.mean((results - sigmoid(k * evals)) ** 2)
+    ratio = (5 ** 0.5 - 1) / 2
+    a, b = low, high
+    for _ in range(iterations):
+        c, d = b - ratio * (b - a), a + ratio * (b - a)
+        if error(c) < error(d):
+            b = d
+        else:
+            a = c
+    return (a + b) / 2
+
+
+def tune(packed, results, values, pst=False, k=None, epochs=200, lr=0.05, l2=1e-4, fixed=("King",),
+         batch=CHUNK, log=None):
+    """Adam on the Texel error. Returns (values, table or None, K, error per epoch).
+
+    Kinds in `fixed` keep their value (both kings are on the board until one is captured,
+    so the king's value only marks that). With pst the table starts at zero and is pulled
+    towards it by l2. Without pst the piece counts are unpacked once and every epoch is a
+    matrix product over them; with pst each epoch unpacks the memmap batch by batch.
+    """
+    values = np.array(values, dtype=np.float64)
+    if k is None:
+        k = fit_k(packed, results, values)
+    n = len(packed)
+    w = weight_vector(values, np.zeros((6, 64)) if pst else None)
+    frozen = np.zeros((6, 64) if pst else 6, dtype=bool)
+    for kind in fixed:
+        frozen[chess.KINDS.index(kind)] = True
+    frozen = frozen.reshape(-1)
+    starts = range(0, n, batch)
+    if pst:
+        inputs = lambda: (design(packed[start:start + batch], True) for start in starts)
+    else:
+        counts = [design(packed[start:start + batch], False) for start in starts]
+        inputs = lambda: iter(counts)
+    m, v = np.zeros_like(w), np.zeros_like(w)
+    history = []
+    for epoch in range(1, epochs + 1):
+        grad = np.zeros_like(w)
+        error = 0.0
+        for start, x in zip(starts, inputs()):
+            r = results[start:start + batch]
+            s = sigmoid(k * (x @ w.astype(np.float32)))
+            diff = s - r
+            error += float(diff @ diff)
+            grad += x.T @ (diff * s * (1 - s))
+        grad *= 2 * k / n
+        if pst:
+            grad += l2 * (w - np.repeat(w.reshape(6, 64).mean(axis=1), 64))
+        grad[frozen] = 0
+        m = 0.9 * m + 0.1 * grad
+        v = 0.999 * v + 0.001 * grad * grad
+        w -= lr * (m / (1 - 0.9 ** epoch)) / (np.sqrt(v / (1 - 0.999 ** epoch)) + 1e-9)
+        history.append(error / n)
+        if log and (epoch == 1 or epoch % 10 == 0 or epoch == epochs):
+            log(f"epoch {epoch:4d}  error {error / n:.6f}")
+    if not pst:
+        return w, None, k, history
+    table = w.reshape(6, 64)
+    tuned_values = table.mean(axis=1)
+    return tuned_values, table - tuned_values[:, None], k, history
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Tune the chess evaluation on labelled positions.")
+    parser.add_argument("sources", nargs="*", help=".epd/.txt files ('FEN result' lines) or .pgn files; "
+                                                   "builds the cache (otherwise the cache is reused)")
+    parser.add_argument("--cache", default="texel_data", help="folder of features.npy / results.npy")
+    parser.add_argument("--pst", action="store_true", help="tune piece-square tables as well")
+    parser.add_argument("--epochs", type=int, default=200)
+    parser.add_argument("--lr", type=float, default=0.05)
+    parser.add_argument("--out", help="write the tuned values (and tables) to this JSON file")
+    args = parser.parse_args()
+
+    if args.sources:
+        t = time.perf_counter()
+        count = build_cache(args.sources, args.cache)
+        print(f"{count} positions packed into {args.cache} in {time.perf_counter() - t:.1f}s")
+    packed, results = load_cache(args.cache)
+    start_values = [chess.PIECE_VALUES[kind] for kind in chess.KINDS]
+    t = time.perf_counter()
+    k = fit_k(packed, results, start_values)
+    print(f"{len(packed)} positions, K = {k:.4f}, error with PIECE_VALUES {texel_error(packed, results, start_values, k=k):.6f}")
+    values, table, k, history = tune(packed, results, start_values, args.pst, k, args.epochs, args.lr, log=print)
+    print(f"tuned in {time.perf_counter() - t:.1f}s")
+    tuned = {kind: round(float(value), 3) for kind, value in zip(chess.KINDS, values) if kind != "King"}
+    print("PIECE_VALUES =", tuned)
+    if args.out:
+        record = {"k": k, "error": history[-1], "piece_values": tuned}
+        if table is not None:
+            record["pst"] = {kind: np.round(row, 3).reshape(8, 8).tolist() for kind, row in zip(chess.KINDS, table)}
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(record, f, indent=1)
+        print(f"written to {args.out}")
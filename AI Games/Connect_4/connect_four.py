@@ -1,8 +1,14 @@
 import pygame
 import sys
 import math
-import random
 import time
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import game_assets
+import search_stats
+import opening_book
+import mcts
 
 # --- Configuration ---
 WIDTH, HEIGHT = 700, 600
@@ -20,37 +26,41 @@ BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 HIGHLIGHT = (100, 100, 255)
 
-pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Connect Four — Free French Air Force vs German Luftwaffe")
-clock = pygame.time.Clock()
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# Load background
+# Window, clock, images and fonts are created by setup() from main(), so the AI
+# functions below can be imported without opening a window.
+screen = None
+clock = None
 background = None
-try:
-    background = pygame.image.load("assets/war_background.png").convert()
-    background = pygame.transform.smoothscale(background, (WIDTH, HEIGHT))
-except:
-    print("Warning: No background found, using solid color")
-
-# Load piece images (if available, roundels of the Luftwaffe and FAFL)
-axis_piece = None
+axis_piece = None    # roundels of the Luftwaffe and FAFL (optional)
 allies_piece = None
-
-try:
-    axis_piece = pygame.image.load("assets/axis_piece.png").convert_alpha()
-    axis_piece = pygame.transform.smoothscale(axis_piece, (CELL_SIZE-10, CELL_SIZE-10))
-except:
-    print("Warning: No axis piece image found")
-
-try:
-    allies_piece = pygame.image.load("assets/allies_piece.png").convert_alpha()
-    allies_piece = pygame.transform.smoothscale(allies_piece, (CELL_SIZE-10, CELL_SIZE-10))
-except:
-    print("Warning: No allies piece image found")
-
-font = pygame.font.SysFont(None, 36)
-title_font = pygame.font.SysFont(None, 48)
+font = None
+title_font = None
+grid_overlay = None
+
+def setup():
+    """Opens the window and loads fonts and images (cached on disk, display-format surfaces)."""
+    global screen, clock, background, axis_piece, allies_piece, font, title_font, grid_overlay
+    screen = game_assets.init_display(WIDTH, HEIGHT, "Connect Four — Free French Air Force vs German Luftwaffe")
+    clock = pygame.time.Clock()
+
+    images = game_assets.load_images({
+        "background": game_assets.ImageSpec("assets/war_background.png", (WIDTH, HEIGHT), alpha=False),
+        "axis": game_assets.ImageSpec("assets/axis_piece.png", (CELL_SIZE-10, CELL_SIZE-10)),
+        "allies": game_assets.ImageSpec("assets/allies_piece.png", (CELL_SIZE-10, CELL_SIZE-10)),
+    }, GAME_DIR)
+    background, axis_piece, allies_piece = images["background"], images["axis"], images["allies"]
+    if not background:
+        print("Warning: No background found, using solid color")
+    if not axis_piece:
+        print("Warning: No axis piece image found")
+    if not allies_piece:
+        print("Warning: No allies piece image found")
+
+    font = pygame.font.SysFont(None, 36)
+    title_font = pygame.font.SysFont(None, 48)
+    grid_overlay = build_grid_overlay()
 
 # --- Game state ---
 def empty_board():
@@ -192,12 +202,32 @@ def is_terminal_node(board):
     """Check if the game is over."""
     return check_winner(board, "Axis") or check_winner(board, "Allies") or is_board_full(board)
 
+STATS = None  # search_stats.SearchStats while a traced best_ai_move runs
+
+# Solved opening positions (built offline by opening_book.py); used when the file exists
+USE_BOOK = True
+BOOK_PATH = os.path.join(GAME_DIR, "opening_book.c4b")
+_book = None
+
+def book_move(board, player="Allies"):
+    """Perfect-play column from the opening book, or None outside it (or without a book)."""
+    global _book
+    if not USE_BOOK:
+        return None
+    if _book is None:
+        _book = opening_book.OpeningBook.load(BOOK_PATH) if os.path.exists(BOOK_PATH) else False
+    return _book.move(board, player) if _book else None
+
 def minimax(board, depth, alpha, beta, maximizing_player):
     """Minimax algorithm with alpha-beta pruning."""
     valid_locations = get_valid_locations(board)
     is_terminal = is_terminal_node(board)
+    if STATS is not None:
+        STATS.visit(STATS.root_depth - depth)
     
     if depth == 0 or is_terminal:
+        if STATS is not None:
+            STATS.leaves += 1
         if is_terminal:
             if check_winner(board, "Allies"):  # AI is Allies(FAFL)
                 return (None, 100000000000000)
@@ -208,9 +238,12 @@ def minimax(board, depth, alpha, beta, maximizing_player):
         else:  # Depth is zero
             return (None, score_position(board, "Allies"))
     
+    if STATS is not None:
+        STATS.expand(len(valid_locations))
+
     if maximizing_player:
         value = -math.inf
-        column = random.choice(valid_locations)
+        column = valid_locations[0]
         for col in valid_locations:
             row = drop_piece(board, col, "Allies")
             new_score = minimax(board, depth-1, alpha, beta, False)[1]
@@ -220,12 +253,14 @@ def minimax(board, depth, alpha, beta, maximizing_player):
                 column = col
             alpha = max(alpha, value)
             if alpha >= beta:
+                if STATS is not None:
+                    STATS.cutoffs += 1
                 break
         return column, value
     
     else:  # Minimizing player
         value = math.inf
-        column = random.choice(valid_locations)
+        column = valid_locations[0]
         for col in valid_locations:
             row = drop_piece(board, col, "Axis")
             new_score = minimax(board, depth-1, alpha, beta, True)[1]
@@ -235,22 +270,58 @@ def minimax(board, depth, alpha, beta, maximizing_player):
                 column = col
             beta = min(beta, value)
             if alpha >= beta:
+                if STATS is not None:
+                    STATS.cutoffs += 1
                 break
         return column, value
 
-def best_ai_move(board, depth=4):
-    """Get the best move for the AI using minimax."""
+AI_DEPTH = 4
+AI_WORKERS = 1  # > 1: root columns are searched in that many processes (parallel_search.py)
+
+@search_stats.traced("connect_four", "best_ai_move")
+def best_ai_move(board, depth=AI_DEPTH, workers=None):
+    """Get the best move for the AI: from the opening book, else using minimax."""
+    col = book_move(board)
+    if col is not None:
+        return col
+    if STATS is not None:
+        STATS.root_depth = depth
+    workers = workers or AI_WORKERS
+    if workers > 1:
+        import parallel_search
+        col, _ = parallel_search.parallel_best_move(board, depth, pool=parallel_search.shared_pool(workers),
+                                                    stats=STATS)
+        return col
     col, _ = minimax(board, depth, -math.inf, math.inf, True)
     return col
 
-# --- Drawing functions ---
-def draw_board():
-    if background:
-        screen.blit(background, (0, 0))
-    else:
-        screen.fill(BLUE)
+# "minimax" or "mcts" (Monte Carlo Tree Search, mcts.py); M switches it during a game
+AI_MODE = "minimax"
+MCTS_TIME = 1.0  # seconds per MCTS move
+_mcts = None
+
+@search_stats.traced("connect_four", "mcts_move")
+def mcts_move(board, time_budget=None):
+    """Get the AI's move from the opening book, else by MCTS, keeping the tree between moves."""
+    global _mcts
+    col = book_move(board)
+    if col is not None:
+        return col
+    if _mcts is None:
+        _mcts = mcts.MCTS(GRID_WIDTH, GRID_HEIGHT)
+    col = _mcts.best_move(board, "Allies", time_budget or MCTS_TIME)
+    if STATS is not None:
+        STATS.nodes += _mcts.last.get("simulations", 0)
+        STATS.extra.update(_mcts.last)
+    return col
+
+def ai_move(board):
+    """The AI's column in the current AI_MODE."""
+    return mcts_move(board) if AI_MODE == "mcts" else best_ai_move(board)
 
-    # --- Semi-transparent grid overlay ---
+# --- Drawing functions ---
+def build_grid_overlay():
+    """The grid never changes, so it is drawn once instead of every frame."""
     grid_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
     for col in range(GRID_WIDTH):
         for row in range(GRID_HEIGHT):
@@ -263,8 +334,16 @@ def draw_board():
                               (col * CELL_SIZE + CELL_SIZE // 2,
                                row * CELL_SIZE + CELL_SIZE + CELL_SIZE // 2),
                               RADIUS)
-    screen.blit(grid_surface, (0, 0))
-    # --- End semi-transparent grid overlay ---
+    return grid_surface.convert_alpha()
+
+def draw_board():
+    if background:
+        screen.blit(background, (0, 0))
+    else:
+        screen.fill(BLUE)
+
+    # Semi-transparent grid overlay (built once in setup())
+    screen.blit(grid_overlay, (0, 0))
 
     # Draw pieces
     for row in range(GRID_HEIGHT):
@@ -306,6 +385,8 @@ def draw_ui():
     
     screen.blit(axis_text, (50, 20))
     screen.blit(allies_text, (WIDTH - 100, 20))
+    mode_text = font.render("MCTS" if AI_MODE == "mcts" else "MINIMAX", True, WHITE)
+    screen.blit(mode_text, (WIDTH - 100 - mode_text.get_width() - 20, 20))
     
     # Draw game status
     if game_over:
@@ -320,8 +401,9 @@ def draw_ui():
 
 # --- Main loop ---
 def main():
-    global board, current_player, game_over, winner, last_move_col, last_move_row
+    global board, current_player, game_over, winner, last_move_col, last_move_row, AI_MODE
     
+    setup()
     reset_game()
     running = True
     ai_thinking = False
@@ -345,6 +427,8 @@ def main():
                 if event.key == pygame.K_r:
                     reset_game()
                     ai_thinking = False
+                elif event.key == pygame.K_m:
+                    AI_MODE = "mcts" if AI_MODE == "minimax" else "minimax"
             
             if event.type == pygame.MOUSEBUTTONDOWN and not game_over and not ai_thinking:
                 if current_player == "Axis":  # Human player's turn
@@ -372,7 +456,7 @@ def main():
             # Add a small delay to make AI moves visible
             time.sleep(0.5)
             
-            col = best_ai_move(board)
+            col = ai_move(board)
             if col is not None:
                 row = drop_piece(board, col, "Allies")
                 if row != -1:  # Valid move
@@ -0,0 +1,274 @@
+"""Monte Carlo Tree Search (UCT) for connect_four.py, with batched random playouts.
+
+Each round selects `batch` leaves by UCT. A virtual loss spreads the selections over the
+tree: every visit is counted when a node is selected, and the result only arrives later.
+The random games from all the leaves are then played out together on bitboards (the
+layout of opening_book.py). With NumPy every move of every game in the batch is a
+handful of array operations. Without it the games are played one by one in Python.
+
+The search is anytime: it runs rounds until the time budget (or a playout count) is used
+up and answers with the most visited column. The tree is kept between moves, so when the
+next position is a grandchild of the last root (the AI's move, then the human's), the
+statistics already gathered below it are reused.
+
+    engine = MCTS(seed=1)
+    col = engine.best_move(board, "Allies", time_budget=1.0)
+
+    python mcts.py --match 10 --time 0.5 --depth 4      # MCTS against connect_four's minimax
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+try:
+    import numpy as np  # optional: playouts a batch at a time
+except ImportError:
+    np = None
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import opening_book
+
+WIN, DRAW, LOSS = 1.0, 0.5, 0.0  # playout results for the side to move
+
+
+class Node:
+    """Position after `col` was played; wins are counted for the player who played it."""
+
+    __slots__ = ("parent", "col", "position", "mask", "stones", "children", "untried",
+                 "visits", "wins", "terminal")
+
+    def __init__(self, parent, col, position, mask, stones, untried, terminal=None):
+        self.parent = parent
+        self.col = col
+        self.position = position  # stones of the side to move here
+        self.mask = mask
+        self.stones = stones
+        self.children = []
+        self.untried = untried    # columns not expanded yet
+        self.visits = 0
+        self.wins = 0.0
+        self.terminal = terminal  # result for the player who moved here, if the game is over
+
+
+class MCTS:
+    """UCT search over a Connect Four board, keeping its tree from move to move."""
+
+    def __init__(self, width=7, height=6, exploration=1.4, batch=64, seed=None):
+        self.board = opening_book.Solver(width, height)  # bitboard helpers
+        self.width, self.height = width, height
+        self.exploration = exploration
+        self.batch = batch
+        self.rng = random.Random(seed)
+        self.np_rng = np.random.default_rng(seed) if np is not None else None
+        self.root = None
+        self.last = {}  # counters of the last search
+        if np is not None:
+            step = height + 1
+            self._np_bottom = np.uint64(self.board.bottom)
+            self._np_full = np.uint64(self.board.board_mask)
+            self._np_columns = np.array(self.board.column_masks, dtype=np.uint64)
+            self._np_tops = np.array([1 << (col * step + height - 1) for col in range(width)], dtype=np.uint64)
+            self._np_shifts = [np.uint64(s) for s in (1, step, height, step + 1)]
+
+    # --- Tree ---
+
+    def _columns(self, mask):
+        board = self.board
+        return [col for col in board.order if not mask & (1 << (col * (self.height + 1) + self.height - 1))]
+
+    def _new_node(self, parent, col, position, mask, stones):
+        terminal = None
+        if parent is not None and self._wins(position ^ mask):  # the stones of the player who just moved
+            terminal = WIN
+        elif stones == self.board.cells:
+            terminal = DRAW
+        return Node(parent, col, position, mask, stones, [] if terminal is not None else self._columns(mask), terminal)
+
+    def _wins(self, stones):
+        for s in (1, self.height + 1, self.height, self.height + 2):
+            pairs = stones & (stones >> s)
+            if pairs & (pairs >> 2 * s):
+                return True
+        return False
+
+    def set_position(self, position, mask):
+        """Makes (position, mask) the root, reusing a child or grandchild of the old root."""
+        root = self.root
+        if root is not None:
+            candidates = [root] + root.children + [g for child in root.children for g in child.children]
+            for node in candidates:
+                if node.position == position and node.mask == mask:
+                    node.parent = None
+                    self.root = node
+                    return True
+        self.root = self._new_node(None, None, position, mask, bin(mask).count("1"))
+        return False
+
+    def _select(self):
+        """Walks down by UCT, expanding one new child; counts the visit (virtual loss) on the way."""
+        node = self.root
+        node.visits += 1
+        c = self.exploration
+        while node.terminal is None:
+            if node.untried:
+                col = node.untried.pop(0)
+                position, mask = self.board.play(node.position, node.mask, col)
+                child = self._new_node(node, col, position, mask, node.stones + 1)
+                node.children.append(child)
+                child.visits += 1
+                return child
+            log_visits = math.log(node.visits)
+            node = max(node.children, key=lambda ch: ch.wins / ch.visits + c * math.sqrt(log_visits / ch.visits))
+            node.visits += 1
+        return node
+
+    def _backpropagate(self, node, result):
+        """result is for the player who moved into node."""
+        while node is not None:
+            node.wins += result
+            result = 1.0 - result
+            node = node.parent
+
+    # --- Playouts ---
+
+    def playouts(self, positions, masks):
+        """Result of one random game from each position, for the side to move there."""
+        if np is not None and len(positions) > 1:
+            return self._playouts_numpy(np.array(positions, dtype=np.uint64), np.array(masks, dtype=np.uint64))
+        return [self._playout(position, mask) for position, mask in zip(positions, masks)]
+
+    def _playout(self, position, mask):
+        board, rng = self.board, self.rng
+        result = WIN
+        while mask != board.board_mask:
+            col = rng.choice(self._columns(mask))
+            move = (mask + (1 << (col * (self.height + 1)))) & board.column_masks[col]
+            if self._wins(position | move):
+                return result
+            position, mask = position ^ mask, mask | move
+            result = 1.0 - result
+        return DRAW
+
+    def _playouts_numpy(self, position, mask):
+        n = len(position)
+        results = np.full(n, DRAW)
+        active = np.arange(n)
+        mover_result = WIN  # result (for the side to move at the start) if the current mover wins
+        rng, full = self.np_rng, self._np_full
+        while active.size:
+            pos, msk = position[active], mask[active]
+            # a uniformly random non-full column for each game
+            open_cols = (msk[:, None] & self._np_tops[None, :]) == 0
+            choice = np.argmax(np.where(open_cols, rng.random((active.size, self.width)), -1.0), axis=1)
+            move = (msk + self._np_bottom) & self._np_columns[choice]
+            stones = pos | move
+            won = np.zeros(active.size, dtype=bool)
+            for s in self._np_shifts:
+                pairs = stones & (stones >> s)
+                won |= (pairs & (pairs >> (s + s))) != 0
+            results[active[won]] = mover_result
+            msk = msk | move
+            playing = ~won & (msk != full)
+            position[active] = pos ^ (msk ^ move)  # the other side's stones
+            mask[active] = msk
+            active = active[playing]
+            mover_result = 1.0 - mover_result
+        return results.tolist()
+
+    # --- Search ---
+
+    def search(self, time_budget=None, playouts=None):
+        """Runs rounds of `batch` playouts until time_budget seconds or `playouts` playouts are used."""
+        if time_budget is None and playouts is None:
+            raise ValueError("give a time budget or a number of playouts")
+        start = time.perf_counter()
+        deadline = start + time_budget if time_budget is not None else math.inf
+        limit = playouts if playouts is not None else math.inf
+        done = terminal_hits = 0
+        while done < limit and time.perf_counter() < deadline and self.root.terminal is None:
+            leaves = []
+            size = int(min(self.batch, limit - done))
+            for _ in range(size):
+                node = self._select()
+                if node.terminal is not None:
+                    self._backpropagate(node, node.terminal)
+                    terminal_hits += 1
+                else:
+                    leaves.append(node)
+            done += size
+            if not leaves:
+                continue
+            results = self.playouts([leaf.position for leaf in leaves], [leaf.mask for leaf in leaves])
+            for leaf, result in zip(leaves, results):
+                self._backpropagate(leaf, 1.0 - result)  # playout results are for the side to move at the leaf
+        elapsed = time.perf_counter() - start
+        self.last = {"simulations": done, "terminal_hits": terminal_hits, "root_visits": self.root.visits,
+                     "seconds": round(elapsed, 4), "simulations_per_sec": round(done / elapsed) if elapsed else 0}
+
+    def best_move(self, board, player, time_budget=1.0, playouts=None):
+        """Most visited column for `player` to move on a connect_four board."""
+        position, mask = opening_book.from_board(board, player)
+        reused = self.set_position(position, mask)
+        reused_visits = self.root.visits if reused else 0
+        # a move that wins at once needs no search
+        wins = self.board.can_win_next(position, mask)
+        if wins:
+            col = next(col for col in self.board.order if wins & self.board.column_masks[col])
+            self.last = {"simulations": 0, "immediate_win": True}
+            return col
+        self.search(time_budget, playouts)
+        self.last["reused_visits"] = reused_visits
+        if not self.root.children:
+            return None
+        return max(self.root.children, key=lambda ch: (ch.visits, ch.wins)).col
+
+
+# --- Matches ---
+
+def match(games, time_budget, depth, seed=0):
+    """MCTS (Allies) against connect_four's minimax (Axis), Axis opening with a random column."""
+    import connect_four as c4
+    c4.USE_BOOK = False
+    score = {"mcts": 0, "minimax": 0, "draw": 0}
+    for game in range(games):
+        engine = MCTS(seed=seed + game)
+        board = c4.empty_board()
+        player = "Axis"
+        random.seed(seed + game)  # first Axis move at random, so the games differ
+        first = True
+        while True:
+            if player == "Axis":
+                col = random.choice(c4.get_valid_locations(board)) if first else \
+                    c4.minimax(board, depth, -math.inf, math.inf, False)[0]
+                first = False
+            else:
+                col = engine.best_move(board, "Allies", time_budget)
+            c4.drop_piece(board, col, player)
+            if c4.check_winner(board, player):
+                score["mcts" if player == "Allies" else "minimax"] += 1
+                break
+            if c4.is_board_full(board):
+                score["draw"] += 1
+                break
+            player = "Allies" if player == "Axis" else "Axis"
+        print(f"game {game + 1}: {score}")
+    return score
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="MCTS for Connect Four.")
+    parser.add_argument("--time", type=float, default=1.0, help="seconds per MCTS move")
+    parser.add_argument("--match", type=int, default=0, metavar="GAMES", help="play GAMES against minimax")
+    parser.add_argument("--depth", type=int, default=4, help="minimax depth in the match")
+    parser.add_argument("--batch", type=int, default=64)
+    args = parser.parse_args()
+    if args.match:
+        match(args.match, args.time, args.depth)
+    else:
+        engine = MCTS(batch=args.batch, seed=0)
+        empty = [[None] * 7 for _ in range(6)]
+        col = engine.best_move(empty, "Axis", args.time)
+        print(f"{'numpy' if np is not None else 'python'} playouts: column {col}, {engine.last}")
@@ -0,0 +1,336 @@
+"""Solved opening book for connect_four.py: best move and value of every early position.
+
+Positions are bitboards: each column takes height + 1 bits (the extra bit stays empty),
+`position` holds the stones of the side to move and `mask` all stones. position + mask is
+a unique key, and a position and its mirror image (columns reversed) share one entry, keyed
+by the smaller of their two keys.
+
+The builder lists every position up to N plies and solves the positions one ply further
+with an exact win/draw/loss search (alpha-beta, a transposition table, and no move that
+hands the opponent a four). It then backs the values up to the root. The book file holds
+the sorted keys and one byte per position (value and best column). At runtime it is
+memory-mapped, and a lookup is a binary search over the keys.
+
+    python opening_book.py --plies 8 --out opening_book.c4b --workers 8
+    book = OpeningBook.load("opening_book.c4b")
+    book.move(board, "Allies")                  # column, or None past the book
+
+Values are from the side to move: 1 win, 0 draw, -1 loss (perfect play from both sides).
+Solving is pure Python, so the full 7x6 book is a long offline job for many --workers.
+Smaller boards (--width/--height) build in seconds.
+"""
+import argparse
+import bisect
+import mmap
+import os
+import struct
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+MAGIC = b"C4BOOK01"
+HEADER = struct.Struct("<8sIIII")  # magic, width, height, plies, number of positions
+WIN, DRAW, LOSS = 1, 0, -1
+
+
+class Solver:
+    """Exact win/draw/loss values of positions on a width x height board."""
+
+    def __init__(self, width=7, height=6, max_entries=1 << 22):
+        if width < 4 or height < 4 or width * (height + 1) > 64:
+            raise ValueError("boards from 4x4 up to 64 bits (height + 1 per column)")
+        self.width, self.height = width, height
+        self.cells = width * height
+        self.bottom = sum(1 << (col * (height + 1)) for col in range(width))
+        self.board_mask = self.bottom * ((1 << height) - 1)
+        self.column_masks = [((1 << height) - 1) << (col * (height + 1)) for col in range(width)]
+        # centre columns first: they take part in the most lines
+        self.order = sorted(range(width), key=lambda col: (abs(2 * col - width + 1), col))
+        self.table = {}
+        self.max_entries = max_entries
+        self.nodes = 0
+
+    # --- Bitboards ---
+
+    def possible(self, mask):
+        """The cell each non-full column would be played into."""
+        return (mask + self.bottom) & self.board_mask
+
+    def winning_cells(self, position, mask):
+        """Empty cells that would complete four for the stones in `position`."""
+        p = position
+        cells = (p << 1) & (p << 2) & (p << 3)  # vertical
+        for s in (self.height + 1, self.height, self.height + 2):  # horizontal and both diagonals
+            pair = (p << s) & (p << 2 * s)
+            cells |= pair & (p << 3 * s)
+            cells |= pair & (p >> s)
+            pair = (p >> s) & (p >> 2 * s)
+            cells |= pair & (p << s)
+            cells |= pair & (p >> 3 * s)
+        return cells & (self.board_mask ^ mask)
+
+    def can_win_next(self, position, mask):
+        return self.winning_cells(position, mask) & self.possible(mask)
+
+    def non_losing_moves(self, position, mask):
+        """Moves that don't let the opponent win at once (0 if every move loses)."""
+        possible = self.possible(mask)
+        threats = self.winning_cells(position ^ mask, mask)
+        forced = possible & threats
+        if forced:
+            if forced & (forced - 1):
+                return 0  # two threats: one of them goes through
+            possible = forced
+        return possible & ~(threats >> 1)  # never play just below an opponent's winning cell
+
+    def play(self, position, mask, col):
+        """(position, mask) after the side to move plays col, from the other side's view."""
+        return position ^ mask, mask | ((mask + (1 << (col * (self.height + 1)))) & self.column_masks[col])
+
+    def mirror(self, bits):
+        step, column = self.height + 1, (1 << (self.height + 1)) - 1
+        out = 0
+        for col in range(self.width):
+            out |= ((bits >> (col * step)) & column) << ((self.width - 1 - col) * step)
+        return out
+
+    def canonical(self, position, mask):
+        """(key, mirrored): the smaller key of the position and its mirror image."""
+        key = position + mask
+        mirror_key = self.mirror(position) + self.mirror(mask)
+        return (mirror_key, True) if mirror_key < key else (key, False)
+
+    # --- Search ---
+
+    def solve(self, position, mask, moves):
+        """WIN, DRAW or LOSS for the side to move; `moves` stones are on the board."""
+        if self.can_win_next(position, mask):
+            return WIN
+        # two null-window probes (win? then loss?) prune more than one search with the whole window
+        if self._negamax(position, mask, moves, DRAW, WIN) > DRAW:
+            return WIN
+        return DRAW if self._negamax(position, mask, moves, LOSS, DRAW) > LOSS else LOSS
+
+    def _negamax(self, position, mask, moves, alpha, beta):
+        """Value for the side to move, who can't win at once (the caller checked)."""
+        self.nodes += 1
+        candidates = self.non_losing_moves(position, mask)
+        if not candidates:
+            return LOSS
+        if moves >= self.cells - 2:
+            return DRAW  # neither side can win with the last two stones
+        key = position + mask
+        low, high = self.table.get(key, (LOSS, WIN))
+        if low >= beta or low == high:
+            return low
+        if high <= alpha:
+            return high
+        alpha, beta = max(alpha, low), min(beta, high)
+
+        # Moves that create the most new threats first, the centre breaking ties
+        scored = []
+        for i, col in enumerate(self.order):
+            move = candidates & self.column_masks[col]
+            if move:
+                threats = self.winning_cells(position | move, mask).bit_count()
+                scored.append((-threats, i, move))
+        scored.sort()
+
+        original_alpha = alpha
+        best = LOSS
+        for _, _, move in scored:
+            value = -self._negamax(position ^ mask, mask | move, moves + 1, -beta, -alpha)
+            if value > best:
+                best = value
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+
+        if len(self.table) >= self.max_entries:
+            self.table.clear()
+        if best <= original_alpha:
+            self.table[key] = (low, best)
+        elif best >= beta:
+            self.table[key] = (best, high)
+        else:
+            self.table[key] = (best, best)
+        return best
+
+
+class OpeningBook:
+    """Sorted canonical keys and their (value, best column) bytes, usually memory-mapped."""
+
+    def __init__(self, width, height, plies, keys, entries):
+        self.width, self.height, self.plies = width, height, plies
+        self.keys = keys          # sequence of ints, ascending
+        self.entries = entries    # entries[i] = (value + 1) << 4 | column
+        self.solver = Solver(width, height)
+
+    def __len__(self):
+        return len(self.keys)
+
+    def lookup(self, position, mask):
+        """(best column, value) for the side to move, or None if the position isn't in the book."""
+        key, mirrored = self.solver.canonical(position, mask)
+        i = bisect.bisect_left(self.keys, key)
+        if i == len(self.keys) or self.keys[i] != key:
+            return None
+        entry = self.entries[i]
+        col = entry & 15
+        return (self.width - 1 - col if mirrored else col), (entry >> 4) - 1
+
+    def move(self, board, player):
+        """Book column for `player` to move on a connect_four board (rows top to bottom), or None."""
+        if len(board) != self.height or len(board[0]) != self.width:
+            return None
+        position, mask = from_board(board, player)
+        found = self.lookup(position, mask)
+        return found[0] if found else None
+
+    def save(self, path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.width, self.height, self.plies, len(self.keys)))
+            f.write(struct.pack(f"<{len(self.keys)}Q", *self.keys))
+            f.write(bytes(self.entries))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-maps a file written by save(); keys and entries are read-only views into the map."""
+        with open(path, "rb") as f:
+            view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        magic, width, height, plies, count = HEADER.unpack(view[:HEADER.size])
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a Connect Four opening book")
+        keys_end = HEADER.size + 8 * count
+        keys = view[HEADER.size:keys_end].cast("Q")
+        return cls(width, height, plies, keys, view[keys_end:keys_end + count])
+
+    def __repr__(self):
+        return f"<OpeningBook {self.width}x{self.height}, {len(self)} positions up to ply {self.plies}>"
+
+
+def from_board(board, player):
+    """(position, mask) bitboards of a connect_four board with `player` to move."""
+    height = len(board)
+    position = mask = 0
+    for row_index, row in enumerate(board):
+        for col, cell in enumerate(row):
+            if cell is not None:
+                bit = 1 << (col * (height + 1) + height - 1 - row_index)
+                mask |= bit
+                if cell == player:
+                    position |= bit
+    return position, mask
+
+
+# --- Building ---
+
+_solver = None
+
+
+def _init_worker(width, height):
+    global _solver
+    _solver = Solver(width, height)
+
+
+def _solve_job(batch):
+    """Values of a batch of (position, mask, moves); one solver (and table) per process."""
+    return [_solver.solve(position, mask, moves) for position, mask, moves in batch]
+
+
+def build(width=7, height=6, plies=8, workers=None, log=print):
+    """Solves every position of up to `plies` stones; returns an OpeningBook held in memory."""
+    solver = Solver(width, height)
+    # levels[n]: canonical key -> (position, mask) of the unfinished positions with n stones
+    levels = [{solver.canonical(0, 0)[0]: (0, 0)}]
+    for n in range(plies + 1):
+        following = {}
+        for position, mask in levels[n].values():
+            if n + 1 == solver.cells or solver.can_win_next(position, mask):
+                continue  # decided without looking at the next ply
+            for col in solver.order:
+                if not mask & (1 << (col * (height + 1) + height - 1)):
+                    child = solver.play(position, mask, col)
+                    key, mirrored = solver.canonical(*child)
+                    if key not in following:
+                        following[key] = (solver.mirror(child[0]), solver.mirror(child[1])) if mirrored else child
+        levels.append(following)
+        if log:
+            log(f"ply {n + 1}: {len(following)} positions")
+
+    # Solve the ply after the book, then back the values up to the root
+    start = time.perf_counter()
+    frontier = list(levels[plies + 1].items())
+    jobs = [(position, mask, plies + 1) for _, (position, mask) in frontier]
+    if workers == 1 or len(jobs) < 2:
+        _init_worker(width, height)
+        solved = _solve_job(jobs)
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(width, height)) as pool:
+            size = max(1, len(jobs) // (8 * (pool._max_workers or 1)))
+            solved = [v for part in pool.map(_solve_job, [jobs[i:i + size] for i in range(0, len(jobs), size)])
+                      for v in part]
+    values = {key: value for (key, _), value in zip(frontier, solved)}
+    if log:
+        log(f"solved {len(jobs)} positions at ply {plies + 1} in {time.perf_counter() - start:.1f}s")
+
+    book = {}
+    for n in range(plies, -1, -1):
+        level_values = {}
+        for key, (position, mask) in levels[n].items():
+            wins = solver.can_win_next(position, mask)
+            if wins:
+                best_col = next(col for col in solver.order if wins & solver.column_masks[col])
+                best = WIN
+            else:
+                best_col, best = None, None
+                for col in solver.order:
+                    if mask & (1 << (col * (height + 1) + height - 1)):
+                        continue
+                    if n + 1 == solver.cells:
+                        value = DRAW
+                    else:
+                        value = -values[solver.canonical(*solver.play(position, mask, col))[0]]
+                    if best is None or value > best:
+                        best_col, best = col, value
+                        if value == WIN:
+                            break
+            level_values[key] = best
+            book[key] = (best + 1) << 4 | best_col
+        values = level_values
+
+    keys = sorted(book)
+    return OpeningBook(width, height, plies, keys, bytearray(book[key] for key in keys))
+
+
+def load_or_build(path, width=7, height=6, plies=8, workers=None):
+    """Loads the book at path, or builds it (and saves it there) when the file is missing."""
+    if os.path.exists(path):
+        return OpeningBook.load(path)
+    book = build(width, height, plies, workers)
+    book.save(path)
+    return OpeningBook.load(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a solved opening book for Connect Four.")
+    parser.add_argument("--plies", type=int, default=8, help="stones on the board in the deepest book positions")
+    parser.add_argument("--width", type=int, default=7)
+    parser.add_argument("--height", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=None, help="processes solving positions (default: all cores)")
+    parser.add_argument("--out", default="opening_book.c4b")
+    args = parser.parse_args()
+
+    t = time.perf_counter()
+    book = build(args.width, args.height, args.plies, args.workers)
+    book.save(args.out)
+    book = OpeningBook.load(args.out)
+    print(f"{book} built in {time.perf_counter() - t:.1f}s ({os.path.getsize(args.out)} bytes, {args.out})")
+    value = book.lookup(0, 0)[1]
+    print("first player", {WIN: "wins", DRAW: "draws", LOSS: "loses"}[value], "with perfect play")
+    t = time.perf_counter()
+    for _ in range(10000):
+        book.lookup(0, 0)
+    print(f"lookup: {(time.perf_counter() - t) * 100:.1f} us")
@@ -0,0 +1,156 @@
+"""Root-split parallel minimax for connect_four.py.
+
+The centre-most legal column is searched first, in this process, and its score becomes
+alpha. The other columns are then searched together in a process pool, each with a window
+fixed before any job starts (principal-variation splitting at the root). No worker's
+window depends on another's result, so node counts and the answer never depend on which
+worker finishes first. The chosen column and score are exactly those of connect_four's
+serial minimax.
+
+    pool = root_pool(8)
+    col, score = parallel_best_move(board, depth=6, pool=pool)
+
+    python parallel_search.py --depths 4 5 6 --cores 1 2 4 8 --budget 2   # scaling benchmark
+"""
+import argparse
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import connect_four as c4
+import search_stats
+
+_pools = {}  # workers -> pool kept for the game's later moves
+
+
+def root_pool(workers=None):
+    return ProcessPoolExecutor(workers)
+
+
+def shared_pool(workers):
+    """A pool of `workers` processes, created on first use and reused by later moves."""
+    if workers not in _pools:
+        _pools[workers] = root_pool(workers)
+    return _pools[workers]
+
+
+def _column_job(board, col, depth, alpha):
+    """Score of the AI playing col, searched depth - 1 more plies with the window (alpha, inf)."""
+    saved, c4.STATS = c4.STATS, search_stats.SearchStats("connect_four", "root_column")
+    stats = c4.STATS
+    stats.root_depth = depth
+    try:
+        c4.drop_piece(board, col, "Allies")
+        score = c4.minimax(board, depth - 1, alpha, math.inf, False)[1]
+    finally:
+        c4.STATS = saved
+    return score, stats.nodes, stats.cutoffs
+
+
+def parallel_best_move(board, depth, workers=None, pool=None, stats=None):
+    """(column, score) for the AI (Allies) to move, by minimax with the root split over a pool.
+
+    Node and cutoff counts are added to `stats` (a search_stats.SearchStats) when given. It
+    is passed in rather than read from c4.STATS: when the game runs as a script, this
+    module's connect_four is a second copy of it, not the game's __main__.
+
+    Columns left of the eldest are searched with alpha one below its score. A column that
+    ties with it then still returns its exact score, so ties go to the lowest column, as
+    in the serial search.
+    """
+    valid = c4.get_valid_locations(board)
+    if depth == 0 or c4.is_terminal_node(board) or not valid:
+        return c4.minimax(board, depth, -math.inf, math.inf, True)
+    own_pool = pool is None
+    if own_pool:
+        pool = root_pool(workers)
+    try:
+        eldest = min(valid, key=lambda col: (abs(col - c4.GRID_WIDTH // 2), col))
+        alpha, nodes, cutoffs = _column_job([row[:] for row in board], eldest, depth, -math.inf)
+        jobs = {col: pool.submit(_column_job, [row[:] for row in board], col, depth,
+                                 alpha - 1 if col < eldest else alpha)
+                for col in valid if col != eldest}
+        scores = {eldest: alpha}
+        for col, future in jobs.items():
+            scores[col], col_nodes, col_cutoffs = future.result()
+            nodes += col_nodes
+            cutoffs += col_cutoffs
+        if stats is not None:
+            stats.nodes += nodes + 1
+            stats.cutoffs += cutoffs
+            stats.expand(len(valid))
+            stats.extra["root_jobs"] = len(jobs)
+        best = max(scores.values())
+        return min(col for col, score in scores.items() if score == best), best
+    finally:
+        if own_pool:
+            pool.shutdown(cancel_futures=True)
+
+
+# --- Scaling benchmark ---
+
+def _serial(board, depth):
+    c4.STATS = stats = search_stats.SearchStats("connect_four", "minimax")
+    stats.root_depth = depth
+    try:
+        col, score = c4.minimax([row[:] for row in board], depth, -math.inf, math.inf, True)
+    finally:
+        c4.STATS = None
+    return col, score, stats.nodes
+
+
+def benchmark(boards, depths, core_counts, budget=None):
+    """Times serial minimax against the root split for each depth and core count.
+
+    With a budget (seconds per move), also reports the deepest search each core count
+    finishes within it on every board.
+    """
+    deepest = {"serial": 0, **{cores: 0 for cores in core_counts}}
+    pools = {cores: root_pool(cores) for cores in core_counts}
+    try:
+        for depth in depths:
+            serial_time, serial_nodes, results = 0.0, 0, []
+            for board in boards:
+                t = time.perf_counter()
+                col, score, nodes = _serial(board, depth)
+                serial_time += time.perf_counter() - t
+                serial_nodes += nodes
+                results.append((col, score))
+            print(f"depth {depth}: serial   {serial_nodes:>10} nodes {serial_time:8.2f}s")
+            if budget and serial_time / len(boards) <= budget:
+                deepest["serial"] = depth
+            for cores in core_counts:
+                stats = search_stats.SearchStats("connect_four", "parallel")
+                stats.root_depth = depth
+                t = time.perf_counter()
+                same = all(parallel_best_move(board, depth, pool=pools[cores], stats=stats) == result
+                           for board, result in zip(boards, results))
+                elapsed = time.perf_counter() - t
+                print(f"         {cores:>2} cores {stats.nodes:>10} nodes {elapsed:8.2f}s "
+                      f"speedup {serial_time / elapsed:5.2f}x  {'same moves' if same else 'DIFFERENT MOVES'}")
+                if budget and elapsed / len(boards) <= budget:
+                    deepest[cores] = depth
+    finally:
+        for pool in pools.values():
+            pool.shutdown()
+    if budget:
+        print(f"deepest search within {budget:g}s per move: " +
+              ", ".join(f"{name if name == 'serial' else f'{name} cores'} depth {d}" for name, d in deepest.items()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scaling benchmark of the root-split Connect Four search.")
+    parser.add_argument("--depths", type=int, nargs="+", default=[4, 5, 6])
+    parser.add_argument("--cores", type=int, nargs="+", help="core counts to try (default: 1, 2, 4, ... up to all)")
+    parser.add_argument("--budget", type=float, help="seconds per move: report the deepest search that fits")
+    args = parser.parse_args()
+    import benchmark as game_benchmark  # the positions of ../benchmark.py
+    boards = [game_benchmark.connect_four_position(c4, columns)
+              for columns in game_benchmark.CONNECT_FOUR_POSITIONS.values()]
+    cores = args.cores or [c for c in (1, 2, 4, 8, 16, 32, 64) if c <= (os.cpu_count() or 1)]
+    benchmark(boards, args.depths, cores, args.budget)
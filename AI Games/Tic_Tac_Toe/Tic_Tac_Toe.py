@@ -2,6 +2,11 @@ import pygame
 import sys
 import math
 import random
+import os
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+import game_assets
+import search_stats
 
 # --- Configuration ---
 WIDTH, HEIGHT = 600, 600
@@ -16,38 +21,38 @@ FPS = 30
 PLAYER = "Kriegsmarine"  # "X" Human player replacement (The German Navy)
 AI = "Imperial Japanese Navy"  # "O" AI replacement (The Navy of the Great Empire of Japan)  
 
-pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Tic-Tac-Toe — Kriegsmarine vs IJN")
-clock = pygame.time.Clock()
+GAME_DIR = os.path.dirname(os.path.abspath(__file__))
 
-# --- Load images ---
-def load_scaled(path):
-    try:
-        img = pygame.image.load(path).convert_alpha()
-        return pygame.transform.smoothscale(img, (CELL_SIZE, CELL_SIZE))
-    except:
-        print(f"Warning: Could not load {path}")
-        return None
-
-# Background (ocean)
+# Window, images and font are created by setup() from main(), so the AI
+# functions below can be imported without opening a window.
+screen = None
+clock = None
 ocean_bg = None
-try:
-    ocean_bg = pygame.image.load("assets/ocean.png").convert()
-    ocean_bg = pygame.transform.smoothscale(ocean_bg, (WIDTH, HEIGHT))
-except:
-    print("Warning: No ocean background found")
-
-# German Vessels (KMS Bismarck)
-german_ships = [
-    load_scaled("assets/bismarck.png")
-]
-# Japanese Vessels (HIJMS Kirishima)
-japanese_ships = [
-    load_scaled("assets/kirishima.png"),
-]
+german_ships = []    # German Vessels (KMS Bismarck)
+japanese_ships = []  # Japanese Vessels (HIJMS Kirishima)
+font = None
 
-font = pygame.font.SysFont(None, 32)
+# --- Load images ---
+def setup():
+    """Opens the window and loads the font and images (cached on disk, display-format surfaces)."""
+    global screen, clock, ocean_bg, german_ships, japanese_ships, font
+    screen = game_assets.init_display(WIDTH, HEIGHT, "Tic-Tac-Toe — Kriegsmarine vs IJN")
+    clock = pygame.time.Clock()
+
+    specs = {
+        "assets/ocean.png": game_assets.ImageSpec("assets/ocean.png", (WIDTH, HEIGHT), alpha=False),
+        "assets/bismarck.png": game_assets.ImageSpec("assets/bismarck.png", (CELL_SIZE, CELL_SIZE)),
+        "assets/kirishima.png": game_assets.ImageSpec("assets/kirishima.png", (CELL_SIZE, CELL_SIZE)),
+    }
+    images = game_assets.load_images(specs, GAME_DIR)
+    for path, img in images.items():
+        if img is None:
+            print(f"Warning: Could not load {path}")
+
+    ocean_bg = images["assets/ocean.png"]
+    german_ships = [images["assets/bismarck.png"]]
+    japanese_ships = [images["assets/kirishima.png"]]
+    font = pygame.font.SysFont(None, 32)
 
 # --- Game state ---
 def empty_board():
@@ -131,12 +136,20 @@ def evaluate(board):
     elif w == "Draw": return 0
     return None
 
+STATS = None  # search_stats.SearchStats while a traced best_ai_move runs
+
 def minimax(board, depth, is_max, alpha, beta):
+    if STATS is not None:
+        STATS.visit(depth)
     score = evaluate(board)
     if score is not None:
+        if STATS is not None:
+            STATS.leaves += 1
         return score - depth if score > 0 else score + depth, None
 
     moves = available_moves(board)
+    if STATS is not None:
+        STATS.expand(len(moves))
     best_move = None
     if is_max:
         max_eval = -math.inf
@@ -148,7 +161,10 @@ def minimax(board, depth, is_max, alpha, beta):
                 max_eval = eval_score
                 best_move = m
             alpha = max(alpha, eval_score)
-            if beta <= alpha: break
+            if beta <= alpha:
+                if STATS is not None:
+                    STATS.cutoffs += 1
+                break
         return max_eval, best_move
     else:
         min_eval = math.inf
@@ -160,9 +176,13 @@ def minimax(board, depth, is_max, alpha, beta):
                 min_eval = eval_score
                 best_move = m
             beta = min(beta, eval_score)
-            if beta <= alpha: break
+            if beta <= alpha:
+                if STATS is not None:
+                    STATS.cutoffs += 1
+                break
         return min_eval, best_move
 
+@search_stats.traced("tic_tac_toe", "best_ai_move")
 def best_ai_move(board):
     if board.count(None) == 9:
         return 4
@@ -172,6 +192,7 @@ def best_ai_move(board):
 # --- Main loop ---
 def main():
     global board, game_over, current_turn, winner
+    setup()
     reset_game()
     running = True
 
@@ -0,0 +1,281 @@
+"""Headless benchmark for the three game AIs.
+
+Times each AI entry point (find_ai_move / best_ai_move) on a fixed set of positions, plus
+the evaluation and move-generation primitives the searches lean on, and compares the
+results with a stored baseline.
+
+    python benchmark.py                      # run everything, compare with the baseline
+    python benchmark.py --save-baseline      # run and store the results as the new baseline
+    python benchmark.py --games chess --repeat 3 --threshold 0.25
+
+Exits with status 1 when a metric is slower than the baseline by more than --threshold.
+Searches are seeded, so node counts are reproducible from run to run.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import random
+import sys
+import time
+
+GAMES_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, GAMES_DIR)
+import search_stats
+
+BASELINE_FILE = os.path.join(GAMES_DIR, "benchmark_baseline.json")
+
+GAME_FILES = {
+    "chess": os.path.join("Chess", "chess.py"),
+    "connect_four": os.path.join("Connect_4", "connect_four.py"),
+    "tic_tac_toe": os.path.join("Tic_Tac_Toe", "Tic_Tac_Toe.py"),
+}
+
+
+def load_game(name):
+    """Imports a game module from its folder without opening a window."""
+    path = os.path.join(GAMES_DIR, GAME_FILES[name])
+    sys.path.insert(0, os.path.dirname(path))
+    spec = importlib.util.spec_from_file_location(os.path.splitext(os.path.basename(path))[0], path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# --- Fixed positions ---
+# Chess: coordinate moves from the starting position (the human plays first).
+CHESS_POSITIONS = {
+    "opening": ["e2e4"],
+    "italian": ["e2e4", "e7e5", "g1f3", "b8c6", "f1c4"],
+    "open_centre": ["d2d4", "d7d5", "c2c4", "d5c4", "e2e4", "e7e5", "d4e5"],
+    "queens_out": ["e2e4", "e7e5", "d1h5", "b8c6", "f1c4", "g7g6", "h5f3"],
+}
+# Connect Four: columns played in order, Axis (human) first, so the AI is to move.
+CONNECT_FOUR_POSITIONS = {
+    "centre": "3",
+    "early": "332",
+    "developing": "33241",
+    "middlegame": "332064425",
+    "crowded": "33241566501",
+}
+# Tic-Tac-Toe: X = human (Kriegsmarine), O = AI, read row by row.
+TIC_TAC_TOE_POSITIONS = {
+    "corner": "X........",
+    "edge": ".X.......",
+    "fork_threat": "X...O...X",
+    "late": "XOX.O.X..",
+}
+
+
+def chess_position(chess, moves):
+    gs = chess.GameState()
+    for text in moves:
+        start = (8 - int(text[1]), "abcdefgh".index(text[0]))
+        end = (8 - int(text[3]), "abcdefgh".index(text[2]))
+        move = next(m for m in gs.get_valid_moves() if (m.start_row, m.start_col) == start
+                    and (m.end_row, m.end_col) == end)
+        gs.make_move(move)
+        gs.white_to_move = not gs.white_to_move
+    return gs
+
+
+def connect_four_position(c4, columns):
+    board = c4.empty_board()
+    player = "Axis"
+    for col in columns:
+        c4.drop_piece(board, int(col), player)
+        player = "Allies" if player == "Axis" else "Axis"
+    return board
+
+
+def tic_tac_toe_position(ttt, text):
+    symbols = {"X": ttt.PLAYER, "O": ttt.AI, ".": None}
+    return [symbols[ch] for ch in text]
+
+
+# --- Measurement helpers ---
+def percentile(samples, q):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def time_search(fn, make_args, repeat):
+    """Runs a traced AI entry point `repeat` times. Returns latency and node statistics."""
+    tracer = search_stats.enable()
+    latencies = []
+    try:
+        for i in range(repeat):
+            args = make_args()
+            random.seed(i)
+            start = time.perf_counter()
+            fn(*args)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        search_stats.disable()
+    nodes = sum(r["nodes"] for r in tracer.records)
+    search_time = sum(r["seconds"] for r in tracer.records)
+    return {
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "nodes": nodes // repeat,
+        "nodes_per_sec": round(nodes / search_time) if search_time else None,
+    }
+
+
+def time_primitive(fn, args_list, min_time=0.2):
+    """Calls fn over args_list until min_time has passed. Returns microseconds per call."""
+    calls = 0
+    start = time.perf_counter()
+    while True:
+        for args in args_list:
+            fn(*args)
+        calls += len(args_list)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return {"us_per_call": round(elapsed / calls * 1e6, 3)}
+
+
+# --- Benchmarks per game ---
+def bench_chess(repeat, depth=3):
+    chess = load_game("chess")
+    results = {}
+    def fresh_position(moves):
+        chess.TT.clear()  # every search starts from an empty transposition table
+        return chess_position(chess, moves), depth
+
+    for name, moves in CHESS_POSITIONS.items():
+        results[f"find_ai_move/{name}"] = time_search(chess.find_ai_move, lambda: fresh_position(moves), repeat)
+        # the plain full-window minimax the PVS search replaced, at the same depth
+        results[f"find_ai_move_plain/{name}"] = time_search(
+            chess.find_ai_move_plain, lambda: (chess_position(chess, moves), depth), repeat)
+    states = [chess_position(chess, moves) for moves in CHESS_POSITIONS.values()]
+    results["evaluate"] = time_primitive(chess.evaluate, [(gs,) for gs in states])
+    try:
+        import nnue  # needs NumPy
+    except ImportError:
+        nnue = None
+    if nnue is not None:
+        network = nnue.random_network()
+        with_network = [gs.copy() for gs in states]
+        for gs in with_network:
+            gs.nnue = network.accumulator(gs)
+        results["evaluate_nnue"] = time_primitive(chess.evaluate, [(gs,) for gs in with_network])
+    results["get_valid_moves"] = time_primitive(lambda gs: gs.get_valid_moves(), [(gs,) for gs in states])
+    return results
+
+
+def bench_connect_four(repeat, depth=4):
+    c4 = load_game("connect_four")
+    c4.USE_BOOK = False  # time the search, even in positions a built opening book covers
+    results = {}
+    for name, columns in CONNECT_FOUR_POSITIONS.items():
+        results[f"best_ai_move/{name}"] = time_search(
+            c4.best_ai_move, lambda: (connect_four_position(c4, columns), depth), repeat)
+    boards = [connect_four_position(c4, columns) for columns in CONNECT_FOUR_POSITIONS.values()]
+    results["score_position"] = time_primitive(c4.score_position, [(b, "Allies") for b in boards])
+    results["check_winner"] = time_primitive(c4.check_winner, [(b, "Axis") for b in boards])
+    results["get_valid_locations"] = time_primitive(c4.get_valid_locations, [(b,) for b in boards])
+    if os.path.exists(c4.BOOK_PATH):
+        book = c4.opening_book.OpeningBook.load(c4.BOOK_PATH)
+        results["book_move"] = time_primitive(book.move, [(b, "Allies") for b in boards])
+    # one batch of random MCTS playouts from each position (NumPy when installed)
+    engine = c4.mcts.MCTS(seed=0)
+    starts = [c4.opening_book.from_board(b, "Allies") for b in boards]
+    results["mcts_playouts_x64"] = time_primitive(
+        engine.playouts, [([position] * 64, [mask] * 64) for position, mask in starts])
+    return results
+
+
+def bench_tic_tac_toe(repeat):
+    ttt = load_game("tic_tac_toe")
+    results = {}
+    for name, text in TIC_TAC_TOE_POSITIONS.items():
+        results[f"best_ai_move/{name}"] = time_search(
+            ttt.best_ai_move, lambda: (tic_tac_toe_position(ttt, text),), repeat)
+    boards = [tic_tac_toe_position(ttt, text) for text in TIC_TAC_TOE_POSITIONS.values()]
+    results["check_winner"] = time_primitive(ttt.check_winner, [(b,) for b in boards])
+    results["available_moves"] = time_primitive(ttt.available_moves, [(b,) for b in boards])
+    return results
+
+
+BENCHMARKS = {
+    "chess": bench_chess,
+    "connect_four": bench_connect_four,
+    "tic_tac_toe": bench_tic_tac_toe,
+}
+
+# Lower is better for every compared metric.
+COMPARED_METRICS = ("p50_ms", "p95_ms", "us_per_call")
+
+
+def compare(results, baseline, threshold):
+    """Returns a list of human-readable regressions beyond the threshold."""
+    regressions = []
+    for game, metrics in results.items():
+        for name, values in metrics.items():
+            old = baseline.get(game, {}).get(name)
+            if not old:
+                continue
+            for key in COMPARED_METRICS:
+                if key in values and old.get(key):
+                    ratio = values[key] / old[key]
+                    if ratio > 1 + threshold:
+                        regressions.append(f"{game} {name} {key}: {old[key]} -> {values[key]} (x{ratio:.2f})")
+    return regressions
+
+
+def print_results(results):
+    for game, metrics in results.items():
+        print(f"== {game}")
+        for name, values in metrics.items():
+            print(f"  {name:32s} " + "  ".join(f"{k}={v}" for k, v in values.items()))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the game AIs.")
+    parser.add_argument("--games", default=",".join(BENCHMARKS), help="comma separated subset of games")
+    parser.add_argument("--repeat", type=int, default=5, help="searches per position")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="allowed slowdown against the baseline (0.20 = 20%%)")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--history", help="append the results as one JSON line to this file")
+    args = parser.parse_args(argv)
+
+    results = {}
+    for game in args.games.split(","):
+        results[game] = BENCHMARKS[game](args.repeat)
+    print_results(results)
+
+    if args.history:
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"time": time.time(), "results": results}) + "\n")
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("No baseline yet; run with --save-baseline to create one.")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    for line in regressions:
+        print("REGRESSION:", line)
+    if not regressions:
+        print(f"No regressions beyond {args.threshold:.0%} of the baseline.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
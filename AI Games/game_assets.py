@@ -0,0 +1,110 @@
+"""Shared window setup and image loading for the AI games.
+
+Nothing here touches pygame until a game calls it from ``main()``, so the game
+modules can be imported (benchmarks, analysis scripts) without opening a window.
+
+Images are decoded and scaled on a thread pool, the scaled pixels are cached on
+disk under ``.asset_cache/`` next to the game (keyed by the source file's mtime
+and the target size), and every surface is converted to the display's pixel
+format before it is handed back, so blitting it each frame is a plain copy.
+"""
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+CACHE_DIR_NAME = ".asset_cache"
+
+
+def init_display(width, height, caption):
+    """Initialises pygame and opens the game window. Returns the screen surface."""
+    pygame.init()
+    screen = pygame.display.set_mode((width, height))
+    pygame.display.set_caption(caption)
+    return screen
+
+
+class ImageSpec:
+    """Describes one image to load: where it lives and how it should be prepared."""
+
+    def __init__(self, path, size, alpha=True, smooth=True):
+        self.path = path        # relative to the game folder
+        self.size = tuple(size) # target (width, height)
+        self.alpha = alpha      # keep per-pixel alpha (convert_alpha) or not (convert)
+        self.smooth = smooth    # smoothscale vs nearest-neighbour scale
+
+
+def _cache_file(cache_dir, spec, source_path):
+    """Cache entries are named after everything that changes the scaled pixels."""
+    stat = os.stat(source_path)
+    key = "%s|%d|%d|%dx%d|%d" % (os.path.abspath(source_path), stat.st_mtime_ns, stat.st_size,
+                                 spec.size[0], spec.size[1], spec.smooth)
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    name = os.path.splitext(os.path.basename(source_path))[0]
+    return os.path.join(cache_dir, f"{name}-{spec.size[0]}x{spec.size[1]}-{digest}.rgba")
+
+
+_to_bytes = getattr(pygame.image, "tobytes", None) or pygame.image.tostring
+_from_bytes = getattr(pygame.image, "frombytes", None) or pygame.image.fromstring
+
+
+def _scale(img, spec):
+    if spec.smooth:
+        try:
+            return pygame.transform.smoothscale(img, spec.size)
+        except ValueError:  # smoothscale only handles 24/32-bit surfaces (e.g. not paletted PNGs)
+            pass
+    return pygame.transform.scale(img, spec.size)
+
+
+def _load_scaled(spec, base_dir, cache_dir):
+    """Worker: returns the scaled image as an unconverted surface, or None if it can't be loaded."""
+    source_path = os.path.join(base_dir, spec.path)
+    try:
+        cache_path = _cache_file(cache_dir, spec, source_path)
+    except OSError:
+        return None  # source image missing
+
+    try:
+        with open(cache_path, "rb") as f:
+            data = f.read()
+        if len(data) == spec.size[0] * spec.size[1] * 4:
+            return _from_bytes(data, spec.size, "RGBA")
+    except OSError:
+        pass
+
+    try:
+        img = _scale(pygame.image.load(source_path), spec)
+    except (pygame.error, OSError):
+        return None
+
+    # Store the preprocessed pixels; a failed write only costs us the cache.
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_to_bytes(img, "RGBA"))
+        os.replace(tmp_path, cache_path)
+    except (OSError, pygame.error):
+        pass
+    return img
+
+
+def load_images(specs, base_dir, workers=4):
+    """Loads a dict of name -> ImageSpec in parallel and returns name -> Surface (or None).
+
+    Must be called after init_display(): surfaces are converted to the display format.
+    """
+    cache_dir = os.path.join(base_dir, CACHE_DIR_NAME)
+    names = list(specs)
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(names)))) as pool:
+        scaled = list(pool.map(lambda n: _load_scaled(specs[n], base_dir, cache_dir), names))
+
+    images = {}
+    for name, img in zip(names, scaled):
+        if img is not None:
+            # convert() needs the display, so it runs here on the main thread
+            img = img.convert_alpha() if specs[name].alpha else img.convert()
+        images[name] = img
+    return images
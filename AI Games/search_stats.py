@@ -0,0 +1,174 @@
+"""Optional counters, tracing and profiling for the game AIs' searches.
+
+Tracing is off by default. Turn it on with environment variables before starting a game:
+
+    AI_SEARCH_TRACE=trace.jsonl    append one JSON line per AI move (counters, timings)
+    AI_SEARCH_PROFILE=cprofile     also profile each AI move (or "pyinstrument" if installed)
+
+or from code with ``search_stats.enable("trace.jsonl", profiler="cprofile")``.
+
+A game marks its AI entry point with ``@search_stats.traced("game", "entry")`` and keeps a
+module-level ``STATS = None``. While a traced call runs, ``STATS`` holds a SearchStats object
+that the search updates; when tracing is off, each search node pays a single ``is not None`` test.
+"""
+import cProfile
+import functools
+import json
+import math
+import os
+import time
+
+TRACER = None  # the active Tracer, or None when tracing is off
+
+
+class SearchStats:
+    """Counters for one AI move. Searches update the fields directly."""
+
+    def __init__(self, game, entry):
+        self.game = game
+        self.entry = entry
+        self.root_depth = None  # nominal search depth, set by the entry point if it has one
+        self.nodes = 0          # every node the search entered
+        self.leaves = 0         # nodes answered by the evaluation (depth limit or terminal)
+        self.expanded = 0       # interior nodes whose moves were generated
+        self.children = 0       # moves generated at interior nodes (for the branching factor)
+        self.cutoffs = 0        # alpha-beta cutoffs
+        self.tt_probes = 0      # transposition-table lookups (searches that have a table)
+        self.tt_hits = 0
+        self.ply_nodes = []     # ply_nodes[p] = nodes entered at ply p from the root
+        self.iterations = []    # per-iteration depth/nodes/seconds for iterative deepening
+        self.extra = {}         # search-specific counters
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def visit(self, ply):
+        """Counts a node entered `ply` moves below the root."""
+        self.nodes += 1
+        ply_nodes = self.ply_nodes
+        while len(ply_nodes) <= ply:
+            ply_nodes.append(0)
+        ply_nodes[ply] += 1
+
+    def expand(self, n_children):
+        self.expanded += 1
+        self.children += n_children
+
+    def iteration_done(self, depth):
+        """Records the cumulative nodes and time at the end of one deepening iteration."""
+        self.iterations.append({"depth": depth, "nodes": self.nodes,
+                                "seconds": round(time.perf_counter() - self.started, 6)})
+
+    def as_dict(self):
+        depth = self.root_depth or max(len(self.ply_nodes) - 1, 0)
+        return {
+            "game": self.game,
+            "entry": self.entry,
+            "depth": self.root_depth,
+            "seconds": round(self.elapsed, 6),
+            "nodes": self.nodes,
+            "nodes_per_sec": round(self.nodes / self.elapsed) if self.elapsed > 0 else None,
+            "leaves": self.leaves,
+            "expanded": self.expanded,
+            "cutoffs": self.cutoffs,
+            "avg_branching": round(self.children / self.expanded, 3) if self.expanded else 0,
+            # effective branching factor: b such that b ** depth == nodes
+            "ebf": round(math.exp(math.log(self.nodes) / depth), 3) if self.nodes and depth else None,
+            "max_ply": len(self.ply_nodes) - 1,
+            "ply_nodes": self.ply_nodes,
+            "tt_probes": self.tt_probes,
+            "tt_hits": self.tt_hits,
+            "iterations": self.iterations,
+            **self.extra,
+        }
+
+
+class Tracer:
+    """Collects SearchStats for traced calls and writes them as JSON lines."""
+
+    def __init__(self, path=None, profiler=None):
+        if profiler not in (None, "cprofile", "pyinstrument"):
+            raise ValueError(f"unknown profiler {profiler!r} (use 'cprofile' or 'pyinstrument')")
+        self.path = path
+        self.profiler = profiler
+        self.records = []  # kept in memory as well, for benchmarks and interactive use
+        self._calls = 0
+
+    def _profile_path(self, entry, ext):
+        base = os.path.splitext(self.path)[0] if self.path else "search"
+        return f"{base}.{entry}.{self._calls}.{ext}"
+
+    def run(self, stats, fn, args, kwargs):
+        """Runs fn(*args, **kwargs) under the configured profiler and records the stats."""
+        self._calls += 1
+        profile_file = None
+        if self.profiler == "cprofile":
+            prof = cProfile.Profile()
+            stats.started = time.perf_counter()
+            result = prof.runcall(fn, *args, **kwargs)
+            stats.elapsed = time.perf_counter() - stats.started
+            profile_file = self._profile_path(stats.entry, "prof")
+            prof.dump_stats(profile_file)
+        elif self.profiler == "pyinstrument":
+            from pyinstrument import Profiler  # optional dependency
+            prof = Profiler()
+            prof.start()
+            stats.started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            finally:
+                stats.elapsed = time.perf_counter() - stats.started
+                prof.stop()
+            profile_file = self._profile_path(stats.entry, "html")
+            with open(profile_file, "w", encoding="utf-8") as f:
+                f.write(prof.output_html())
+        else:
+            stats.started = time.perf_counter()
+            result = fn(*args, **kwargs)
+            stats.elapsed = time.perf_counter() - stats.started
+
+        record = stats.as_dict()
+        record["time"] = time.time()
+        record["result"] = repr(result)
+        if profile_file:
+            record["profile"] = profile_file
+        self.records.append(record)
+        if self.path:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+        return result
+
+
+def enable(path=None, profiler=None):
+    """Turns tracing on for every @traced entry point. Returns the Tracer."""
+    global TRACER
+    TRACER = Tracer(path, profiler)
+    return TRACER
+
+
+def disable():
+    global TRACER
+    TRACER = None
+
+
+def traced(game, entry):
+    """Decorator for an AI entry point whose module has a global STATS used by its search."""
+    def decorate(fn):
+        module_globals = fn.__globals__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            tracer = TRACER
+            if tracer is None:
+                return fn(*args, **kwargs)
+            stats = SearchStats(game, entry)
+            module_globals["STATS"] = stats
+            try:
+                return tracer.run(stats, fn, args, kwargs)
+            finally:
+                module_globals["STATS"] = None
+        return wrapper
+    return decorate
+
+
+if os.environ.get("AI_SEARCH_TRACE") or os.environ.get("AI_SEARCH_PROFILE"):
+    enable(os.environ.get("AI_SEARCH_TRACE") or None, os.environ.get("AI_SEARCH_PROFILE") or None)
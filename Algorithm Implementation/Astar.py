@@ -1,65 +1,45 @@
-graph = {}       # Dictionary to store adjacency list with edge weights for each node
-heuristic = {}   # Dictionary to store heuristic values for each node
-cost = {}        # Dictionary to store cumulative cost from start to each node
-
-# Input graph with edge weights
-n = int(input("Enter number of edges: "))  # Read the number of edges
-for i in range(n):
-    u, v, w = input("Enter edge (u v w): ").split()  # Read edge from u to v with weight w
-    w = int(w)  # Convert weight to integer
-    if u not in graph:
-        graph[u] = []  
-    if v not in graph:
-        graph[v] = []  
-    graph[u].append((v, w))  
-    graph[v].append((u, w))  
-
-# Input heuristic values
-m = int(input("Enter number of heuristic values: "))  
-for i in range(m):
-    node, h = input("Enter node and heuristic: ").split()  
-    heuristic[node] = int(h) 
-
-start = input("Enter start node: ")  
-goal = input("Enter goal node: ")    
-
-open_list = [start]    # Nodes to explore, initialized with start
-closed_list = []       # Nodes already visited
-cost[start] = 0 # Cost to reach start node is 0
-novisit_list = []
-parent = {start: None} # Dictionary to keep track of parent nodes (for path reconstruction)
-
-while open_list: 
-    open_list.sort(key=lambda x: cost[x] + heuristic[x])  # Sort by f(n) = g(n) + h(n)
-    """lambda x: heuristic[x] is an anonymous function that takes one input x and returns heuristic[x].
-
-In this context:
-
-x is a node from next_level.
-
-heuristic[x] is the heuristic value of that node."""
-    current = open_list.pop(0)  # Pick node with lowest f(n)
-    if cost [current] < cost[open_list]:
-        novisit[current]
-    print("Not visiting this:", novisit)
-    print("Visiting:", current) 
-    if current == goal:  
-        print("Goal reached!")
-        # Reconstruct the path from goal back to start using parent dictionary
-        path = []
-        while current is not None:
-            path.append(current)
-            current = parent[current]
-        path.reverse()  # Reverse to get path from start to goal
-        print("Path:", " -> ".join(path)) 
-        break
-    closed_list.append(current)  # Mark current node as visited
-    for neighbor, w in graph[current]:  # Explore neighbors of current node
-        if neighbor in closed_list:  
-            continue
-        new_cost = cost[current] + w  # Calculate cost to reach neighbor via current
-        if neighbor not in open_list or new_cost < cost.get(neighbor, 999999):  # If neighbor not in open_list or new path is cheaper
-            cost[neighbor] = new_cost  # Update cost to neighbor
-            parent[neighbor] = current  # Set current as parent of neighbor
-            if neighbor not in open_list:  # If neighbor not yet in open_list
-                open_list.append(neighbor)  # Add neighbor for future exploration
+import sys
+from Graph_library import GraphBuilder, astar
+from Graph_loaders import graph_arg_parser, graph_from_args
+
+# Usage: python Astar.py                                   (type the graph in)
+#        python Astar.py edges.txt --heuristics h.txt --start A --goal G
+args = graph_arg_parser("A* search on a weighted graph.").parse_args()
+
+if args.edges:
+    graph = graph_from_args(args)  # edge list "u v w" per line, heuristic file "node h" per line
+else:
+    builder = GraphBuilder(weighted=True)  # adjacency list with edge weights, plus heuristic values
+
+    # Input graph with edge weights
+    n = int(input("Enter number of edges: "))  # Read the number of edges
+    for i in range(n):
+        u, v, w = input("Enter edge (u v w): ").split()  # Read edge from u to v with weight w
+        builder.add_edge(u, v, int(w))  # Stored in both directions (undirected graph)
+
+    # Input heuristic values
+    m = int(input("Enter number of heuristic values: "))
+    for i in range(m):
+        node, h = input("Enter node and heuristic: ").split()
+        builder.set_heuristic(node, int(h))
+    graph = builder.build()
+
+start = args.start or input("Enter start node: ")
+goal = args.goal or input("Enter goal node: ")
+if start not in graph.ids or goal not in graph.ids:
+    sys.exit("Start and goal must be nodes of the graph.")
+
+# Expand nodes in order of f(n) = g(n) + h(n) using a binary heap; see Graph_library.astar
+result = astar(graph, graph.id(start), graph.id(goal))
+
+if not args.edges:  # typed-in graphs are small enough to show every expansion
+    for node in result.order:
+        print("Visiting:", graph.name(node))
+if result.found:
+    print("Goal reached!")
+    print("Path:", " -> ".join(graph.path_names(result.path)))
+    print(f"Cost: {result.cost:g}")
+else:
+    print(f"No path between {start} and {goal}")
+print("Nodes expanded: {expanded}, heap pushes: {heap_pushes}, heap pops: {heap_pops} "
+      "({stale_pops} outdated), reopened: {reopened}".format(**result.stats))
@@ -1,51 +1,46 @@
-graph = {}
-heuristic = {}
-
-# Input graph edges
-n = int(input("Enter number of edges: "))
-for i in range(n):
-    u, v = input("Enter edge (u v): ").split()
-    if u not in graph:
-        graph[u] = []  
-    if v not in graph:
-        graph[v] = [] 
-    graph[u].append(v)  
-    graph[v].append(u) 
-
-# Input heuristic values for nodes
-m = int(input("Enter number of heuristic values: "))
-for i in range(m):
-    node, h = input("Enter node and heuristic: ").split()
-    heuristic[node] = int(h)
-
-start = input("Enter start node: ")
-goal = input("Enter goal node: ")
-beam_width = int(input("Enter beam width: "))  # Max number of nodes to keep at each level
-
-open_list = [start]  # Nodes to explore at current level
-closed_list = []     # Already visited nodes
-
-while open_list:
-    next_level = []  # Collect nodes for the next level
-    for current in open_list:
-        print("Visiting:", current)
-        if current == goal:
-            print("Goal reached!")
-            exit()  # Stop search immediately if goal is found
-
-        closed_list.append(current)  # Mark current node as visited
-        for neighbor in graph[current]:
-            # Add unvisited neighbors to next level
-            if neighbor not in closed_list and neighbor not in next_level:
-                next_level.append(neighbor)
-
-    # Sort next level by heuristic and keep only top 'beam_width' nodes
-    next_level.sort(key=lambda x: heuristic[x])
-    """lambda x: heuristic[x] is an anonymous function that takes one input x and returns heuristic[x].
-
-In this context:
-
-x is a node from next_level.
-
-heuristic[x] is the heuristic value of that node."""
-    open_list = next_level[:beam_width]  # Update open_list for next iteration
+import sys
+from Graph_library import GraphBuilder, beam_search
+from Graph_loaders import graph_arg_parser, graph_from_args
+
+# Usage: python Beam_search.py                             (type the graph in)
+#        python Beam_search.py edges.txt --heuristics h.txt --start A --goal G --beam-width 2
+parser = graph_arg_parser("Beam search on an undirected graph.")
+parser.add_argument("--beam-width", type=int, help="max number of nodes kept at each level")
+args = parser.parse_args()
+
+if args.edges:
+    graph = graph_from_args(args)
+else:
+    builder = GraphBuilder()
+
+    # Input graph edges
+    n = int(input("Enter number of edges: "))
+    for i in range(n):
+        u, v = input("Enter edge (u v): ").split()
+        builder.add_edge(u, v)  # Stored in both directions (undirected graph)
+
+    # Input heuristic values for nodes
+    m = int(input("Enter number of heuristic values: "))
+    for i in range(m):
+        node, h = input("Enter node and heuristic: ").split()
+        builder.set_heuristic(node, int(h))
+    graph = builder.build()
+
+start = args.start or input("Enter start node: ")
+goal = args.goal or input("Enter goal node: ")
+beam_width = args.beam_width or int(input("Enter beam width: "))  # Max number of nodes to keep at each level
+if start not in graph.ids or goal not in graph.ids:
+    sys.exit("Start and goal must be nodes of the graph.")
+
+# Each level keeps only the beam_width neighbors with the lowest heuristic; see Graph_library.beam_search
+result = beam_search(graph, graph.id(start), graph.id(goal), beam_width)
+
+if not args.edges:  # typed-in graphs are small enough to show every visit
+    for node in result.order:
+        print("Visiting:", graph.name(node))
+if result.found:
+    print("Goal reached!")
+    print("Path:", " -> ".join(graph.path_names(result.path)))
+else:
+    print(f"Goal not reached with beam width {beam_width}")
+print("Nodes visited:", len(result.order))
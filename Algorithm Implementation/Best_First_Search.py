@@ -1,45 +1,43 @@
-graph = {}      
-heuristic = {}  
-
-# Input graph
-n = int(input("Enter number of edges: ")) 
-for i in range(n):
-    u, v = input("Enter edge (u v): ").split()  
-    if u not in graph:
-        graph[u] = []  
-    if v not in graph:
-        graph[v] = []  
-    graph[u].append(v) 
-    graph[v].append(u) 
-
-# Input heuristic values
-m = int(input("Enter number of heuristic values: ")) 
-for i in range(m):
-    node, h = input("Enter node and heuristic: ").split() 
-    heuristic[node] = int(h)  # Store heuristic value for the node
-
-start = input("Enter start node: ")  
-goal = input("Enter goal node: ")    
-
-open_list = [start]   # Initialize open list with start node (nodes to be explored)
-closed_list = []      # Initialize closed list (nodes already visited)
-
-while open_list:  
-    open_list.sort(key=lambda x: heuristic[x])  # Sort open list by heuristic value (lowest first)
-    """lambda x: heuristic[x] is an anonymous function that takes one input x and returns heuristic[x].
-
-In this context:
-
-x is a node from next_level.
-
-heuristic[x] is the heuristic value of that node."""
-    current = open_list.pop(0)  # Select node with lowest heuristic as current
-    print("Visiting:", current)  
-    if current == goal: 
-        print("Goal reached!")  
-        break  
-    closed_list.append(current)  # Mark current node as visited by adding it to closed list
-    for neighbor in graph[current]:  # Explore all neighbors of current node
-        if neighbor not in closed_list and neighbor not in open_list:  
-            # If neighbor has not been visited and is not already in open list
-            open_list.append(neighbor)  # Add neighbor to open list for future exploration
+import sys
+from Graph_library import GraphBuilder, best_first_search
+from Graph_loaders import graph_arg_parser, graph_from_args
+
+# Usage: python Best_First_Search.py                       (type the graph in)
+#        python Best_First_Search.py edges.txt --heuristics h.txt --start A --goal G
+args = graph_arg_parser("Greedy best-first search on an undirected graph.").parse_args()
+
+if args.edges:
+    graph = graph_from_args(args)
+else:
+    builder = GraphBuilder()
+
+    # Input graph
+    n = int(input("Enter number of edges: "))
+    for i in range(n):
+        u, v = input("Enter edge (u v): ").split()
+        builder.add_edge(u, v)  # Stored in both directions (undirected graph)
+
+    # Input heuristic values
+    m = int(input("Enter number of heuristic values: "))
+    for i in range(m):
+        node, h = input("Enter node and heuristic: ").split()
+        builder.set_heuristic(node, int(h))  # Store heuristic value for the node
+    graph = builder.build()
+
+start = args.start or input("Enter start node: ")
+goal = args.goal or input("Enter goal node: ")
+if start not in graph.ids or goal not in graph.ids:
+    sys.exit("Start and goal must be nodes of the graph.")
+
+# Always expand the open node with the lowest heuristic; see Graph_library.best_first_search
+result = best_first_search(graph, graph.id(start), graph.id(goal))
+
+if not args.edges:  # typed-in graphs are small enough to show every visit
+    for node in result.order:
+        print("Visiting:", graph.name(node))
+if result.found:
+    print("Goal reached!")
+    print("Path:", " -> ".join(graph.path_names(result.path)))
+else:
+    print(f"No path between {start} and {goal}")
+print("Nodes visited:", len(result.order))
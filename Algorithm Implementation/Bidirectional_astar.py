@@ -0,0 +1,302 @@
+"""Bidirectional A* / Dijkstra and ALT landmark heuristics for repeated point-to-point queries.
+
+ALT (A*, Landmarks, Triangle inequality) needs no hand-typed heuristic table. A one-time
+preprocessing step picks a few landmark nodes and stores shortest-path distances from and
+to each of them. For any query the triangle inequality then gives admissible, consistent
+lower bounds on dist(v, goal):
+
+    dist(v, t) >= dist(L, t) - dist(L, v)       and       dist(v, t) >= dist(v, L) - dist(t, L)
+
+Bidirectional search uses the average potential p(v) = (h_goal(v) - h_start(v)) / 2 in the
+forward search and -p(v) in the backward one, so both searches see the same non-negative
+reduced edge costs and can stop as soon as  top_forward + top_backward >= best path found.
+
+    landmarks = Landmarks.build(graph, count=16)
+    result = alt_query(graph, landmarks, graph.id("A"), graph.id("B"))
+
+    python Bidirectional_astar.py roads.txt --landmarks 16 --start A --goal B
+    python Bidirectional_astar.py roads.txt --landmarks 16 --benchmark 100
+"""
+import heapq
+import random
+import sys
+import time
+from array import array
+
+from Graph_library import INF, SearchResult, astar, dijkstra_tree, _ones, _zero
+from Graph_loaders import graph_arg_parser, graph_from_args
+
+
+# --- Bidirectional search ---
+
+def bidirectional_astar(graph, start, goal, to_goal=None, to_start=None):
+    """Bidirectional A* with consistent lower bounds to_goal(v) <= dist(v, goal) and
+    to_start(v) <= dist(start, v). Without bounds this is bidirectional Dijkstra."""
+    if start == goal:
+        return SearchResult([start], 0, [start], stats={"expanded": 1})
+    h_goal = to_goal or _zero
+    h_start = to_start or _zero
+
+    def potential(v):
+        return (h_goal(v) - h_start(v)) / 2
+
+    backward = graph.reverse()
+    heappush, heappop = heapq.heappush, heapq.heappop
+    # Per direction: graph, g-scores, parents, settled set, heap of (key, node, g), potential sign
+    sides = [
+        [graph, {start: 0}, {start: -1}, set(), [(potential(start), start, 0)], 1],
+        [backward, {goal: 0}, {goal: -1}, set(), [(-potential(goal), goal, 0)], -1],
+    ]
+    best, meet = INF, -1
+    expanded = 0
+    order = []
+
+    while True:
+        # Drop outdated heap entries so both tops are real keys
+        for side in sides:
+            heap, g_score, settled = side[4], side[1], side[3]
+            while heap and (heap[0][2] > g_score[heap[0][1]] or heap[0][1] in settled):
+                heappop(heap)
+        if not sides[0][4] or not sides[1][4]:
+            break
+        if sides[0][4][0][0] + sides[1][4][0][0] >= best:
+            break  # no unexplored path can beat the best meeting point
+
+        side = sides[0] if sides[0][4][0][0] <= sides[1][4][0][0] else sides[1]
+        other = sides[1] if side is sides[0] else sides[0]
+        g, g_score, parent, settled, heap, sign = side
+        other_g = other[1]
+        _, u, g_u = heappop(heap)
+        settled.add(u)
+        expanded += 1
+        order.append(u)
+
+        offsets, targets, weights = g.offsets, g.targets, g.weights
+        start_edge, end_edge = offsets[u], offsets[u + 1]
+        ws = weights[start_edge:end_edge] if weights is not None else _ones(end_edge - start_edge)
+        for v, w in zip(targets[start_edge:end_edge], ws):
+            new_g = g_u + w
+            if new_g < g_score.get(v, INF):
+                g_score[v] = new_g
+                parent[v] = u
+                heappush(heap, (new_g + sign * potential(v), v, new_g))
+            if v in other_g and new_g + other_g[v] < best:
+                best, meet = new_g + other_g[v], v
+
+    stats = {"expanded": expanded, "expanded_forward": len(sides[0][3]), "expanded_backward": len(sides[1][3])}
+    if meet == -1:
+        return SearchResult(order=order, stats=stats)
+    parent_f, parent_b = sides[0][2], sides[1][2]
+    path = []
+    node = meet
+    while node != -1:
+        path.append(node)
+        node = parent_f[node]
+    path.reverse()
+    node = parent_b[meet]
+    while node != -1:
+        path.append(node)
+        node = parent_b[node]
+    return SearchResult(path, best, order, stats=stats)
+
+
+# --- ALT preprocessing ---
+
+class Landmarks:
+    """Landmark distance tables: dist_from[i][v] = dist(L_i, v), dist_to[i][v] = dist(v, L_i)."""
+
+    def __init__(self, nodes, dist_from, dist_to):
+        self.nodes = nodes
+        self.dist_from = dist_from
+        self.dist_to = dist_to  # the same arrays as dist_from on undirected graphs
+
+    @classmethod
+    def build(cls, graph, count=16, seed=0):
+        """Farthest-point landmark selection: each new landmark is the node farthest from the
+        ones chosen so far, which spreads them over the border of the graph."""
+        n = graph.n_nodes
+        count = min(count, n)
+        if count <= 0:  # an empty graph, or no landmarks asked for
+            return cls([], [], [])
+        rng = random.Random(seed)
+        backward = graph.reverse()
+        nodes, dist_from, dist_to = [], [], []
+        closest = [INF] * n  # distance from the nearest chosen landmark
+        # Start from the node farthest from a random one, not from the random node itself
+        first, _ = dijkstra_tree(graph, rng.randrange(n))
+        candidate = max(range(n), key=lambda v: first[v] if first[v] < INF else -1)
+        while len(nodes) < count:
+            forward, _ = dijkstra_tree(graph, candidate)
+            reverse = forward if backward is graph else dijkstra_tree(backward, candidate)[0]
+            nodes.append(candidate)
+            dist_from.append(forward)
+            dist_to.append(reverse)
+            for v in range(n):
+                if forward[v] < closest[v]:
+                    closest[v] = forward[v]
+            # Unreached nodes (other components) come first, then the farthest reached one
+            chosen = set(nodes)
+            candidate = max((v for v in range(n) if v not in chosen),
+                            key=lambda v: closest[v] if closest[v] < INF else INF, default=None)
+            if candidate is None:
+                break
+        return cls(nodes, dist_from, dist_to)
+
+    def active(self, start, goal, k=4):
+        """Indices of the k landmarks that give the tightest bound for start -> goal."""
+        scored = []
+        for i in range(len(self.nodes)):
+            scored.append((self._bound(i, start, goal), i))
+        scored.sort(reverse=True)
+        return [i for _, i in scored[:k]]
+
+    def _bound(self, i, v, t):
+        lt, lv = self.dist_from[i][t], self.dist_from[i][v]
+        vl, tl = self.dist_to[i][v], self.dist_to[i][t]
+        bound = 0
+        if lt < INF and lv < INF:
+            bound = lt - lv
+        if vl < INF and tl < INF and vl - tl > bound:
+            bound = vl - tl
+        return bound
+
+    def heuristic_to(self, goal, use=None):
+        """Lower bound on dist(v, goal) from the landmarks in `use` (default: all)."""
+        use = list(range(len(self.nodes))) if use is None else use
+        tables = [(self.dist_from[i], self.dist_from[i][goal], self.dist_to[i], self.dist_to[i][goal]) for i in use]
+
+        def h(v):
+            best = 0
+            for from_l, lt, to_l, tl in tables:
+                lv, vl = from_l[v], to_l[v]
+                if lt < INF and lv < INF and lt - lv > best:
+                    best = lt - lv
+                if vl < INF and tl < INF and vl - tl > best:
+                    best = vl - tl
+            return best
+        return h
+
+    def heuristic_from(self, start, use=None):
+        """Lower bound on dist(start, v): dist(L, v) - dist(L, s) and dist(s, L) - dist(v, L)."""
+        use = list(range(len(self.nodes))) if use is None else use
+        tables = [(self.dist_from[i], self.dist_from[i][start], self.dist_to[i], self.dist_to[i][start]) for i in use]
+
+        def h(v):
+            best = 0
+            for from_l, ls, to_l, sl in tables:
+                lv, vl = from_l[v], to_l[v]
+                if lv < INF and ls < INF and lv - ls > best:
+                    best = lv - ls
+                if sl < INF and vl < INF and sl - vl > best:
+                    best = sl - vl
+            return best
+        return h
+
+    def save(self, path):
+        """Stores the tables as a flat binary file (node count, landmark ids, distance arrays)."""
+        with open(path, "wb") as f:
+            header = array("q", [len(self.nodes), len(self.dist_from[0]) if self.nodes else 0,
+                                 int(self.dist_to is self.dist_from)])
+            header.tofile(f)
+            array("q", self.nodes).tofile(f)
+            for table in self.dist_from:
+                array("d", table).tofile(f)
+            if self.dist_to is not self.dist_from:
+                for table in self.dist_to:
+                    array("d", table).tofile(f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            header = array("q")
+            header.fromfile(f, 3)
+            k, n, symmetric = header
+            nodes = array("q")
+            nodes.fromfile(f, k)
+
+            def read_tables():
+                tables = []
+                for _ in range(k):
+                    table = array("d")
+                    table.fromfile(f, n)
+                    tables.append(table)
+                return tables
+            dist_from = read_tables()
+            dist_to = dist_from if symmetric else read_tables()
+        return cls(list(nodes), dist_from, dist_to)
+
+
+def alt_query(graph, landmarks, start, goal, bidirectional=True, active=4):
+    """Shortest path start -> goal using the landmark heuristics (ALT)."""
+    use = landmarks.active(start, goal, active)
+    to_goal = landmarks.heuristic_to(goal, use)
+    if not bidirectional:
+        return astar(graph, start, goal, heuristic=to_goal)
+    return bidirectional_astar(graph, start, goal, to_goal, landmarks.heuristic_from(start, use))
+
+
+# --- Command line ---
+
+def benchmark(graph, landmarks, queries, rng):
+    pairs = [(rng.randrange(graph.n_nodes), rng.randrange(graph.n_nodes)) for _ in range(queries)]
+    methods = {
+        "Dijkstra": lambda s, t: astar(graph, s, t, heuristic=_zero),
+        "bidirectional Dijkstra": lambda s, t: bidirectional_astar(graph, s, t),
+        "ALT A*": lambda s, t: alt_query(graph, landmarks, s, t, bidirectional=False),
+        "bidirectional ALT": lambda s, t: alt_query(graph, landmarks, s, t),
+    }
+    reference = None
+    for name, run in methods.items():
+        expanded = 0
+        costs = []
+        t0 = time.perf_counter()
+        for s, t in pairs:
+            result = run(s, t)
+            expanded += len(result.order)
+            costs.append(result.cost)
+        elapsed = time.perf_counter() - t0
+        if reference is None:
+            reference = costs
+        agree = all(abs(a - b) < 1e-9 or a == b for a, b in zip(costs, reference))
+        print(f"{name:24s} {elapsed / queries * 1000:9.2f} ms/query  {expanded / queries:10.0f} nodes/query"
+              f"  {'ok' if agree else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    parser = graph_arg_parser("Point-to-point shortest paths with bidirectional A* and ALT landmarks.")
+    parser.add_argument("--landmarks", type=int, default=16, help="number of landmarks (0 = plain bidirectional Dijkstra)")
+    parser.add_argument("--landmark-file", help="load/save the landmark tables here")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="time N random queries with each method")
+    args = parser.parse_args()
+    if not args.edges:
+        sys.exit("usage: python Bidirectional_astar.py EDGES [--landmarks K] (--start A --goal B | --benchmark N)")
+    graph = graph_from_args(args)
+
+    landmarks = None
+    if args.landmarks:
+        t0 = time.perf_counter()
+        try:
+            landmarks = Landmarks.load(args.landmark_file) if args.landmark_file else None
+        except OSError:
+            landmarks = None
+        if landmarks is None or len(landmarks.dist_from[0]) != graph.n_nodes:
+            landmarks = Landmarks.build(graph, args.landmarks)
+            if args.landmark_file:
+                landmarks.save(args.landmark_file)
+        print(f"{len(landmarks.nodes)} landmarks ready in {time.perf_counter() - t0:.2f}s")
+
+    if args.benchmark:
+        if landmarks is None:
+            sys.exit("--benchmark needs landmarks")
+        benchmark(graph, landmarks, args.benchmark, random.Random(1))
+    else:
+        start = args.start or input("Start node: ")
+        goal = args.goal or input("Goal node: ")
+        s, t = graph.id(start), graph.id(goal)
+        result = alt_query(graph, landmarks, s, t) if landmarks else bidirectional_astar(graph, s, t)
+        if result.found:
+            print("Path:", " -> ".join(graph.path_names(result.path)))
+            print(f"Cost: {result.cost:g}")
+        else:
+            print(f"No path between {start} and {goal}")
+        print("Nodes expanded:", result.stats["expanded"])
@@ -1,70 +1,34 @@
-from collections import deque
+import sys
+from Graph_library import GraphBuilder, bidirectional_search
+from Graph_loaders import graph_arg_parser, graph_from_args
 
-# User input for graph
-graph = {}
-nodes = input("Enter all nodes (space separated): ").split()
-for node in nodes:
-    neighbors = input(f"Neighbors of {node} (space separated): ").split()
-    graph[node] = neighbors
+# Usage: python Bidirectional_search.py                    (type the graph in)
+#        python Bidirectional_search.py edges.txt --start A --goal G
+args = graph_arg_parser("Bidirectional breadth-first search on a directed graph.", directed=True).parse_args()
 
-start = input("Start node: ")
-goal = input("Goal node: ")
-
-# Special case: start and goal are same
-if start == goal:
-    print(f"Path: {start}")
-    exit()
-
-# Track parents and visited nodes
-start_parent = {start: None}
-goal_parent = {goal: None}
-start_queue = deque([start])
-goal_queue = deque([goal])
-
-# Track meeting point
-meeting_node = None
-
-while start_queue and goal_queue:
-    # Expand from start side
-    current = start_queue.popleft()
-    for neighbor in graph.get(current, []):
-        if neighbor not in start_parent:
-            start_parent[neighbor] = current
-            start_queue.append(neighbor)
-            if neighbor in goal_parent:
-                meeting_node = neighbor
-                break
-    if meeting_node:
-        break
-
-    # Expand from goal side
-    current = goal_queue.popleft()
-    for neighbor in graph.get(current, []):
-        if neighbor not in goal_parent:
-            goal_parent[neighbor] = current
-            goal_queue.append(neighbor)
-            if neighbor in start_parent:
-                meeting_node = neighbor
-                break
-    if meeting_node:
-        break
-
-# Reconstruct path if meeting point found
-if meeting_node:
-    # Build path from start to meeting point
-    path = []
-    node = meeting_node
-    while node:
-        path.append(node)
-        node = start_parent.get(node)
-    path.reverse()
-    
-    # Build path from meeting point to goal
-    node = goal_parent.get(meeting_node)
-    while node:
-        path.append(node)
-        node = goal_parent.get(node)
-    
-    print("Path:", " -> ".join(path))
+if args.edges:
+    graph = graph_from_args(args)
+else:
+    # User input for graph
+    builder = GraphBuilder(directed=True)
+    nodes = input("Enter all nodes (space separated): ").split()
+    for node in nodes:
+        builder.add_node(node)
+        neighbors = input(f"Neighbors of {node} (space separated): ").split()
+        for neighbor in neighbors:
+            builder.add_edge(node, neighbor)
+    graph = builder.build()
+
+start = args.start or input("Start node: ")
+goal = args.goal or input("Goal node: ")
+if start not in graph.ids or goal not in graph.ids:
+    sys.exit("Start and goal must be nodes of the graph.")
+
+# Expand alternately from the start and (along reversed edges) from the goal until the
+# two searches meet; see Graph_library.bidirectional_search
+result = bidirectional_search(graph, graph.id(start), graph.id(goal))
+
+if result.found:
+    print("Path:", " -> ".join(graph.path_names(result.path)))
 else:
     print(f"No path between {start} and {goal}")
@@ -1,29 +1,40 @@
-from collections import deque
+import sys
+from Graph_library import GraphBuilder, bfs_tree
+from Graph_loaders import graph_arg_parser, graph_from_args
 
-# Get graph from user
-graph = {}
-nodes = input("Enter all nodes (separated by spaces): ").split()
-for node in nodes:
-    neighbors = input(f"Enter neighbors of {node} (separated by spaces, or press Enter if none): ").split()
-    graph[node] = neighbors
+# Usage: python Breadth_first_search.py                    (type the graph in)
+#        python Breadth_first_search.py edges.txt --start A [--goal G]
+args = graph_arg_parser("Breadth-first traversal of a directed graph.", directed=True).parse_args()
 
-start_node = input("Enter starting node: ")
+if args.edges:
+    graph = graph_from_args(args)
+else:
+    # Get graph from user
+    builder = GraphBuilder(directed=True)
+    nodes = input("Enter all nodes (separated by spaces): ").split()
+    for node in nodes:
+        builder.add_node(node)
+        neighbors = input(f"Enter neighbors of {node} (separated by spaces, or press Enter if none): ").split()
+        for neighbor in neighbors:
+            builder.add_edge(node, neighbor)
+    graph = builder.build()
 
-# BFS Algorithm
-def bfs(graph, start):
-    visited = []
-    queue = deque([start])
-    
-    while queue:
-        current_node = queue.popleft()
-        if current_node not in visited:
-            visited.append(current_node)
-            # Add unvisited neighbors to the queue
-            for neighbor in graph.get(current_node, []):
-                if neighbor not in visited:
-                    queue.append(neighbor)
-    return visited
+start_node = args.start or input("Enter starting node: ")
+if start_node not in graph.ids or (args.goal and args.goal not in graph.ids):
+    sys.exit("Start and goal must be nodes of the graph.")
 
-# Run BFS and show result
-result = bfs(graph, start_node)
-print("BFS traversal order:", " -> ".join(result))
+# Run BFS (Graph_library.bfs_tree) and show result. Typed-in graphs use the plain
+# top-down order; large files switch to bottom-up levels where that checks fewer edges.
+result = bfs_tree(graph, graph.id(start_node), direction_optimizing=bool(args.edges))
+if not args.edges:
+    print("BFS traversal order:", " -> ".join(graph.path_names(result.order)))
+else:
+    print(f"Reached {len(result.order)} of {graph.n_nodes} nodes in {result.stats['levels'] - 1} levels")
+    print("Top-down levels: {top_down_levels}, bottom-up levels: {bottom_up_levels}, "
+          "edges checked: {edges_checked}".format(**result.stats))
+if args.goal:
+    path = result.path_to(graph.id(args.goal))
+    if path:
+        print(f"Path to {args.goal} ({len(path) - 1} hops):", " -> ".join(graph.path_names(path)))
+    else:
+        print(f"{args.goal} is not reachable from {start_node}")
@@ -0,0 +1,426 @@
+"""Contraction hierarchies (CH): preprocess a weighted graph once, then answer shortest-path
+queries by searching only "upward" edges from both ends.
+
+Preprocessing contracts the nodes one at a time, least important first. Contracting v
+removes it from the remaining graph; for every pair u -> v -> x that is the only shortest
+path between u and x (a bounded local Dijkstra, the witness search, finds no other path
+as short), a shortcut u -> x of the same length is inserted, remembering v as its middle
+node. Importance is the edge difference (shortcuts added minus edges removed) plus the
+number of already contracted neighbors and the node's level in the hierarchy; priorities
+are updated lazily, when a node reaches the top of the queue.
+
+Every edge, original or shortcut, then points from a lower to a higher contracted node in
+one direction. A query runs Dijkstra upward from the start over the forward edges and
+upward from the goal over the reversed edges, and the two searches meet at the highest
+node of the shortest path. They usually settle a few hundred nodes even on road graphs
+with millions. Shortcuts in the result are unpacked recursively through their middle
+nodes into original edges.
+
+    hierarchy = ContractionHierarchy.build(graph)
+    hierarchy.save("roads.ch")                       # later: ContractionHierarchy.load("roads.ch")
+    result = hierarchy.query(graph.id("A"), graph.id("B"))
+
+    python Contraction_hierarchy.py roads.txt --ch roads.ch --start A --goal B
+    python Contraction_hierarchy.py roads.txt --ch roads.ch --benchmark 100    # against A*
+    python Contraction_hierarchy.py --grid 100 --benchmark 100                 # 100 x 100 grid graph
+"""
+import heapq
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+from array import array
+
+from Graph_library import INF, Graph, SearchResult, astar, graph_from_arrays
+from Bidirectional_astar import bidirectional_astar
+from Graph_loaders import _pad8, graph_arg_parser, graph_from_args
+
+MAGIC = b"CHGRAPH1"
+VERSION = 1
+# magic, version, flags, n nodes, forward edges, backward edges, names bytes
+HEADER = struct.Struct("<8sIIqqqq")
+FLAG_DIRECTED, FLAG_BIG_ENDIAN = 1, 2
+
+WITNESS_SETTLED = 500  # nodes a witness search may settle before giving up (and adding the shortcut)
+
+
+# --- Preprocessing ---
+
+class _Contractor:
+    """The remaining graph during preprocessing: out[u][x] = in[x][u] = (weight, middle or -1)."""
+
+    def __init__(self, graph, max_settled):
+        n = graph.n_nodes
+        self.max_settled = max_settled
+        self.out = [{} for _ in range(n)]
+        self.inn = [{} for _ in range(n)]
+        offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+        for u in range(n):
+            out_u = self.out[u]
+            for i in range(offsets[u], offsets[u + 1]):
+                x = targets[i]
+                w = float(weights[i]) if weights is not None else 1.0
+                if x != u and w < out_u.get(x, (INF,))[0]:  # self-loops never shorten a path
+                    out_u[x] = (w, -1)
+                    self.inn[x][u] = (w, -1)
+        self.contracted_neighbors = [0] * n
+        self.level = [0] * n
+        self.witness_searches = 0
+
+    def _witness(self, source, skip, limit):
+        """Distances from source avoiding node skip, searched up to limit (upper bounds beyond settled nodes)."""
+        self.witness_searches += 1
+        out = self.out
+        heappush, heappop = heapq.heappush, heapq.heappop
+        dist = {source: 0.0}
+        heap = [(0.0, source)]
+        settled = 0
+        while heap:
+            d, u = heappop(heap)
+            if d > dist[u]:
+                continue
+            if d > limit or settled == self.max_settled:
+                break
+            settled += 1
+            for x, (w, _) in out[u].items():
+                if x == skip:
+                    continue
+                new_d = d + w
+                if new_d < dist.get(x, INF):
+                    dist[x] = new_d
+                    heappush(heap, (new_d, x))
+        return dist
+
+    def shortcuts(self, v):
+        """(u, x, weight) for every pair whose only shortest path in the remaining graph runs through v."""
+        outs = self.out[v]
+        found = []
+        if not outs:
+            return found
+        max_out = max(w for w, _ in outs.values())
+        for u, (w_uv, _) in self.inn[v].items():
+            dist = self._witness(u, v, w_uv + max_out)
+            for x, (w_vx, _) in outs.items():
+                if x != u and dist.get(x, INF) > w_uv + w_vx:
+                    found.append((u, x, w_uv + w_vx))
+        return found
+
+    def priority(self, v, shortcuts):
+        edge_difference = len(shortcuts) - len(self.out[v]) - len(self.inn[v])
+        return edge_difference + self.contracted_neighbors[v] + self.level[v]
+
+    def contract(self, v, shortcuts):
+        """Removes v; returns its (forward, backward) upward edges as (neighbor, weight, middle) lists."""
+        out, inn = self.out, self.inn
+        forward = [(x, w, middle) for x, (w, middle) in out[v].items()]
+        backward = [(u, w, middle) for u, (w, middle) in inn[v].items()]
+        for x, _, _ in forward:
+            del inn[x][v]
+        for u, _, _ in backward:
+            del out[u][v]
+        for u, x, w in shortcuts:
+            if w < out[u].get(x, (INF,))[0]:
+                out[u][x] = (w, v)
+                inn[x][u] = (w, v)
+        for neighbor in {x for x, _, _ in forward} | {u for u, _, _ in backward}:
+            self.contracted_neighbors[neighbor] += 1
+            if self.level[neighbor] <= self.level[v]:
+                self.level[neighbor] = self.level[v] + 1
+        out[v], inn[v] = {}, {}
+        return forward, backward
+
+
+def _upward_graph(names, rows):
+    """CSR Graph of per-node (neighbor, weight, middle) rows, plus the middle array in the same order."""
+    offsets, targets, weights, middles = array("q", [0]), array("i"), array("d"), array("i")
+    for row in rows:
+        for x, w, middle in sorted(row):
+            targets.append(x)
+            weights.append(w)
+            middles.append(middle)
+        offsets.append(len(targets))
+    return Graph(names, offsets, targets, weights, directed=True), middles
+
+
+class ContractionHierarchy:
+    """Upward search graphs of a contraction hierarchy.
+
+    forward holds the edges u -> x with rank[x] > rank[u] at u; backward holds the edges
+    u -> v with rank[u] > rank[v] at v, reversed (target u). forward_middle / backward_middle
+    give each edge's middle node, or -1 for an edge of the original graph.
+    """
+
+    def __init__(self, rank, forward, forward_middle, backward, backward_middle, directed=False, stats=None):
+        self.rank = rank
+        self.forward = forward
+        self.forward_middle = forward_middle
+        self.backward = backward
+        self.backward_middle = backward_middle
+        self.directed = directed
+        self.stats = stats if stats is not None else {}
+
+    @property
+    def n_nodes(self):
+        return self.forward.n_nodes
+
+    @property
+    def names(self):
+        return self.forward.names
+
+    @classmethod
+    def build(cls, graph, max_settled=WITNESS_SETTLED, log=None):
+        """Contracts every node of graph, least important first."""
+        t0 = time.perf_counter()
+        n = graph.n_nodes
+        contractor = _Contractor(graph, max_settled)
+        heap = [(contractor.priority(v, contractor.shortcuts(v)), v) for v in range(n)]
+        heapq.heapify(heap)
+        rank = array("i", bytes(4 * n))
+        forward_rows, backward_rows = [None] * n, [None] * n
+        shortcuts_added = 0
+        next_rank = 0
+        while heap:
+            _, v = heapq.heappop(heap)
+            shortcuts = contractor.shortcuts(v)
+            priority = contractor.priority(v, shortcuts)
+            if heap and priority > heap[0][0]:
+                heapq.heappush(heap, (priority, v))  # became more important since it was queued
+                continue
+            forward_rows[v], backward_rows[v] = contractor.contract(v, shortcuts)
+            rank[v] = next_rank
+            next_rank += 1
+            shortcuts_added += len(shortcuts)
+            if log and next_rank % 10000 == 0:
+                log(f"{next_rank}/{n} nodes contracted, {shortcuts_added} shortcuts")
+        forward, forward_middle = _upward_graph(graph.names, forward_rows)
+        backward, backward_middle = _upward_graph(graph.names, backward_rows)
+        stats = {"seconds": round(time.perf_counter() - t0, 3), "shortcuts": shortcuts_added,
+                 "witness_searches": contractor.witness_searches,
+                 "levels": max(contractor.level, default=-1) + 1}
+        return cls(rank, forward, forward_middle, backward, backward_middle, graph.directed, stats)
+
+    # --- Queries ---
+
+    def query(self, start, goal):
+        """Shortest path start -> goal: bidirectional upward Dijkstra, then shortcut unpacking."""
+        if start == goal:
+            return SearchResult([start], 0, [start], stats={"expanded": 1})
+        heappush, heappop = heapq.heappush, heapq.heappop
+        # Per direction: graph, middles, distances, parent (node, middle of the edge), heap, settled
+        sides = [
+            [self.forward, self.forward_middle, {start: 0.0}, {start: (-1, -1)}, [(0.0, start)], 0],
+            [self.backward, self.backward_middle, {goal: 0.0}, {goal: (-1, -1)}, [(0.0, goal)], 0],
+        ]
+        best, meet = INF, -1
+        order = []
+        while True:
+            active = [side for side in sides if side[4] and side[4][0][0] < best]
+            if not active:
+                break
+            side = min(active, key=lambda s: s[4][0][0])
+            other_dist = sides[1][2] if side is sides[0] else sides[0][2]
+            g, middles, dist, parent, heap, _ = side
+            d, u = heappop(heap)
+            if d > dist[u]:
+                continue
+            side[5] += 1
+            order.append(u)
+            if u in other_dist and d + other_dist[u] < best:
+                best, meet = d + other_dist[u], u
+            offsets, targets, weights = g.offsets, g.targets, g.weights
+            for i in range(offsets[u], offsets[u + 1]):
+                v = targets[i]
+                new_d = d + weights[i]
+                if new_d < dist.get(v, INF):
+                    dist[v] = new_d
+                    parent[v] = (u, middles[i])
+                    heappush(heap, (new_d, v))
+        stats = {"expanded": len(order), "expanded_forward": sides[0][5], "expanded_backward": sides[1][5]}
+        if meet == -1:
+            return SearchResult(order=order, stats=stats)
+        return SearchResult(self._path(sides[0][3], sides[1][3], meet), best, order, stats=stats)
+
+    def _path(self, parent_f, parent_b, meet):
+        """Original-graph path through meet from the two search trees."""
+        edges = []  # (u, x, middle) hierarchy edges in path order
+        node = meet
+        while parent_f[node][0] != -1:
+            u, middle = parent_f[node]
+            edges.append((u, node, middle))
+            node = u
+        edges.reverse()
+        node = meet
+        while parent_b[node][0] != -1:
+            x, middle = parent_b[node]
+            edges.append((node, x, middle))
+            node = x
+        path = [edges[0][0]] if edges else [meet]
+        for u, x, middle in edges:
+            self._unpack(u, x, middle, path)
+        return path
+
+    def _unpack(self, u, x, middle, path):
+        """Appends the original nodes after u on the hierarchy edge u -> x."""
+        stack = [(u, x, middle)]
+        while stack:
+            a, b, m = stack.pop()
+            if m == -1:
+                path.append(b)
+                continue
+            # m was contracted before a and b, so a -> m is in m's backward row and m -> b in its forward row
+            stack.append((m, b, self._middle(self.forward, self.forward_middle, m, b)))
+            stack.append((a, m, self._middle(self.backward, self.backward_middle, m, a)))
+
+    @staticmethod
+    def _middle(g, middles, u, target):
+        for i in range(g.offsets[u], g.offsets[u + 1]):
+            if g.targets[i] == target:
+                return middles[i]
+        raise KeyError(f"no hierarchy edge between {u} and {target}")
+
+    # --- Binary format (memory-mapped) ---
+
+    def save(self, path):
+        """Writes the hierarchy as one binary file that load() memory-maps."""
+        flags = (FLAG_DIRECTED if self.directed else 0) | (FLAG_BIG_ENDIAN if sys.byteorder == "big" else 0)
+        names = "\n".join(self.names).encode("utf-8")
+
+        def padded(buf):
+            data = buf.tobytes()
+            return data + b"\0" * _pad8(len(data))
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, VERSION, flags, self.n_nodes, self.forward.n_edges,
+                                self.backward.n_edges, len(names)))
+            f.write(b"\0" * _pad8(HEADER.size))
+            f.write(padded(array("i", self.rank)))
+            for g, middles in ((self.forward, self.forward_middle), (self.backward, self.backward_middle)):
+                f.write(array("q", g.offsets).tobytes())
+                f.write(padded(array("i", g.targets)))
+                f.write(array("d", g.weights).tobytes())
+                f.write(padded(array("i", middles)))
+            f.write(names)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-maps a file written by save(). The buffers are views into the map."""
+        with open(path, "rb") as f:
+            view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        magic, version, flags, n, m_forward, m_backward, names_len = HEADER.unpack(view[:HEADER.size])
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} contraction hierarchy file")
+        if bool(flags & FLAG_BIG_ENDIAN) != (sys.byteorder == "big"):
+            raise ValueError(f"{path} was written on a machine with a different byte order")
+        pos = HEADER.size + _pad8(HEADER.size)
+
+        def take(typecode, count, itemsize):
+            nonlocal pos
+            buf = view[pos:pos + count * itemsize].cast(typecode)
+            pos += count * itemsize + _pad8(count * itemsize)
+            return buf
+
+        rank = take("i", n, 4)
+        sections = []
+        for m in (m_forward, m_backward):
+            offsets, targets, weights, middles = take("q", n + 1, 8), take("i", m, 4), take("d", m, 8), take("i", m, 4)
+            sections.append((offsets, targets, weights, middles))
+        names = bytes(view[pos:pos + names_len]).decode("utf-8").split("\n") if n else []
+        (fo, ft, fw, fm), (bo, bt, bw, bm) = sections
+        return cls(rank, Graph(names, fo, ft, fw, directed=True), fm,
+                   Graph(names, bo, bt, bw, directed=True), bm, bool(flags & FLAG_DIRECTED))
+
+    def __repr__(self):
+        return f"<ContractionHierarchy {self.n_nodes} nodes, {self.forward.n_edges + self.backward.n_edges} upward edges>"
+
+
+# --- Command line ---
+
+def grid_graph(side, seed=0):
+    """Road-like test graph: a side x side grid with random weights in [1, 10)."""
+    rng = random.Random(seed)
+    src, dst = array("i"), array("i")
+    for r in range(side):
+        for c in range(side):
+            node = r * side + c
+            if c + 1 < side:
+                src.append(node)
+                dst.append(node + 1)
+            if r + 1 < side:
+                src.append(node)
+                dst.append(node + side)
+    weights = array("d", (rng.uniform(1, 10) for _ in range(len(src))))
+    names = [f"{r},{c}" for r in range(side) for c in range(side)]
+    return graph_from_arrays(side * side, src, dst, weights, names)
+
+
+def benchmark(graph, hierarchy, queries, rng):
+    pairs = [(rng.randrange(graph.n_nodes), rng.randrange(graph.n_nodes)) for _ in range(queries)]
+    methods = {
+        "A*": lambda s, t: astar(graph, s, t),  # Dijkstra when the graph has no heuristic
+        "bidirectional Dijkstra": lambda s, t: bidirectional_astar(graph, s, t),
+        "contraction hierarchy": hierarchy.query,
+    }
+    reference = None
+    for name, run in methods.items():
+        expanded = 0
+        costs = []
+        t0 = time.perf_counter()
+        for s, t in pairs:
+            result = run(s, t)
+            expanded += len(result.order)
+            costs.append(result.cost)
+        elapsed = time.perf_counter() - t0
+        if reference is None:
+            reference = costs
+        agree = all(abs(a - b) < 1e-6 or a == b for a, b in zip(costs, reference))
+        print(f"{name:24s} {elapsed / queries * 1000:9.3f} ms/query  {expanded / queries:10.0f} nodes/query"
+              f"  {'ok' if agree else 'MISMATCH'}")
+
+
+if __name__ == "__main__":
+    parser = graph_arg_parser("Shortest paths with a contraction hierarchy.")
+    parser.add_argument("--grid", type=int, metavar="SIDE", help="use a SIDE x SIDE random grid instead of an edge file")
+    parser.add_argument("--ch", help="load the hierarchy from this file, or build it and save it here")
+    parser.add_argument("--witness-settled", type=int, default=WITNESS_SETTLED,
+                        help="nodes a witness search may settle during preprocessing")
+    parser.add_argument("--benchmark", type=int, metavar="N", help="time N random queries against A*")
+    args = parser.parse_args()
+    if args.grid:
+        graph = grid_graph(args.grid)
+    elif args.edges:
+        graph = graph_from_args(args)
+    else:
+        sys.exit("usage: python Contraction_hierarchy.py (EDGES | --grid SIDE) [--ch FILE] "
+                 "(--start A --goal B | --benchmark N)")
+
+    hierarchy = None
+    if args.ch and os.path.exists(args.ch):
+        try:
+            hierarchy = ContractionHierarchy.load(args.ch)
+        except (ValueError, struct.error, OSError):
+            hierarchy = None
+        if hierarchy is not None and hierarchy.names != graph.names:
+            hierarchy = None  # built for another graph
+    if hierarchy is None:
+        hierarchy = ContractionHierarchy.build(graph, args.witness_settled, log=print)
+        print(f"{hierarchy} built: {hierarchy.stats}")
+        if args.ch:
+            hierarchy.save(args.ch)
+            print(f"saved to {args.ch} ({os.path.getsize(args.ch)} bytes)")
+
+    if args.benchmark:
+        benchmark(graph, hierarchy, args.benchmark, random.Random(1))
+    else:
+        start = args.start or input("Start node: ")
+        goal = args.goal or input("Goal node: ")
+        result = hierarchy.query(graph.id(start), graph.id(goal))
+        if result.found:
+            print("Path:", " -> ".join(graph.path_names(result.path)))
+            print(f"Cost: {result.cost:g}")
+        else:
+            print(f"No path between {start} and {goal}")
+        print("Nodes expanded:", result.stats["expanded"])
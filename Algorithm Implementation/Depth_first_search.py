@@ -1,27 +1,28 @@
-# Get graph from user
-graph = {}
-nodes = input("Enter all nodes (separated by spaces): ").split()
-for node in nodes:
-    neighbors = input(f"Enter neighbors of {node} (separated by spaces, or press Enter if none): ").split()
-    graph[node] = neighbors
+import sys
+from Graph_library import GraphBuilder, dfs
+from Graph_loaders import graph_arg_parser, graph_from_args
 
-start_node = input("Enter starting node: ")
+# Usage: python Depth_first_search.py                      (type the graph in)
+#        python Depth_first_search.py edges.txt --start A
+args = graph_arg_parser("Depth-first traversal of a directed graph.", directed=True).parse_args()
 
-# DFS Algorithm (iterative version)
-def dfs(graph, start):
-    visited = []
-    stack = [start]  # Use a stack instead of a queue
-    
-    while stack:
-        current_node = stack.pop()  # Take last node added
-        if current_node not in visited:
-            visited.append(current_node)
-            # Add unvisited neighbors to the stack in reverse order
-            for neighbor in reversed(graph.get(current_node, [])):
-                if neighbor not in visited:
-                    stack.append(neighbor)
-    return visited
+if args.edges:
+    graph = graph_from_args(args)
+else:
+    # Get graph from user
+    builder = GraphBuilder(directed=True)
+    nodes = input("Enter all nodes (separated by spaces): ").split()
+    for node in nodes:
+        builder.add_node(node)
+        neighbors = input(f"Enter neighbors of {node} (separated by spaces, or press Enter if none): ").split()
+        for neighbor in neighbors:
+            builder.add_edge(node, neighbor)
+    graph = builder.build()
 
-# Run DFS and show result
-result = dfs_rec(graph, start_node)
-print("DFS traversal order:", " -> ".join(result))
+start_node = args.start or input("Enter starting node: ")
+if start_node not in graph.ids:
+    sys.exit("The starting node must be a node of the graph.")
+
+# Run DFS (Graph_library.dfs, iterative with an explicit stack) and show result
+result = dfs(graph, graph.id(start_node))
+print("DFS traversal order:", " -> ".join(graph.path_names(result)))
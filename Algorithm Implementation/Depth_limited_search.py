@@ -1,39 +1,37 @@
-# Build the cave map
-graph = {}
-nodes = input("Enter rooms (A B C...): ").split()
-for node in nodes:
-    neighbors = input(f"Where can you go from {node}? (Ex: B C): ").split()
-    graph[node] = neighbors
+import sys
+from Graph_library import GraphBuilder, dls
+from Graph_loaders import graph_arg_parser, graph_from_args
 
-start = input("Start room: ")
-goal = input("Treasure room: ")
-max_depth = int(input("Flashlight range (max depth): "))
+# Usage: python Depth_limited_search.py                    (type the cave map in)
+#        python Depth_limited_search.py tunnels.txt --start A --goal T --max-depth 3
+parser = graph_arg_parser("Depth-limited search through a cave map (directed graph).", directed=True)
+parser.add_argument("--max-depth", type=int, help="flashlight range (max depth)")
+parser.add_argument("--memo", action="store_true", help="skip rooms already reached at no greater depth")
+args = parser.parse_args()
 
-# DLS Exploration Machine
-def dls(current, target, depth, path):
-    new_path = path + [current]  # Add current room to path
-    
-    if current == target:
-        return new_path  # Found treasure!
-    
-    if depth >= max_depth:  # Flashlight can't shine further
-        return None  # Out of range
-    
-    # Check connecting tunnels
-    for neighbor in graph.get(current, []):
-        if neighbor in new_path:  # Skip already visited rooms
-            continue
-        # Explore deeper (increase depth by 1)
-        result = dls(neighbor, target, depth + 1, new_path)
-        if result:  # If treasure found in this path
-            return result
-            
-    return None  # Treasure not found this way
+if args.edges:
+    graph = graph_from_args(args)
+else:
+    # Build the cave map
+    builder = GraphBuilder(directed=True)
+    nodes = input("Enter rooms (A B C...): ").split()
+    for node in nodes:
+        builder.add_node(node)
+        neighbors = input(f"Where can you go from {node}? (Ex: B C): ").split()
+        for neighbor in neighbors:
+            builder.add_edge(node, neighbor)
+    graph = builder.build()
+
+start = args.start or input("Start room: ")
+goal = args.goal or input("Treasure room: ")
+if start not in graph.ids or goal not in graph.ids:
+    sys.exit("Start and treasure rooms must be rooms of the cave map.")
+max_depth = args.max_depth if args.max_depth is not None else int(input("Flashlight range (max depth): "))
 
-# Start the search!
-path = dls(start, goal, 0, [])  # Start at depth=0 with empty path
+# Start the search! (Graph_library.dls never revisits a room already on the current path)
+result = dls(graph, graph.id(start), graph.id(goal), max_depth, memo=args.memo)
 
-if path:
-    print("Path to treasure:", " → ".join(path))
+if result.found:
+    print("Path to treasure:", " → ".join(graph.path_names(result.path)))
 else:
     print(f"Treasure not found within {max_depth} steps")
@@ -0,0 +1,402 @@
+"""Compact game trees for Mini_Max.py and Alpha_beta_prunning.py.
+
+Nodes are integer ids 0..n-1 (the root is `tree.root`). The children of node u are
+children[offsets[u]:offsets[u + 1]] and a node without children is a leaf whose value is
+utility[u]. Everything lives in `array` buffers, so a tree with millions of leaves costs
+a few bytes per node, and the evaluators walk it with an explicit stack instead of
+recursion.
+
+Text format (one node per line, '#' starts a comment; the first node is the root):
+
+    A B C          internal node A with children B and C
+    B = 3          leaf B with utility 3
+
+    tree = load_tree("tree.txt")            # or uniform_tree(branching=10, depth=6, seed=1)
+    result = alphabeta(tree)
+    print(result.value, tree.name(result.move), result.stats)
+
+parallel_alphabeta / parallel_minimax hand subtrees to a process pool and return the same
+value and move as the serial versions:
+
+    python Game_tree.py --random 10 7 --cores 1 2 4     # speedup per core count
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np  # optional: generates large synthetic trees without a Python loop
+except ImportError:
+    np = None
+
+INF = float("inf")
+
+
+class GameTree:
+    """Game tree in CSR form: children offsets, child ids and leaf utilities."""
+
+    def __init__(self, offsets, children, utility, names=None, root=0):
+        self.offsets = offsets      # n + 1 entries
+        self.children = children    # child ids, grouped by parent
+        self.utility = utility      # value of each leaf (ignored for internal nodes)
+        self.names = names          # node names, or None for "0", "1", ...
+        self.root = root
+        self._ids = None
+
+    @property
+    def n_nodes(self):
+        return len(self.offsets) - 1
+
+    @property
+    def ids(self):
+        if self._ids is None:
+            self._ids = {name: i for i, name in enumerate(self.names or [])}
+        return self._ids
+
+    def id(self, name):
+        return self.ids[name] if self.names is not None else int(name)
+
+    def name(self, node):
+        return self.names[node] if self.names is not None else str(node)
+
+    def is_leaf(self, u):
+        return self.offsets[u] == self.offsets[u + 1]
+
+    def child_ids(self, u):
+        return self.children[self.offsets[u]:self.offsets[u + 1]]
+
+    def n_leaves(self):
+        offsets = self.offsets
+        return sum(1 for u in range(self.n_nodes) if offsets[u] == offsets[u + 1])
+
+    def __repr__(self):
+        return f"<GameTree {self.n_nodes} nodes, root {self.name(self.root)}>"
+
+
+class GameTreeBuilder:
+    """Collects nodes by name (in any order) and builds a GameTree."""
+
+    def __init__(self):
+        self.ids = {}
+        self.kids = []
+        self.values = []
+
+    def node_id(self, name):
+        node = self.ids.get(name)
+        if node is None:
+            node = self.ids[name] = len(self.kids)
+            self.kids.append(None)
+            self.values.append(0)
+        return node
+
+    def add_node(self, name, children):
+        node = self.node_id(name)
+        self.kids[node] = [self.node_id(child) for child in children]
+
+    def set_utility(self, name, value):
+        node = self.node_id(name)
+        self.kids[node] = []
+        self.values[node] = value
+
+    def build(self, root=None):
+        offsets = array("q", [0])
+        children = array("i")
+        for kids in self.kids:
+            children.extend(kids or [])
+            offsets.append(len(children))
+        names = list(self.ids)
+        root_id = self.ids[root] if root is not None else 0
+        return GameTree(offsets, children, array("d", self.values), names, root_id)
+
+
+def load_tree(path):
+    """Reads the text format above; the first node listed is the root."""
+    builder = GameTreeBuilder()
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            parts = line.split("#", 1)[0].split()
+            if not parts:
+                continue
+            if len(parts) == 3 and parts[1] == "=":
+                builder.set_utility(parts[0], float(parts[2]))
+            elif "=" in parts:
+                raise ValueError(f"{path}:{line_no}: expected 'node = utility' or 'node child child ...'")
+            else:
+                builder.add_node(parts[0], parts[1:])
+    for name, node in builder.ids.items():
+        if builder.kids[node] is None:
+            raise ValueError(f"{path}: node {name} has neither children nor a utility")
+    return builder.build()
+
+
+def uniform_tree(branching, depth, seed=None, low=-100, high=100):
+    """Complete tree with `branching` children per internal node and branching**depth leaves.
+
+    Nodes are numbered level by level, so node u's children are branching * u + 1 ...
+    branching * u + branching; leaf utilities are random integers in [low, high].
+    """
+    internal = sum(branching ** d for d in range(depth))
+    n = internal + branching ** depth
+    if np is not None:
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        offsets[1:internal + 1] = np.arange(1, internal + 1, dtype=np.int64) * branching
+        offsets[internal + 1:] = internal * branching
+        values = np.zeros(n)
+        values[internal:] = np.random.default_rng(seed).integers(low, high, endpoint=True, size=n - internal)
+        to_array = lambda code, a: array(code, a.tobytes())
+        return GameTree(to_array("q", offsets), to_array("i", np.arange(1, n, dtype=np.int32)),
+                        to_array("d", values))
+    rng = random.Random(seed)
+    offsets = array("q", range(0, internal * branching + 1, branching))
+    offsets.extend([internal * branching] * (n - internal))
+    values = array("d", bytes(8 * internal))
+    values.extend(rng.randint(low, high) for _ in range(n - internal))
+    return GameTree(offsets, array("i", range(1, n)), values)
+
+
+# --- Evaluation ---
+
+class TreeResult:
+    """Value of a root, the child that achieves it, and visit counters."""
+
+    def __init__(self, value, move, stats):
+        self.value = value
+        self.move = move    # best child of the root (the first one reaching the value), or -1
+        self.stats = stats  # visited, leaves, cutoffs, pruned (children skipped by cutoffs)
+
+    def __repr__(self):
+        return f"<TreeResult value={self.value} move={self.move} stats={self.stats}>"
+
+
+def minimax(tree, root=None, maximizing=True):
+    """Plain minimax: visits every node below root."""
+    return _evaluate(tree, root, -INF, INF, maximizing, prune=False)
+
+
+def alphabeta(tree, root=None, alpha=-INF, beta=INF, maximizing=True):
+    """Minimax with alpha-beta pruning; same value (and move) as minimax, fewer nodes."""
+    return _evaluate(tree, root, alpha, beta, maximizing, prune=True)
+
+
+def _evaluate(tree, root, alpha, beta, maximizing, prune):
+    """Depth-first evaluation with an explicit stack of (node, next child, alpha, beta, value)."""
+    offsets, children, utility = tree.offsets, tree.children, tree.utility
+    root = tree.root if root is None else root
+    stats = {"visited": 1, "leaves": 0, "cutoffs": 0, "pruned": 0}
+    if offsets[root] == offsets[root + 1]:
+        stats["leaves"] = 1
+        return TreeResult(utility[root], -1, stats)
+
+    # parallel stacks, one entry per node on the current path
+    node_s, pos_s = [root], [offsets[root]]
+    alpha_s, beta_s = [alpha], [beta]
+    value_s = [-INF if maximizing else INF]
+    max_s = [maximizing]
+    move = -1
+    visited = 1
+    leaves = cutoffs = pruned = 0
+    while True:
+        top = len(node_s) - 1
+        u = node_s[top]
+        pos = pos_s[top]
+        end = offsets[u + 1]
+        if pos < end and (not prune or alpha_s[top] < beta_s[top]):
+            pos_s[top] = pos + 1
+            child = children[pos]
+            visited += 1
+            if offsets[child] != offsets[child + 1]:
+                node_s.append(child)
+                pos_s.append(offsets[child])
+                alpha_s.append(alpha_s[top])
+                beta_s.append(beta_s[top])
+                value_s.append(INF if max_s[top] else -INF)
+                max_s.append(not max_s[top])
+                continue
+            leaves += 1
+            value = utility[child]
+        else:
+            if pos < end:
+                cutoffs += 1
+                pruned += end - pos
+            value = value_s.pop()
+            node_s.pop()
+            pos_s.pop()
+            alpha_s.pop()
+            beta_s.pop()
+            max_s.pop()
+            if not node_s:
+                stats.update(visited=visited, leaves=leaves, cutoffs=cutoffs, pruned=pruned)
+                return TreeResult(value, move, stats)
+            top -= 1
+            child = u
+        # back up the child's value into its parent (the frame now on top)
+        if max_s[top]:
+            if value > value_s[top]:
+                value_s[top] = value
+                if top == 0:
+                    move = child
+                if value > alpha_s[top]:
+                    alpha_s[top] = value
+        elif value < value_s[top]:
+            value_s[top] = value
+            if top == 0:
+                move = child
+            if value < beta_s[top]:
+                beta_s[top] = value
+
+
+# --- Parallel evaluation ---
+
+_worker_tree = None  # the tree each pool worker searches
+
+
+def _init_worker(tree):
+    global _worker_tree
+    if tree is not None:
+        _worker_tree = tree
+
+
+def _subtree_job(root, alpha, beta, maximizing, prune):
+    result = _evaluate(_worker_tree, root, alpha, beta, maximizing, prune)
+    return result.value, result.stats
+
+
+def tree_pool(tree, workers=None):
+    """Process pool for `tree`: forked workers inherit it, others get one pickled copy each."""
+    global _worker_tree
+    context = multiprocessing.get_context()
+    if context.get_start_method() == "fork":
+        _worker_tree = tree
+        tree = None
+    return ProcessPoolExecutor(workers, context, initializer=_init_worker, initargs=(tree,))
+
+
+def parallel_alphabeta(tree, workers=None, root=None, split_depth=2, pool=None):
+    """Alpha-beta with principal-variation splitting (Young Brothers Wait).
+
+    At each node of the leftmost path, down to split_depth levels, the eldest child is
+    searched first (and split in turn); its value narrows the window, and only then are
+    the younger brothers sent to the pool together with that window. Nodes below
+    split_depth are searched serially inside the workers. The value and move are those of
+    alphabeta(); the counters include the extra nodes a looser window costs.
+    """
+    return _parallel(tree, workers, root, split_depth, pool, prune=True)
+
+
+def parallel_minimax(tree, workers=None, root=None, pool=None):
+    """Minimax with the root's children evaluated in the pool."""
+    return _parallel(tree, workers, root, 1, pool, prune=False)
+
+
+def _parallel(tree, workers, root, split_depth, pool, prune):
+    own_pool = pool is None
+    if own_pool:
+        pool = tree_pool(tree, workers)
+    try:
+        root = tree.root if root is None else root
+        stats = {"visited": 0, "leaves": 0, "cutoffs": 0, "pruned": 0, "jobs": 0}
+        value, move = _split(tree, pool, root, -INF, INF, True, split_depth, prune, stats)
+        return TreeResult(value, move, stats)
+    finally:
+        if own_pool:
+            pool.shutdown(cancel_futures=True)
+
+
+def _split(tree, pool, u, alpha, beta, maximizing, depth, prune, stats):
+    if depth == 0 or tree.is_leaf(u):
+        result = _evaluate(tree, u, alpha, beta, maximizing, prune)
+        _add_stats(stats, result.stats)
+        return result.value, result.move
+    stats["visited"] += 1
+    kids = tree.child_ids(u)
+    value, move = (-INF if maximizing else INF), -1
+
+    def take(child, child_value):
+        nonlocal value, move, alpha, beta
+        if maximizing:
+            if child_value > value:
+                value, move = child_value, child
+                alpha = max(alpha, value) if prune else alpha
+        elif child_value < value:
+            value, move = child_value, child
+            beta = min(beta, value) if prune else beta
+
+    younger = kids
+    if prune:  # the eldest brother first, then the rest in parallel with its window
+        take(kids[0], _split(tree, pool, kids[0], alpha, beta, not maximizing, depth - 1, prune, stats)[0])
+        younger = kids[1:]
+        if beta <= alpha:
+            stats["cutoffs"] += 1
+            stats["pruned"] += len(younger)
+            return value, move
+    futures = [pool.submit(_subtree_job, child, alpha, beta, not maximizing, prune) for child in younger]
+    stats["jobs"] += len(futures)
+    for i, (child, future) in enumerate(zip(younger, futures)):
+        child_value, child_stats = future.result()
+        _add_stats(stats, child_stats)
+        take(child, child_value)
+        if prune and beta <= alpha and i + 1 < len(younger):
+            stats["cutoffs"] += 1
+            stats["pruned"] += len(younger) - i - 1
+            for later in futures[i + 1:]:
+                later.cancel()
+            break
+    return value, move
+
+
+def _add_stats(total, stats):
+    for key, value in stats.items():
+        total[key] += value
+
+
+def benchmark(tree, core_counts, split_depth=2, prune=True):
+    """Times the serial evaluator against the parallel one for each core count."""
+    name = "alphabeta" if prune else "minimax"
+    t = time.perf_counter()
+    serial = alphabeta(tree) if prune else minimax(tree)
+    base = time.perf_counter() - t
+    print(f"{tree}: {name} value {serial.value:g}, move {tree.name(serial.move)}")
+    print(f"serial   : {serial.stats['visited']:>10} nodes {base:8.2f}s")
+    for cores in core_counts:
+        t = time.perf_counter()
+        if prune:
+            result = parallel_alphabeta(tree, cores, split_depth=split_depth)
+        else:
+            result = parallel_minimax(tree, cores)
+        elapsed = time.perf_counter() - t
+        same = result.value == serial.value and result.move == serial.move
+        print(f"{cores:>2} cores : {result.stats['visited']:>10} nodes {elapsed:8.2f}s "
+              f"speedup {base / elapsed:5.2f}x  {'same result' if same else 'DIFFERENT RESULT'}")
+
+
+def tree_arg_parser(description):
+    """Common arguments of Mini_Max.py and Alpha_beta_prunning.py."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("tree", nargs="?", help="tree file ('node child child ...' / 'node = utility' lines)")
+    parser.add_argument("--random", nargs=2, type=int, metavar=("BRANCHING", "DEPTH"),
+                        help="evaluate a random uniform tree instead")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=1, help="evaluate subtrees in this many processes")
+    return parser
+
+
+def tree_from_args(args):
+    if args.random:
+        return uniform_tree(args.random[0], args.random[1], args.seed)
+    return load_tree(args.tree)
+
+
+if __name__ == "__main__":
+    parser = tree_arg_parser("Benchmark parallel game-tree evaluation against the serial one.")
+    parser.add_argument("--cores", type=int, nargs="+", help="core counts to try (default: 1, 2, 4, ... up to all)")
+    parser.add_argument("--split-depth", type=int, default=2, help="levels of the leftmost path that are split")
+    parser.add_argument("--minimax", action="store_true", help="benchmark minimax instead of alpha-beta")
+    args = parser.parse_args()
+    if not (args.tree or args.random):
+        parser.error("give a tree file or --random BRANCHING DEPTH")
+    cores = args.cores or [c for c in (1, 2, 4, 8, 16, 32, 64) if c <= (os.cpu_count() or 1)]
+    benchmark(tree_from_args(args), cores, args.split_depth, prune=not args.minimax)
@@ -0,0 +1,896 @@
+"""Reusable graph structure and search algorithms for the scripts in this folder.
+
+Node names are interned to integer ids 0..n-1 and adjacency is stored in compressed
+sparse row (CSR) form: the neighbors of node u are targets[offsets[u]:offsets[u + 1]],
+with the matching edge weights at the same positions in `weights`. The buffers are
+`array` objects (NumPy, when installed, is used to build them and to expose zero-copy
+views), so a graph with millions of edges costs a few bytes per edge instead of a Python
+list per node.
+
+    builder = GraphBuilder()
+    builder.add_edge("A", "B", 4)
+    builder.add_edge("B", "C", 1)
+    builder.set_heuristic("A", 5)
+    graph = builder.build()
+
+    result = astar(graph, graph.id("A"), graph.id("C"))
+    print(graph.path_names(result.path), result.cost)
+
+All search functions take and return integer node ids; use graph.id() / graph.path_names()
+to translate from and to the names the user typed.
+"""
+import heapq
+from array import array
+from collections import deque
+from itertools import repeat
+
+try:
+    import numpy as np  # optional: faster CSR construction and NumPy views of the buffers
+except ImportError:
+    np = None
+
+INF = float("inf")
+NUMPY_MIN_EDGES = 10000  # below this, plain Python loops beat NumPy's per-call overhead
+
+
+# --- Graph structure ---
+
+class Graph:
+    """Immutable CSR graph with interned node names, optional edge weights and heuristics."""
+
+    def __init__(self, names, offsets, targets, weights=None, heuristic=None, directed=False):
+        self.names = names            # id -> name
+        self._ids = None              # name -> id, built on first use
+        self.offsets = offsets        # n + 1 entries, int64
+        self.targets = targets        # one entry per stored edge, int32
+        self.weights = weights        # float64 per stored edge, or None for unweighted graphs
+        self.heuristic = heuristic    # float64 per node, or None
+        self.directed = directed
+        self._reverse = None
+
+    @property
+    def n_nodes(self):
+        return len(self.offsets) - 1
+
+    @property
+    def n_edges(self):
+        """Stored (directed) edges; an undirected edge is stored once in each direction."""
+        return len(self.targets)
+
+    @property
+    def ids(self):
+        if self._ids is None:
+            self._ids = {name: i for i, name in enumerate(self.names)}
+        return self._ids
+
+    def id(self, name):
+        return self.ids[name]
+
+    def name(self, node):
+        return self.names[node]
+
+    def path_names(self, path):
+        return [self.names[u] for u in path] if path is not None else None
+
+    def neighbors(self, u):
+        return self.targets[self.offsets[u]:self.offsets[u + 1]]
+
+    def edges(self, u):
+        """(neighbor, weight) pairs of u; weight is 1 on unweighted graphs."""
+        start, end = self.offsets[u], self.offsets[u + 1]
+        if self.weights is None:
+            return [(v, 1) for v in self.targets[start:end]]
+        return zip(self.targets[start:end], self.weights[start:end])
+
+    def degree(self, u):
+        return self.offsets[u + 1] - self.offsets[u]
+
+    def h(self, u):
+        return self.heuristic[u] if self.heuristic is not None else 0
+
+    def reverse(self):
+        """Graph with every edge flipped (the graph itself when undirected). Built once."""
+        if not self.directed:
+            return self
+        if self._reverse is None:
+            n = self.n_nodes
+            if np is not None and self.n_edges > NUMPY_MIN_EDGES:
+                src = np.repeat(np.arange(n, dtype=np.int32), np.diff(np.asarray(self.offsets)))
+            else:
+                src = array("i")
+                for u in range(n):
+                    src.extend([u] * (self.offsets[u + 1] - self.offsets[u]))
+            offsets, targets, weights = _csr_from_edges(n, self.targets, src, self.weights)
+            self._reverse = Graph(self.names, offsets, targets, weights, self.heuristic, directed=True)
+            self._reverse._reverse = self
+        return self._reverse
+
+    def as_numpy(self):
+        """Zero-copy NumPy views (offsets, targets, weights) of the CSR buffers."""
+        if np is None:
+            raise ImportError("NumPy is required for Graph.as_numpy()")
+        weights = np.asarray(self.weights) if self.weights is not None else None
+        return np.asarray(self.offsets), np.asarray(self.targets), weights
+
+    def __repr__(self):
+        kind = "directed" if self.directed else "undirected"
+        return f"<Graph {kind}, {self.n_nodes} nodes, {self.n_edges} stored edges>"
+
+
+def _array_from_numpy(typecode, values):
+    out = array(typecode)
+    out.frombytes(values.tobytes())
+    return out
+
+
+def _csr_from_edges(n, src, dst, weights=None):
+    """Counting sort of (src, dst[, weight]) columns into CSR buffers; edge order per node is kept."""
+    if np is not None and len(src) > NUMPY_MIN_EDGES:
+        src_np = np.asarray(src, dtype=np.int64)
+        order = np.argsort(src_np, kind="stable")
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src_np, minlength=n), out=offsets[1:])
+        targets = np.asarray(dst, dtype=np.int32)[order]
+        w = np.asarray(weights, dtype=np.float64)[order] if weights is not None else None
+        # Hand back plain arrays (one memcpy each): iterating them yields Python ints,
+        # which the search loops handle much faster than NumPy scalars.
+        return (_array_from_numpy("q", offsets), _array_from_numpy("i", targets),
+                _array_from_numpy("d", w) if w is not None else None)
+
+    counts = [0] * (n + 1)
+    for u in src:
+        counts[u + 1] += 1
+    for i in range(n):
+        counts[i + 1] += counts[i]
+    offsets = array("q", counts)
+    fill = counts[:-1]
+    targets = array("i", bytes(4 * len(src)))
+    w = array("d", bytes(8 * len(src))) if weights is not None else None
+    for i, u in enumerate(src):
+        pos = fill[u]
+        fill[u] = pos + 1
+        targets[pos] = dst[i]
+        if w is not None:
+            w[pos] = weights[i]
+    return offsets, targets, w
+
+
+def graph_from_arrays(n, src, dst, weights=None, names=None, heuristic=None, directed=False):
+    """Builds a Graph from edge columns of integer ids (lists, arrays or NumPy arrays).
+
+    Undirected graphs store every edge in both directions, as the scripts did with their
+    graph[u].append(v); graph[v].append(u) pairs.
+    """
+    if names is None:
+        names = [str(i) for i in range(n)]
+    if not directed:
+        if np is not None and not isinstance(src, (list, array)):
+            src, dst = np.concatenate([src, dst]), np.concatenate([dst, src])
+            weights = np.concatenate([weights, weights]) if weights is not None else None
+        else:
+            src, dst = array("i", src) + array("i", dst), array("i", dst) + array("i", src)
+            weights = array("d", weights) * 2 if weights is not None else None
+    offsets, targets, w = _csr_from_edges(n, src, dst, weights)
+    return Graph(names, offsets, targets, w, heuristic, directed)
+
+
+class GraphBuilder:
+    """Collects named edges and heuristic values, then freezes them into a CSR Graph."""
+
+    def __init__(self, directed=False, weighted=False):
+        self.directed = directed
+        self.weighted = weighted
+        self.names = []
+        self.ids = {}
+        self.src = array("i")
+        self.dst = array("i")
+        self.weights = array("d")
+        self.heuristic = {}
+
+    def node_id(self, name):
+        """Interns a node name and returns its integer id."""
+        node = self.ids.get(name)
+        if node is None:
+            node = self.ids[name] = len(self.names)
+            self.names.append(name)
+        return node
+
+    def add_node(self, name):
+        return self.node_id(name)
+
+    def add_edge(self, u, v, w=1):
+        self.src.append(self.node_id(u))
+        self.dst.append(self.node_id(v))
+        self.weights.append(w)
+        if w != 1:
+            self.weighted = True
+
+    def set_heuristic(self, name, h):
+        self.heuristic[self.node_id(name)] = h
+
+    def build(self):
+        n = len(self.names)
+        heuristic = None
+        if self.heuristic:
+            heuristic = array("d", bytes(8 * n))
+            for node, h in self.heuristic.items():
+                heuristic[node] = h
+        weights = self.weights if self.weighted else None
+        return graph_from_arrays(n, self.src, self.dst, weights, list(self.names), heuristic, self.directed)
+
+
+class SearchResult:
+    """Outcome of a point-to-point search: the path (node ids) or None, its cost and counters."""
+
+    def __init__(self, path=None, cost=INF, order=None, depth=None, stats=None):
+        self.path = path      # list of node ids from start to goal, or None
+        self.cost = cost      # summed edge weights (hops on unweighted graphs)
+        self.order = order    # nodes in the order they were visited/expanded
+        self.depth = depth    # depth limit that found the path (IDS)
+        self.stats = stats if stats is not None else {}
+
+    @property
+    def found(self):
+        return self.path is not None
+
+    def __repr__(self):
+        return f"<SearchResult path={self.path} cost={self.cost} stats={self.stats}>"
+
+
+def _walk_back(parent, node):
+    """Rebuilds start -> node from a parent map (the start's parent is -1)."""
+    path = []
+    while node != -1:
+        path.append(node)
+        node = parent[node]
+    path.reverse()
+    return path
+
+
+def path_cost(graph, path):
+    """Sum of edge weights along a path (cheapest parallel edge when there are several)."""
+    total = 0
+    for u, v in zip(path, path[1:]):
+        total += min(w for x, w in graph.edges(u) if x == v)
+    return total
+
+
+# --- Uninformed search ---
+
+class BFSResult:
+    """Breadth-first tree from one start: visit order plus the level and parent of every node."""
+
+    def __init__(self, start, order, level, parent, stats):
+        self.start = start
+        self.order = order    # reached nodes level by level (array of ids)
+        self.level = level    # hops from start per node, -1 when unreached
+        self.parent = parent  # BFS tree parent per node, -1 for the start and unreached nodes
+        self.stats = stats    # levels, top_down_levels, bottom_up_levels, edges_checked
+
+    def reached(self, node):
+        return self.level[node] >= 0
+
+    def path_to(self, node):
+        """Fewest-hop path start -> node (node ids), or None when unreachable."""
+        return _walk_back(self.parent, node) if self.level[node] >= 0 else None
+
+    def __repr__(self):
+        return f"<BFSResult start={self.start} reached={len(self.order)} stats={self.stats}>"
+
+
+BFS_ALPHA = 15  # go bottom-up once the frontier's edges exceed the unexplored edges / alpha
+BFS_BETA = 18   # go back top-down once the frontier shrinks below n / beta nodes
+BOTTOM_UP_ROUNDS = 8  # NumPy bottom-up: parents tried one at a time before checking the rest at once
+
+
+def bfs(graph, start):
+    """Breadth-first traversal order from start (the classic queue order)."""
+    return list(bfs_tree(graph, start, direction_optimizing=False).order)
+
+
+def bfs_tree(graph, start, direction_optimizing=True, alpha=BFS_ALPHA, beta=BFS_BETA):
+    """Level-synchronous BFS returning a BFSResult (order, levels and parents).
+
+    With direction_optimizing, a level whose frontier touches many edges is expanded
+    bottom-up instead (Beamer et al.): every unreached node looks for a parent among its
+    in-neighbors and stops at the first one found in the frontier, which checks far fewer
+    edges on low-diameter graphs. Within a bottom-up level nodes are listed by id.
+    Large graphs run each level as a handful of NumPy operations when NumPy is installed.
+    """
+    if np is not None and graph.n_edges > NUMPY_MIN_EDGES:
+        return _bfs_numpy(graph, start, direction_optimizing, alpha, beta)
+    return _bfs_python(graph, start, direction_optimizing, alpha, beta)
+
+
+def _bfs_python(graph, start, direction_optimizing, alpha, beta):
+    n = graph.n_nodes
+    offsets, targets = graph.offsets, graph.targets
+    level = array("i", [-1]) * n
+    parent = array("i", [-1]) * n
+    level[start] = 0
+    order = array("i", [start])
+    frontier = array("i", [start])
+    stats = {"levels": 0, "top_down_levels": 0, "bottom_up_levels": 0, "edges_checked": 0}
+    if direction_optimizing:
+        backward = graph.reverse()
+        r_offsets, r_targets = backward.offsets, backward.targets
+        m_unexplored = backward.n_edges - (r_offsets[start + 1] - r_offsets[start])
+    bottom_up = False
+    previous_size = 0
+    depth = 0
+    while frontier:
+        depth += 1
+        m_frontier = 0
+        for u in frontier:
+            m_frontier += offsets[u + 1] - offsets[u]
+        if direction_optimizing:
+            growing = len(frontier) > previous_size
+            if not bottom_up and growing and m_frontier > m_unexplored / alpha:
+                bottom_up = True
+            elif bottom_up and not growing and len(frontier) < n / beta:
+                bottom_up = False
+        previous_size = len(frontier)
+
+        next_frontier = array("i")
+        if bottom_up:
+            checked = 0
+            for v in range(n):
+                if level[v] < 0:
+                    for i in range(r_offsets[v], r_offsets[v + 1]):
+                        u = r_targets[i]
+                        checked += 1
+                        if level[u] == depth - 1:
+                            level[v] = depth
+                            parent[v] = u
+                            next_frontier.append(v)
+                            break
+            stats["bottom_up_levels"] += 1
+            stats["edges_checked"] += checked
+        else:
+            for u in frontier:
+                for v in targets[offsets[u]:offsets[u + 1]]:
+                    if level[v] < 0:
+                        level[v] = depth
+                        parent[v] = u
+                        next_frontier.append(v)
+            stats["top_down_levels"] += 1
+            stats["edges_checked"] += m_frontier
+        if direction_optimizing:
+            for v in next_frontier:
+                m_unexplored -= r_offsets[v + 1] - r_offsets[v]
+        order.extend(next_frontier)
+        frontier = next_frontier
+    stats["levels"] = depth
+    return BFSResult(start, order, level, parent, stats)
+
+
+def _edge_positions(starts, counts):
+    """Flat CSR positions starts[i], starts[i] + 1, ... (counts[i] of each), concatenated (NumPy)."""
+    shift = np.cumsum(counts) - counts
+    return np.repeat(starts - shift, counts) + np.arange(int(counts.sum()), dtype=np.int64)
+
+
+def _bfs_numpy(graph, start, direction_optimizing, alpha, beta):
+    n = graph.n_nodes
+    offsets, targets, _ = graph.as_numpy()
+    degree = np.diff(offsets)
+    level = np.full(n, -1, dtype=np.int32)
+    parent = np.full(n, -1, dtype=np.int32)
+    level[start] = 0
+    frontier = np.array([start], dtype=np.int64)
+    layers = [frontier]
+    stats = {"levels": 0, "top_down_levels": 0, "bottom_up_levels": 0, "edges_checked": 0}
+    if direction_optimizing:
+        r_offsets, r_targets, _ = graph.reverse().as_numpy()
+        r_degree = np.diff(r_offsets)
+        m_unexplored = int(r_degree.sum() - r_degree[start])
+    bottom_up = False
+    previous_size = 0
+    depth = 0
+    while frontier.size:
+        depth += 1
+        counts = degree[frontier]
+        m_frontier = int(counts.sum())
+        if direction_optimizing:
+            growing = frontier.size > previous_size
+            if not bottom_up and growing and m_frontier > m_unexplored / alpha:
+                bottom_up = True
+            elif bottom_up and not growing and frontier.size < n / beta:
+                bottom_up = False
+        previous_size = frontier.size
+
+        if bottom_up:
+            found, parents, checked = _bottom_up_level(level, depth, r_offsets, r_targets, r_degree)
+            stats["bottom_up_levels"] += 1
+            stats["edges_checked"] += checked
+        else:
+            neighbors = targets[_edge_positions(offsets[frontier], counts)]
+            sources = np.repeat(frontier, counts)
+            fresh = level[neighbors] < 0
+            neighbors, sources = neighbors[fresh], sources[fresh]
+            # First discovery of each node wins, in edge order: the same order a queue gives.
+            _, first = np.unique(neighbors, return_index=True)
+            first.sort()
+            found, parents = neighbors[first].astype(np.int64), sources[first]
+            stats["top_down_levels"] += 1
+            stats["edges_checked"] += m_frontier
+        level[found] = depth
+        parent[found] = parents
+        if direction_optimizing:
+            m_unexplored -= int(r_degree[found].sum())
+        layers.append(found)
+        frontier = found
+    stats["levels"] = depth
+    order = np.concatenate(layers).astype(np.int32)
+    return BFSResult(start, _array_from_numpy("i", order), _array_from_numpy("i", level),
+                     _array_from_numpy("i", parent), stats)
+
+
+def _bottom_up_level(level, depth, r_offsets, r_targets, r_degree):
+    """One bottom-up step: each unreached node takes its first in-neighbor on level depth - 1.
+
+    In-neighbors are tried one position at a time for all candidates together, so nodes
+    that find a parent early stop checking edges; after BOTTOM_UP_ROUNDS positions the
+    remaining candidates check all their other edges in one go.
+    """
+    in_frontier = level == depth - 1
+    candidates = np.flatnonzero(level < 0)
+    candidates = candidates[r_degree[candidates] > 0]
+    found, parents = [], []
+    checked = 0
+    k = 0
+    while candidates.size:
+        if k == BOTTOM_UP_ROUNDS:
+            counts = r_degree[candidates] - k
+            positions = _edge_positions(r_offsets[candidates] + k, counts)
+            sources = r_targets[positions]
+            owners = np.repeat(candidates, counts)
+            checked += positions.size
+            hit = in_frontier[sources]
+            nodes, first = np.unique(owners[hit], return_index=True)
+            found.append(nodes)
+            parents.append(sources[hit][first])
+            break
+        sources = r_targets[r_offsets[candidates] + k]
+        checked += candidates.size
+        hit = in_frontier[sources]
+        found.append(candidates[hit])
+        parents.append(sources[hit])
+        k += 1
+        candidates = candidates[~hit & (r_degree[candidates] > k)]
+    if not found:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32), checked
+    found, parents = np.concatenate(found), np.concatenate(parents)
+    by_id = np.argsort(found, kind="stable")
+    return found[by_id], parents[by_id], checked
+
+
+class DepthFirstEngine:
+    """Explicit-stack depth-first search on one graph, for DFS, DLS and IDS.
+
+    The current path lives in one preallocated array (with the next edge to try for each
+    entry beside it) plus an on-path bytearray, so there is no recursion, no path copy per
+    node and no list scan for cycle checks. The buffers are kept between calls, which is
+    what makes repeated deepening iterations cheap.
+
+    With memo=True every node remembers the shallowest depth it was reached at during the
+    current search and is skipped when reached again no deeper: a second visit with no more
+    depth budget left can't find anything new. Memo entries carry an iteration stamp, so
+    starting the next iteration costs nothing instead of clearing an n-sized array.
+    """
+
+    def __init__(self, graph, memo=False):
+        n = graph.n_nodes
+        self.graph = graph
+        self.memo = memo
+        self.on_path = bytearray(n)
+        self.path = array("i")
+        self.cursor = array("q")  # next edge position to try, per path entry
+        if memo:
+            self.seen_depth = array("i", [0]) * n
+            self.seen_stamp = array("i", [0]) * n
+        self.stamp = 0
+        self.stats = {"iterations": 0, "expanded": 0, "memo_skips": 0}
+
+    def _reserve(self, size):
+        if len(self.path) < size:
+            grow = size - len(self.path)
+            self.path.extend(repeat(0, grow))
+            self.cursor.extend(repeat(0, grow))
+
+    def traverse(self, start):
+        """Depth-first visit order from start (neighbors taken in their stored order)."""
+        n = self.graph.n_nodes
+        offsets, targets = self.graph.offsets, self.graph.targets
+        self._reserve(n)
+        path, cursor = self.path, self.cursor
+        visited = bytearray(n)
+        visited[start] = 1
+        order = [start]
+        path[0], cursor[0] = start, offsets[start]
+        top = 0
+        while top >= 0:
+            u = path[top]
+            pos = cursor[top]
+            if pos < offsets[u + 1]:
+                cursor[top] = pos + 1
+                v = targets[pos]
+                if not visited[v]:
+                    visited[v] = 1
+                    order.append(v)
+                    top += 1
+                    path[top], cursor[top] = v, offsets[v]
+            else:
+                top -= 1
+        return order
+
+    def dls(self, start, goal, limit):
+        """Depth-limited search for a simple path of at most `limit` edges.
+
+        result.stats["cutoff"] is False when no node was left unexpanded at the limit,
+        i.e. a larger limit would not reach anything new.
+        """
+        offsets, targets = self.graph.offsets, self.graph.targets
+        self._reserve(limit + 1)
+        path, cursor, on_path = self.path, self.cursor, self.on_path
+        memo = self.memo
+        if memo:
+            self.stamp += 1
+            stamp, seen_stamp, seen_depth = self.stamp, self.seen_stamp, self.seen_depth
+            seen_stamp[start], seen_depth[start] = stamp, 0
+        stats = {"expanded": 1, "memo_skips": 0, "cutoff": False}
+        if start == goal:
+            return SearchResult([start], 0, stats=stats)
+
+        path[0], cursor[0] = start, offsets[start]
+        on_path[start] = 1
+        top = 0
+        expanded = 1
+        memo_skips = 0
+        cutoff = False
+        found = None
+        while top >= 0:
+            u = path[top]
+            pos = cursor[top]
+            end = offsets[u + 1]
+            if pos < end:
+                if top == limit:
+                    cutoff = True
+                else:
+                    cursor[top] = pos + 1
+                    v = targets[pos]
+                    if on_path[v]:
+                        continue
+                    depth = top + 1
+                    if memo:
+                        if seen_stamp[v] == stamp and seen_depth[v] <= depth:
+                            memo_skips += 1
+                            continue
+                        seen_stamp[v], seen_depth[v] = stamp, depth
+                    expanded += 1
+                    if v == goal:
+                        found = path[:depth].tolist() + [v]
+                        break
+                    top = depth
+                    path[top], cursor[top] = v, offsets[v]
+                    on_path[v] = 1
+                    continue
+            on_path[u] = 0
+            top -= 1
+        for i in range(top + 1):  # unwind whatever is left of the path after an early exit
+            on_path[path[i]] = 0
+
+        stats.update(expanded=expanded, memo_skips=memo_skips, cutoff=cutoff)
+        self.stats["iterations"] += 1
+        self.stats["expanded"] += expanded
+        self.stats["memo_skips"] += memo_skips
+        if found is None:
+            return SearchResult(stats=stats)
+        return SearchResult(found, len(found) - 1, stats=stats)
+
+    def ids(self, start, goal, max_depth=None):
+        """Iterative deepening: DLS with limits 0, 1, 2, ... until the goal is found.
+
+        Stops early once an iteration hits no cutoff, since deeper limits can't add nodes.
+        """
+        if max_depth is None:
+            max_depth = self.graph.n_nodes
+        for limit in range(max_depth + 1):
+            result = self.dls(start, goal, limit)
+            if result.found or not result.stats["cutoff"]:
+                break
+        result.depth = limit if result.found else None
+        result.stats = dict(self.stats)
+        return result
+
+
+def dfs(graph, start):
+    """Depth-first traversal order from start (neighbors taken in their stored order)."""
+    return DepthFirstEngine(graph).traverse(start)
+
+
+def dls(graph, start, goal, limit, memo=False):
+    """Depth-limited search for a simple path of at most `limit` edges."""
+    return DepthFirstEngine(graph, memo).dls(start, goal, limit)
+
+
+def ids(graph, start, goal, max_depth=None, memo=False):
+    """Iterative deepening: DLS with limits 0, 1, 2, ... until the goal is found."""
+    return DepthFirstEngine(graph, memo).ids(start, goal, max_depth)
+
+
+def bidirectional_search(graph, start, goal):
+    """Breadth-first search from both ends, a whole level at a time, returning a fewest-hop path.
+
+    The side with the smaller frontier expands its next level. When that level reaches nodes
+    the other side has seen, the level is still finished and the meeting node with the
+    fewest total hops is kept: the first meeting found is not always on a shortest path.
+    """
+    if start == goal:
+        return SearchResult([start], 0)
+    n = graph.n_nodes
+    backward = graph.reverse()
+    parent_f = array("i", [-2]) * n  # -2 = unseen
+    parent_b = array("i", [-2]) * n
+    dist_f = array("i", [-1]) * n
+    dist_b = array("i", [-1]) * n
+    parent_f[start], dist_f[start] = -1, 0
+    parent_b[goal], dist_b[goal] = -1, 0
+    frontier_f, frontier_b = [start], [goal]
+    best, meet = n + 1, -1
+    while frontier_f and frontier_b and meet == -1:
+        forward = len(frontier_f) <= len(frontier_b)
+        g, frontier, parent, dist, other_dist = ((graph, frontier_f, parent_f, dist_f, dist_b) if forward else
+                                                 (backward, frontier_b, parent_b, dist_b, dist_f))
+        next_frontier = []
+        for u in frontier:
+            depth = dist[u] + 1
+            for v in g.targets[g.offsets[u]:g.offsets[u + 1]]:
+                if parent[v] == -2:
+                    parent[v] = u
+                    dist[v] = depth
+                    next_frontier.append(v)
+                    if other_dist[v] >= 0 and depth + other_dist[v] < best:
+                        best, meet = depth + other_dist[v], v
+        if forward:
+            frontier_f = next_frontier
+        else:
+            frontier_b = next_frontier
+    if meet == -1:
+        return SearchResult()
+    path = _walk_back(parent_f, meet)
+    node = parent_b[meet]
+    while node != -1:
+        path.append(node)
+        node = parent_b[node]
+    return SearchResult(path, len(path) - 1)
+
+
+# --- Informed search ---
+
+def _heuristic_getter(graph, heuristic):
+    """h(node) for a callable or per-node sequence heuristic, defaulting to graph.heuristic (else 0)."""
+    if heuristic is None:
+        heuristic = graph.heuristic
+    if heuristic is None:
+        return _zero
+    if callable(heuristic):
+        return heuristic
+    return heuristic.__getitem__
+
+
+def best_first_search(graph, start, goal, heuristic=None):
+    """Greedy best-first search: always expand the open node with the lowest heuristic.
+
+    The open list is a binary heap of (h, node) and membership is a bytearray, so each
+    step costs O(log V) with no list scans or re-sorting.
+    """
+    h = _heuristic_getter(graph, heuristic)
+    offsets, targets = graph.offsets, graph.targets
+    heappush, heappop = heapq.heappush, heapq.heappop
+    parent = array("i", [-1]) * graph.n_nodes
+    seen = bytearray(graph.n_nodes)
+    seen[start] = 1
+    open_heap = [(h(start), start)]
+    order = []
+    pushes, max_open = 1, 1
+    while open_heap:
+        _, u = heappop(open_heap)
+        order.append(u)
+        if u == goal:
+            path = _walk_back(parent, u)
+            stats = {"expanded": len(order), "heap_pushes": pushes, "max_open": max_open}
+            return SearchResult(path, path_cost(graph, path), order, stats=stats)
+        for v in targets[offsets[u]:offsets[u + 1]]:
+            if not seen[v]:
+                seen[v] = 1
+                parent[v] = u
+                heappush(open_heap, (h(v), v))
+                pushes += 1
+        if len(open_heap) > max_open:
+            max_open = len(open_heap)
+    return SearchResult(order=order, stats={"expanded": len(order), "heap_pushes": pushes, "max_open": max_open})
+
+
+def beam_search(graph, start, goal, beam_width, heuristic=None):
+    """Level-by-level search that keeps only the `beam_width` best nodes (by heuristic) per level.
+
+    Each level's candidates are collected once (a bytearray marks nodes already queued or
+    closed) and the best beam_width are picked with heapq.nsmallest, O(n log k) instead of
+    a full sort. Large graphs with a per-node heuristic array run each level as NumPy
+    gathers and a partition instead. Ties keep discovery order, as a stable sort would.
+    """
+    if beam_width < 1:
+        raise ValueError("beam_width must be at least 1")
+    if heuristic is None:
+        heuristic = graph.heuristic
+    if np is not None and graph.n_edges > NUMPY_MIN_EDGES and not callable(heuristic):
+        return _beam_numpy(graph, start, goal, beam_width, heuristic)
+    h = _heuristic_getter(graph, heuristic)
+    offsets, targets = graph.offsets, graph.targets
+    n = graph.n_nodes
+    parent = array("i", [-1]) * n
+    marked = bytearray(n)  # closed, or already a candidate for the next level
+    marked[start] = 1
+    level = [start]
+    order = []
+    levels = 0
+    while level:
+        levels += 1
+        for u in level:
+            order.append(u)
+            if u == goal:
+                path = _walk_back(parent, u)
+                return SearchResult(path, path_cost(graph, path), order, stats={"levels": levels})
+        candidates = []
+        for u in level:
+            for v in targets[offsets[u]:offsets[u + 1]]:
+                if not marked[v]:
+                    marked[v] = 1
+                    parent[v] = u
+                    candidates.append(v)
+        level = heapq.nsmallest(beam_width, candidates, key=h)
+        # Candidates that fell out of the beam may be reached again from a later level.
+        if len(candidates) > len(level):
+            for v in candidates:
+                marked[v] = 0
+            for v in level:
+                marked[v] = 1
+    return SearchResult(order=order, stats={"levels": levels})
+
+
+def _beam_numpy(graph, start, goal, beam_width, heuristic):
+    offsets, targets, _ = graph.as_numpy()
+    degree = np.diff(offsets)
+    h_values = np.asarray(heuristic, dtype=np.float64) if heuristic is not None else np.zeros(graph.n_nodes)
+    parent = np.full(graph.n_nodes, -1, dtype=np.int32)
+    closed = np.zeros(graph.n_nodes, dtype=bool)
+    closed[start] = True
+    level = np.array([start], dtype=np.int64)
+    order = []
+    levels = 0
+    while level.size:
+        levels += 1
+        at_goal = np.flatnonzero(level == goal)
+        if at_goal.size:
+            order.append(level[:at_goal[0] + 1])
+            order = np.concatenate(order).tolist()
+            path = _walk_back(parent.tolist(), goal)
+            return SearchResult(path, path_cost(graph, path), order, stats={"levels": levels})
+        order.append(level)
+        counts = degree[level]
+        neighbors = targets[_edge_positions(offsets[level], counts)]
+        sources = np.repeat(level, counts)
+        fresh = ~closed[neighbors]
+        neighbors, sources = neighbors[fresh], sources[fresh]
+        _, first = np.unique(neighbors, return_index=True)
+        first.sort()  # discovery order
+        candidates, sources = neighbors[first].astype(np.int64), sources[first]
+        h_candidates = h_values[candidates]
+        if candidates.size > beam_width:
+            # beam_width smallest h; among equal h at the cut, the first discovered
+            kth = np.partition(h_candidates, beam_width - 1)[beam_width - 1]
+            below = np.flatnonzero(h_candidates < kth)
+            at_cut = np.flatnonzero(h_candidates == kth)[:beam_width - below.size]
+            keep = np.sort(np.concatenate([below, at_cut]))
+            candidates, sources, h_candidates = candidates[keep], sources[keep], h_candidates[keep]
+        by_h = np.argsort(h_candidates, kind="stable")
+        level = candidates[by_h]
+        parent[level] = sources[by_h]
+        closed[level] = True
+    return SearchResult(order=np.concatenate(order).tolist() if order else [], stats={"levels": levels})
+
+
+def astar(graph, start, goal, heuristic=None):
+    """A* search with f(n) = g(n) + h(n), in O((V + E) log V).
+
+    The open list is a binary heap with lazy deletion: improving a node's g-score pushes a
+    new entry (decrease-key) and outdated entries are skipped when popped. g-scores live in
+    a dict and the closed set in a set, so only the part of the graph the search touches
+    costs memory. A closed node is reopened if a cheaper path to it turns up, which keeps
+    the result optimal for admissible but inconsistent heuristics.
+
+    `heuristic` is a callable or per-node sequence; it defaults to the graph's heuristic
+    (0 where missing, which makes this Dijkstra's algorithm).
+    """
+    h = _heuristic_getter(graph, heuristic)
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    heappush, heappop = heapq.heappush, heapq.heappop
+
+    g_score = {start: 0}
+    parent = {start: -1}
+    closed = set()
+    order = []
+    h_start = h(start)
+    open_heap = [(h_start, h_start, start, 0)]  # (f, h, node, g): on equal f prefer the deeper node
+    pushes, stale, reopened, generated, max_open = 1, 0, 0, 0, 1
+
+    while open_heap:
+        _, _, u, g_u = heappop(open_heap)
+        if g_u > g_score[u] or u in closed:
+            stale += 1  # superseded by a cheaper entry, or already expanded
+            continue
+        closed.add(u)
+        order.append(u)
+        if u == goal:
+            break
+        start_edge, end_edge = offsets[u], offsets[u + 1]
+        ws = weights[start_edge:end_edge] if weights is not None else _ones(end_edge - start_edge)
+        for v, w in zip(targets[start_edge:end_edge], ws):
+            generated += 1
+            new_g = g_u + w
+            if new_g < g_score.get(v, INF):
+                g_score[v] = new_g
+                parent[v] = u
+                if v in closed:
+                    closed.discard(v)
+                    reopened += 1
+                h_v = h(v)
+                heappush(open_heap, (new_g + h_v, h_v, v, new_g))
+                pushes += 1
+        if len(open_heap) > max_open:
+            max_open = len(open_heap)
+
+    stats = {"expanded": len(order), "generated": generated, "heap_pushes": pushes,
+             "heap_pops": len(order) + stale, "stale_pops": stale, "reopened": reopened,
+             "max_open": max_open}
+    if goal in closed:
+        return SearchResult(_walk_back(parent, goal), g_score[goal], order, stats=stats)
+    return SearchResult(order=order, stats=stats)
+
+
+def dijkstra_tree(graph, source):
+    """Single-source shortest paths to every node. Returns (dist, parent) arrays.
+
+    dist[v] is INF and parent[v] is -1 for nodes that can't be reached; parent[source] is -1.
+    """
+    n = graph.n_nodes
+    offsets, targets, weights = graph.offsets, graph.targets, graph.weights
+    heappush, heappop = heapq.heappush, heapq.heappop
+    dist = [INF] * n
+    parent = [-1] * n
+    dist[source] = 0
+    done = bytearray(n)
+    heap = [(0, source)]
+    while heap:
+        d_u, u = heappop(heap)
+        if done[u]:
+            continue
+        done[u] = 1
+        start_edge, end_edge = offsets[u], offsets[u + 1]
+        ws = weights[start_edge:end_edge] if weights is not None else _ones(end_edge - start_edge)
+        for v, w in zip(targets[start_edge:end_edge], ws):
+            d_v = d_u + w
+            if d_v < dist[v]:
+                dist[v] = d_v
+                parent[v] = u
+                heappush(heap, (d_v, v))
+    return array("d", dist), array("i", parent)
+
+
+def _zero(node):
+    return 0
+
+
+def _ones(count):
+    return repeat(1, count)
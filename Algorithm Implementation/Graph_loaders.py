@@ -0,0 +1,280 @@
+"""Bulk graph loading for the search scripts, instead of typing edges one by one.
+
+Text formats (one entry per line, '#' starts a comment):
+
+    edge list       u v        or   u v w        (whitespace separated, or commas for .csv)
+    heuristics      node h
+
+Files are read in chunks of lines and each chunk is split and interned with C-level
+helpers (str.split, map, array.extend) instead of a Python loop per line.
+The first load of an edge list also writes a binary CSR copy next to it
+(`<file>.csr`, or `<file>.directed.csr`); later loads memory-map that file instead of
+parsing the text again, as long as the text file has not changed and is parsed with the
+same options.
+
+    graph = load_graph("roads.txt", "roads_h.txt")
+    python Graph_loaders.py roads.txt          # build the cache and print a summary
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from itertools import repeat
+
+from Graph_library import Graph, graph_from_arrays
+
+CHUNK_BYTES = 1 << 20  # text read per chunk
+
+MAGIC = b"CSRGRAPH"
+VERSION = 3
+# magic, version, flags, n nodes, m stored edges, source mtime_ns, source size, names bytes,
+# parse options (skip-header flag then delimiter, see _parse_key)
+HEADER = struct.Struct("<8sIIqqqqq16s")
+FLAG_DIRECTED, FLAG_WEIGHTED, FLAG_HEURISTIC, FLAG_BIG_ENDIAN = 1, 2, 4, 8
+
+
+# --- Text formats ---
+
+def _read_chunks(path, skip_header):
+    """Yields (first line number, lines) chunks of about CHUNK_BYTES of text."""
+    with open(path, encoding="utf-8") as f:
+        line_no = 1
+        if skip_header:
+            f.readline()
+            line_no = 2
+        while True:
+            lines = f.readlines(CHUNK_BYTES)
+            if not lines:
+                return
+            yield line_no, lines
+            line_no += len(lines)
+
+
+def _fields(line, delimiter):
+    """Fields of one line: split on the delimiter (each field stripped, so names may hold
+    spaces), or on whitespace when there is none. Empty fields are dropped."""
+    if delimiter:
+        return [field for field in map(str.strip, line.split(delimiter)) if field]
+    return line.split()
+
+
+def _chunk_tokens(path, line_no, lines, delimiter, columns):
+    """Splits a chunk into a flat token list, `columns` tokens per record."""
+    if delimiter:
+        text = delimiter.join(lines)
+        # columns - 1 delimiters on every line (so no blank lines either) and no empty fields
+        if "#" not in text and set(map(str.count, lines, repeat(delimiter))) == {columns - 1}:
+            tokens = list(map(str.strip, text.split(delimiter)))
+            if "" not in tokens:
+                return tokens
+    else:
+        text = "".join(lines)
+        tokens = text.split()
+        # The total alone can hide ragged lines (4 tokens next to a blank line): check every line.
+        if len(tokens) == columns * len(lines) and "#" not in text \
+                and set(map(len, map(str.split, lines))) == {columns}:
+            return tokens
+    # Blank lines, comments or a ragged line somewhere in this chunk: go line by line.
+    tokens = []
+    for i, line in enumerate(lines):
+        parts = _fields(line.split("#", 1)[0], delimiter)
+        if not parts:
+            continue
+        if len(parts) != columns:
+            raise ValueError(f"{path}:{line_no + i}: expected {columns} columns, got {len(parts)}")
+        tokens.extend(parts)
+    return tokens
+
+
+class _Interner(dict):
+    """name -> id dict that hands out the next id on first lookup (ids follow insertion order)."""
+
+    def __missing__(self, name):
+        node = self[name] = len(self)
+        return node
+
+
+def _count_columns(path, delimiter, skip_header):
+    for _, lines in _read_chunks(path, skip_header):
+        for line in lines:
+            parts = _fields(line.split("#", 1)[0], delimiter)
+            if parts:
+                return len(parts)
+    return 2
+
+
+def _default_delimiter(path):
+    return "," if path.lower().endswith(".csv") else None
+
+
+def load_edge_list(path, directed=False, delimiter=None, skip_header=False):
+    """Parses a `u v` / `u v w` edge list into a Graph, interning node names to ids as they appear."""
+    if delimiter is None:
+        delimiter = _default_delimiter(path)
+    columns = _count_columns(path, delimiter, skip_header)
+    if columns not in (2, 3):
+        raise ValueError(f"{path}: expected 2 or 3 columns per edge, got {columns}")
+
+    ids = _Interner()
+    src, dst = array("i"), array("i")
+    weights = array("d") if columns == 3 else None
+    for line_no, lines in _read_chunks(path, skip_header):
+        tokens = _chunk_tokens(path, line_no, lines, delimiter, columns)
+        src.extend(map(ids.__getitem__, tokens[0::columns]))
+        dst.extend(map(ids.__getitem__, tokens[1::columns]))
+        if weights is not None:
+            weights.extend(map(float, tokens[2::columns]))
+    return graph_from_arrays(len(ids), src, dst, weights, list(ids), directed=directed)
+
+
+def load_heuristics(path, graph, delimiter=None):
+    """Reads `node h` lines into graph.heuristic (0 for nodes without a value) and returns it."""
+    if delimiter is None:
+        delimiter = _default_delimiter(path)
+    heuristic = array("d", bytes(8 * graph.n_nodes))
+    ids = graph.ids
+    for line_no, lines in _read_chunks(path, False):
+        tokens = _chunk_tokens(path, line_no, lines, delimiter, 2)
+        for name, h in zip(tokens[0::2], map(float, tokens[1::2])):
+            node = ids.get(name)
+            if node is not None:  # heuristics for nodes without edges are ignored
+                heuristic[node] = h
+    graph.heuristic = heuristic
+    return heuristic
+
+
+# --- Binary CSR format (memory-mapped) ---
+
+def _pad8(n):
+    return (8 - n % 8) % 8
+
+
+def _parse_key(delimiter, skip_header):
+    """How an edge list was parsed, as stored in the cache header (None when it doesn't fit)."""
+    key = (b"1" if skip_header else b"0") + (delimiter or "").encode("utf-8")
+    return key.ljust(16, b"\0") if len(key) <= 16 else None
+
+
+def save_binary(graph, path, source_stat=None, parse_key=b""):
+    """Writes the graph as a binary CSR file that load_binary() can memory-map."""
+    flags = (FLAG_DIRECTED if graph.directed else 0) | (FLAG_WEIGHTED if graph.weights is not None else 0) | \
+            (FLAG_HEURISTIC if graph.heuristic is not None else 0) | \
+            (FLAG_BIG_ENDIAN if sys.byteorder == "big" else 0)
+    names = "\n".join(graph.names).encode("utf-8")
+    mtime, size = (source_stat.st_mtime_ns, source_stat.st_size) if source_stat else (0, 0)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, flags, graph.n_nodes, graph.n_edges, mtime, size, len(names),
+                            parse_key))
+        f.write(b"\0" * _pad8(HEADER.size))
+        f.write(array("q", graph.offsets).tobytes())
+        targets = array("i", graph.targets).tobytes()
+        f.write(targets + b"\0" * _pad8(len(targets)))
+        if graph.weights is not None:
+            f.write(array("d", graph.weights).tobytes())
+        if graph.heuristic is not None:
+            f.write(array("d", graph.heuristic).tobytes())
+        f.write(names)
+    os.replace(tmp_path, path)
+
+
+def read_binary_header(path):
+    with open(path, "rb") as f:
+        fields = HEADER.unpack(f.read(HEADER.size))
+    if fields[0] != MAGIC or fields[1] != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} CSR graph file")
+    return fields
+
+
+def load_binary(path):
+    """Memory-maps a file written by save_binary(). The CSR buffers are views into the map."""
+    _, _, flags, n, m, _, _, names_len, _ = read_binary_header(path)
+    if bool(flags & FLAG_BIG_ENDIAN) != (sys.byteorder == "big"):
+        raise ValueError(f"{path} was written on a machine with a different byte order")
+    with open(path, "rb") as f:
+        view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    pos = HEADER.size + _pad8(HEADER.size)
+
+    def take(typecode, count, itemsize):
+        nonlocal pos
+        buf = view[pos:pos + count * itemsize].cast(typecode)
+        pos += count * itemsize
+        return buf
+
+    offsets = take("q", n + 1, 8)
+    targets = take("i", m, 4)
+    pos += _pad8(4 * m)
+    weights = take("d", m, 8) if flags & FLAG_WEIGHTED else None
+    heuristic = take("d", n, 8) if flags & FLAG_HEURISTIC else None
+    names = bytes(view[pos:pos + names_len]).decode("utf-8").split("\n") if n else []
+    return Graph(names, offsets, targets, weights, heuristic, directed=bool(flags & FLAG_DIRECTED))
+
+
+def cache_path_for(edges_path, directed):
+    return edges_path + (".directed.csr" if directed else ".csr")
+
+
+def load_graph(edges_path, heuristics_path=None, directed=False, delimiter=None, skip_header=False, cache=True):
+    """Loads an edge list (from its binary cache when it is up to date) plus optional heuristics.
+
+    The cache is used only when the text file is unchanged and was parsed with the same
+    delimiter, skip_header and directed options.
+    """
+    graph = None
+    cache_path = cache_path_for(edges_path, directed)
+    stat = os.stat(edges_path)
+    parse_key = _parse_key(delimiter if delimiter is not None else _default_delimiter(edges_path), skip_header)
+    cache = cache and parse_key is not None
+    if cache and os.path.exists(cache_path):
+        try:
+            _, _, flags, _, _, mtime, size, _, key = read_binary_header(cache_path)
+            if (mtime, size, key, bool(flags & FLAG_DIRECTED)) == (stat.st_mtime_ns, stat.st_size, parse_key, directed):
+                graph = load_binary(cache_path)
+        except (ValueError, struct.error, OSError):
+            graph = None  # unreadable or stale cache: rebuild it below
+    if graph is None:
+        graph = load_edge_list(edges_path, directed, delimiter, skip_header)
+        if cache:
+            try:
+                save_binary(graph, cache_path, stat, parse_key)
+            except OSError:
+                pass  # read-only location: just skip the cache
+    if heuristics_path:
+        load_heuristics(heuristics_path, graph, delimiter)
+    return graph
+
+
+# --- Command line helpers for the search scripts ---
+
+def graph_arg_parser(description, directed=False):
+    """Common arguments of the search scripts. Without an edge file they fall back to input()."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("edges", nargs="?", help="edge list file (u v [w] per line); omit to type the graph in")
+    parser.add_argument("--heuristics", help="heuristic file (node h per line)")
+    parser.add_argument("--start", help="start node")
+    parser.add_argument("--goal", help="goal node")
+    parser.add_argument("--directed", dest="directed", action="store_true", default=directed,
+                        help="treat the edge list as directed" + (" (default)" if directed else ""))
+    parser.add_argument("--undirected", dest="directed", action="store_false",
+                        help="treat the edge list as undirected" + ("" if directed else " (default)"))
+    parser.add_argument("--skip-header", action="store_true", help="ignore the first line of the edge file")
+    parser.add_argument("--no-cache", action="store_true", help="don't read or write the binary .csr cache")
+    return parser
+
+
+def graph_from_args(args):
+    return load_graph(args.edges, args.heuristics, args.directed, skip_header=args.skip_header,
+                      cache=not args.no_cache)
+
+
+if __name__ == "__main__":
+    args = graph_arg_parser("Load an edge list, build its binary cache and print a summary.").parse_args()
+    if not args.edges:
+        sys.exit("usage: python Graph_loaders.py EDGES [--heuristics FILE] [--directed]")
+    t = time.perf_counter()
+    graph = graph_from_args(args)
+    print(f"{graph} loaded in {time.perf_counter() - t:.2f}s")
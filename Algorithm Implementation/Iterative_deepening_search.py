@@ -1,43 +1,36 @@
-graph = {}
-nodes = input("Enter nodes (space separated): ").split()
-for node in nodes:
-    neighbors = input(f"Neighbors of {node}: ").split()
-    graph[node] = neighbors
+import sys
+from Graph_library import GraphBuilder, ids
+from Graph_loaders import graph_arg_parser, graph_from_args
 
-start = input("Start node: ")
-goal = input("Goal node: ")
+# Usage: python Iterative_deepening_search.py              (type the graph in)
+#        python Iterative_deepening_search.py edges.txt --start A --goal G
+parser = graph_arg_parser("Iterative deepening search on a directed graph.", directed=True)
+parser.add_argument("--memo", action="store_true", help="skip nodes already reached at no greater depth")
+args = parser.parse_args()
 
-if start == goal:
-    print(f"Path: {start}")
-    exit()  # Exit if start=goal
+if args.edges:
+    graph = graph_from_args(args)
+else:
+    builder = GraphBuilder(directed=True)
+    nodes = input("Enter nodes (space separated): ").split()
+    for node in nodes:
+        builder.add_node(node)
+        neighbors = input(f"Neighbors of {node}: ").split()
+        for neighbor in neighbors:
+            builder.add_edge(node, neighbor)
+    graph = builder.build()
 
-def dls(current, goal, depth, path):
-    new_path = path + [current]
-    
-    if current == goal:
-        return new_path  # Found path!
-        
-    if depth <= 0:
-        return None  # Depth limit reached
-        
-    for neighbor in graph.get(current, []):
-        if neighbor not in new_path:  # Avoid cycles
-            result = dls(neighbor, goal, depth-1, new_path)
-            if result is not None:
-                return result  # Return first path found
-    return None
+start = args.start or input("Start node: ")
+goal = args.goal or input("Goal node: ")
+if start not in graph.ids or goal not in graph.ids:
+    sys.exit("Start and goal must be nodes of the graph.")
 
-max_depth = len(graph)
-path_found = False  # Track if ANY path was found
+# Search deeper and deeper: depth-limited search with limits 0, 1, 2, ... (Graph_library.ids,
+# one explicit stack reused by every iteration)
+result = ids(graph, graph.id(start), graph.id(goal), memo=args.memo)
 
-# Search deeper and deeper
-for depth in range(1, max_depth + 1):
-    result = dls(start, goal, depth, [])
-    if result:
-        print(f"Path at depth {depth}:", " -> ".join(result))
-        path_found = True
-        # Don't exit here! Just break to stop deepening
-        break  # Stop after finding the SHORTEST path
-
-if not path_found:
+if result.found:
+    print(f"Path at depth {result.depth}:", " -> ".join(graph.path_names(result.path)))
+else:
     print(f"No path between {start} and {goal}")
+print("Iterations: {iterations}, nodes expanded: {expanded}, memo skips: {memo_skips}".format(**result.stats))
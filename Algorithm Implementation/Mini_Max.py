@@ -1,30 +1,35 @@
-tree = {}  # Dictionary to store the children of each non-terminal node
-utility = {}  # Dictionary to store the utility value of each terminal node
+import time
 
-n = int(input("Enter number of nodes: "))  # Read the total number of nodes in the tree
-for i in range(n):  # Loop through each node to collect values
-    node = input("Enter node: ")  # Read the name of the current node
-    children = input("Enter children of this node (space separated, or '-' if none): ").split()  # Read the children of the current node
-    if children[0] != "-":  # Check if the node has children
-        tree[node] = children  # Store the children list in the tree dictionary
-    else:  # If the node has no children (terminal node)
-        val = int(input("Enter utility value of this terminal node (-1, 0, 1): "))  # Read the utility value for the terminal node
-        utility[node] = val  # Store the utility value in the utility dictionary
+from Game_tree import GameTreeBuilder, minimax, parallel_minimax, tree_arg_parser, tree_from_args
 
-def minimax(node, is_max):  # Define the minimax function with current node and player turn
-    if node in utility:  # Check if the current node is a terminal node
-        return utility[node]  # Return the stored utility value
-    if is_max:  # If it is the maximizer's turn
-        best = -999999  # Initialize best value to a very low number
-        for child in tree[node]:  # Iterate over each child of the current node
-            best = max(best, minimax(child, False))  # Recursively call minimax for the child (minimizer's turn) and update the best value
-        return best  # Return the best value found
-    else:  # If it is the minimizer's turn
-        best = 999999  # Initialize best value to a very high number
-        for child in tree[node]:  # Iterate over each child of the current node
-            best = min(best, minimax(child, True))  # Recursively call minimax for the child (maximizer's turn) and update the best value
-        return best  # Return the best value found
+# Usage: python Mini_Max.py                       (type the tree in)
+#        python Mini_Max.py tree.txt              ("node child child ..." / "node = utility" lines)
+#        python Mini_Max.py --random 10 6         (random uniform tree: branching 10, depth 6)
+#        python Mini_Max.py --random 10 7 --workers 4   (subtrees evaluated in 4 processes)
+if __name__ == "__main__":  # pool workers may import this file
+    args = tree_arg_parser("Minimax value of a game tree.").parse_args()
 
-start = input("Enter root node: ")  # Read the root node of the tree
-value = minimax(start, True)  # Call minimax starting from the root (maximizer's turn)
-print("Min-Max value of root:", value)  # Print the result
+    if args.tree or args.random:
+        tree = tree_from_args(args)
+    else:
+        builder = GameTreeBuilder()  # Collects the children of each non-terminal node and the utility of each terminal node
+        n = int(input("Enter number of nodes: "))  # Read the total number of nodes in the tree
+        for i in range(n):  # Loop through each node to collect values
+            node = input("Enter node: ")  # Read the name of the current node
+            children = input("Enter children of this node (space separated, or '-' if none): ").split()  # Read the children of the current node
+            if children[0] != "-":  # Check if the node has children
+                builder.add_node(node, children)  # Store the children of the node
+            else:  # If the node has no children (terminal node)
+                val = int(input("Enter utility value of this terminal node (-1, 0, 1): "))  # Read the utility value for the terminal node
+                builder.set_utility(node, val)  # Store the utility value of the node
+        start = input("Enter root node: ")  # Read the root node of the tree
+        tree = builder.build(root=start)  # Array-backed tree: children offsets, leaf utilities, integer node ids
+
+    # Evaluate every node below the root with an explicit stack (Game_tree.minimax), maximizer first
+    t = time.perf_counter()
+    result = parallel_minimax(tree, args.workers) if args.workers > 1 else minimax(tree)
+    elapsed = time.perf_counter() - t
+    print(f"Min-Max value of root: {result.value:g}")
+    if result.move >= 0:
+        print("Best move:", tree.name(result.move))
+    print(f"Nodes visited: {result.stats['visited']}, leaves evaluated: {result.stats['leaves']}, {elapsed:.2f}s")
@@ -0,0 +1,278 @@
+"""Additive pattern databases for the sliding-tile puzzles in Sliding_puzzle.py.
+
+A pattern is a run of consecutive tiles, like 1-5. Its database stores, for every way of
+placing those tiles on the board, how many moves *of those tiles* are needed to bring them
+home, with the other tiles treated as blanks that move for free. Because only the pattern's
+own moves are counted, databases of disjoint patterns can be added: the sum still never
+overestimates, and it is far larger than the Manhattan distance.
+
+A table is indexed by the cells of its pattern tiles, 4 bits each, which is exactly a bit
+slice of Sliding_puzzle's packed state, so a lookup is one shift, one mask and one byte
+read. Tables hold one byte per entry (16**k entries for k tiles: 1 MB for five tiles).
+They are filled by a backward breadth-first search from the goal, vectorized with NumPy
+when it is installed, and saved to a file that later runs memory-map.
+
+    pdb = load_or_build("puzzle15.pdb", 4)      # patterns 1-5, 6-10, 11-15
+    puzzle = SlidingPuzzle(4, pdb)
+
+    python Pattern_database.py --size 4 --out puzzle15.pdb --compare 5
+"""
+import argparse
+import mmap
+import os
+import struct
+import time
+from array import array
+from collections import deque
+
+try:
+    import numpy as np  # optional: builds the 15-puzzle tables in seconds instead of minutes
+except ImportError:
+    np = None
+
+MAGIC = b"TILEPDB1"
+HEADER = struct.Struct("<8sII")  # magic, puzzle size, number of patterns
+GROUP = struct.Struct("<II")     # first and last tile of a pattern
+UNSEEN = 255
+
+DEFAULT_GROUPS = {
+    2: [(1, 3)],
+    3: [(1, 4), (5, 8)],
+    4: [(1, 5), (6, 10), (11, 15)],
+}
+
+
+class PatternDatabase:
+    """Disjoint additive pattern databases for one puzzle size; h(state) sums their lookups."""
+
+    def __init__(self, size, groups, tables):
+        self.size = size
+        self.groups = [tuple(g) for g in groups]
+        self.tables = tables
+        # tile_groups[tile] = (table, shift, mask) of the pattern holding that tile
+        no_pattern = (bytes(1), 0, 0)
+        self.tile_groups = [no_pattern] * (size * size)
+        self.slices = []
+        for (lo, hi), table in zip(self.groups, tables):
+            entry = (table, 4 * lo, (1 << (4 * (hi - lo + 1))) - 1)
+            self.slices.append(entry)
+            for tile in range(lo, hi + 1):
+                self.tile_groups[tile] = entry
+
+    def h(self, state):
+        """Sum of the pattern lookups for a Sliding_puzzle state."""
+        total = 0
+        for table, shift, mask in self.slices:
+            total += table[(state >> shift) & mask]
+        return total
+
+    def lookup(self, pattern, index):
+        """Moves of pattern number `pattern` needed from placement `index` (cells, 4 bits per tile)."""
+        return self.tables[pattern][index]
+
+    def save(self, path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.size, len(self.groups)))
+            for lo, hi in self.groups:
+                f.write(GROUP.pack(lo, hi))
+            for table in self.tables:
+                f.write(bytes(table))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-maps a file written by save(); the tables are read-only views into the map."""
+        with open(path, "rb") as f:
+            view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        magic, size, count = HEADER.unpack(view[:HEADER.size])
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a pattern database file")
+        pos = HEADER.size
+        groups = []
+        for _ in range(count):
+            groups.append(GROUP.unpack(view[pos:pos + GROUP.size]))
+            pos += GROUP.size
+        tables = []
+        for lo, hi in groups:
+            length = 16 ** (hi - lo + 1)
+            tables.append(view[pos:pos + length])
+            pos += length
+        return cls(size, groups, tables)
+
+    def __repr__(self):
+        patterns = ", ".join(f"{lo}-{hi}" for lo, hi in self.groups)
+        return f"<PatternDatabase {self.size}x{self.size}, patterns {patterns}>"
+
+
+# --- Building ---
+
+def _neighbors(size):
+    """neighbors[cell]: cells the blank can move to from `cell`."""
+    out = []
+    for cell in range(size * size):
+        r, c = divmod(cell, size)
+        out.append([(r + dr) * size + c + dc for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1))
+                    if 0 <= r + dr < size and 0 <= c + dc < size])
+    return out
+
+
+def _goal_code(size, lo, hi):
+    """Search-state code of the goal: blank cell in the low 4 bits, then tiles lo..hi."""
+    code = size * size - 1
+    for slot, tile in enumerate(range(lo, hi + 1)):
+        code |= (tile - 1) << (4 * slot + 4)
+    return code
+
+
+def build_table(size, lo, hi):
+    """Moves of tiles lo..hi (only) from every placement to the goal, as array('B').
+
+    The search runs over (blank cell, pattern cells) states, 16**(k + 1) codes for k
+    tiles: the blank moving through a non-pattern cell is free, sliding a pattern tile
+    costs 1 (a 0-1 breadth-first search). Each placement then keeps its cheapest blank cell.
+    """
+    if np is not None:
+        dist = _search_numpy(size, lo, hi)
+        table = dist.reshape(-1, 16).min(axis=1)
+        return array("B", table.tobytes())
+    dist = _search_python(size, lo, hi)
+    table = array("B", [UNSEEN]) * (len(dist) // 16)
+    for index in range(len(table)):
+        table[index] = min(dist[16 * index:16 * index + 16])
+    return table
+
+
+def _search_python(size, lo, hi):
+    k = hi - lo + 1
+    neighbors = _neighbors(size)
+    shifts = [4 * slot + 4 for slot in range(k)]
+    dist = bytearray([UNSEEN]) * (16 ** (k + 1))
+    goal = _goal_code(size, lo, hi)
+    dist[goal] = 0
+    queue = deque([goal])
+    while queue:
+        code = queue.popleft()
+        d = dist[code]
+        blank = code & 15
+        for cell in neighbors[blank]:
+            for shift in shifts:
+                if (code >> shift) & 15 == cell:  # a pattern tile slides into the blank: costs 1
+                    child = code - blank + cell + ((blank - cell) << shift)
+                    if dist[child] > d + 1:
+                        dist[child] = d + 1
+                        queue.append(child)
+                    break
+            else:  # the blank swaps with a non-pattern tile: free
+                child = code - blank + cell
+                if dist[child] > d:
+                    dist[child] = d
+                    queue.appendleft(child)
+    return dist
+
+
+def _search_numpy(size, lo, hi):
+    k = hi - lo + 1
+    # moves[d][cell]: cell the blank reaches in direction d, or -1
+    moves = np.full((4, 16), -1, dtype=np.int64)
+    for cell, targets in enumerate(_neighbors(size)):
+        for d, target in enumerate(targets):
+            moves[d, cell] = target
+    shifts = [4 * slot + 4 for slot in range(k)]
+    dist = np.full(16 ** (k + 1), UNSEEN, dtype=np.uint8)
+    goal = _goal_code(size, lo, hi)
+    dist[goal] = 0
+    frontier = np.array([goal], dtype=np.int64)
+    cost = 0
+    while frontier.size:
+        # Everything reachable at the same cost: the blank wandering through free cells.
+        layer = [frontier]
+        current = frontier
+        while current.size:
+            found = []
+            for d in range(4):
+                codes, blank, target = _moves(current, moves[d])
+                free = np.ones(codes.size, dtype=bool)
+                for shift in shifts:
+                    free &= ((codes >> shift) & 15) != target
+                children = np.unique(codes[free] - blank[free] + target[free])
+                children = children[dist[children] == UNSEEN]
+                dist[children] = cost
+                found.append(children)
+            current = np.concatenate(found)
+            layer.append(current)
+        level = np.concatenate(layer)
+        # One pattern tile slides: the next cost level.
+        found = []
+        for d in range(4):
+            codes, blank, target = _moves(level, moves[d])
+            for shift in shifts:
+                hit = ((codes >> shift) & 15) == target
+                children = codes[hit] - blank[hit] + target[hit] + ((blank[hit] - target[hit]) << shift)
+                found.append(children)
+        frontier = np.unique(np.concatenate(found))
+        frontier = frontier[dist[frontier] == UNSEEN]
+        cost += 1
+        dist[frontier] = cost
+    return dist
+
+
+def _moves(codes, direction):
+    blank = codes & 15
+    target = direction[blank]
+    legal = target >= 0
+    return codes[legal], blank[legal], target[legal]
+
+
+def build(size, groups=None):
+    groups = groups or DEFAULT_GROUPS[size]
+    covered = [t for lo, hi in groups for t in range(lo, hi + 1)]
+    if len(covered) != len(set(covered)) or not all(1 <= t < size * size for t in covered):
+        raise ValueError("patterns must be disjoint runs of tiles 1..n-1")
+    return PatternDatabase(size, groups, [build_table(size, lo, hi) for lo, hi in groups])
+
+
+def load_or_build(path, size, groups=None):
+    """Loads the database at path, or builds it (and saves it there) when the file is missing."""
+    if os.path.exists(path):
+        pdb = PatternDatabase.load(path)
+        if pdb.size != size or (groups and pdb.groups != [tuple(g) for g in groups]):
+            raise ValueError(f"{path} holds {pdb}, not the requested patterns")
+        return pdb
+    pdb = build(size, groups)
+    pdb.save(path)
+    return pdb
+
+
+def compare(pdb, count, moves, seed=0):
+    """IDA* with Manhattan distance vs the pattern database on random scrambles."""
+    from Sliding_puzzle import SlidingPuzzle
+    from State_space_search import ida_star
+
+    manhattan, patterns = SlidingPuzzle(pdb.size), SlidingPuzzle(pdb.size, pdb)
+    for i in range(count):
+        start = manhattan.random_state(moves, seed + i)
+        line = []
+        for name, puzzle in (("manhattan", manhattan), ("pdb", patterns)):
+            t = time.perf_counter()
+            result = ida_star(puzzle, start)
+            line.append(f"{name}: h={puzzle.h(start)} expanded={result.stats['expanded']} "
+                        f"{time.perf_counter() - t:.2f}s")
+        print(f"#{i} {result.cost} moves | " + " | ".join(line))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build additive pattern databases for the sliding puzzle.")
+    parser.add_argument("--size", type=int, default=4, help="board width (3 = 8-puzzle, 4 = 15-puzzle)")
+    parser.add_argument("--out", help="database file (default: puzzle<N>.pdb)")
+    parser.add_argument("--compare", type=int, default=0, metavar="N",
+                        help="solve N random scrambles with Manhattan distance and with the database")
+    parser.add_argument("--moves", type=int, default=50, help="length of the random scrambles")
+    args = parser.parse_args()
+
+    path = args.out or f"puzzle{args.size * args.size - 1}.pdb"
+    t = time.perf_counter()
+    pdb = load_or_build(path, args.size)
+    print(f"{pdb} ready in {time.perf_counter() - t:.2f}s ({path})")
+    if args.compare:
+        compare(pdb, args.compare, args.moves)
@@ -0,0 +1,248 @@
+"""Long-lived shortest-path query service: load a graph once, answer many queries.
+
+    service = ShortestPathService(graph)
+    results = service.batch([("A", "B", "astar"), ("A", "C", "astar"), ("D", "B", "alt")])
+    print(service.last_report)
+
+Queries are (start, goal, algorithm) triples using node names. Answers are cached in an
+LRU keyed by the query. Within a batch, optimal algorithms that share a start node are
+answered from one shortest-path tree rooted at that start (kept in a second, smaller
+LRU), so a batch of k goals from the same source costs a single Dijkstra run. A query
+naming an unknown node or algorithm gets a not-found result with stats["error"] set;
+the rest of the batch is answered as usual.
+
+Command line (one "start goal [algorithm]" query per line, from a file or typed in):
+
+    python Shortest_path_service.py roads.txt --queries queries.txt
+    python Shortest_path_service.py roads.txt            # type queries, empty line to quit
+"""
+import sys
+import time
+from collections import OrderedDict
+
+from Graph_library import (SearchResult, astar, beam_search, best_first_search, bfs_tree, bidirectional_search,
+                           dijkstra_tree, ids, _zero)
+from Bidirectional_astar import Landmarks, alt_query, bidirectional_astar
+from Contraction_hierarchy import ContractionHierarchy
+from Graph_loaders import graph_arg_parser, graph_from_args
+
+# Algorithms whose answer is a shortest path, so any shortest-path tree can answer them.
+# (bfs / bidirectional_search / ids give fewest-hop paths, which only match on unweighted graphs.)
+OPTIMAL = {"dijkstra", "astar", "bidirectional_astar", "alt", "ch"}
+UNWEIGHTED_OPTIMAL = {"bfs", "bidirectional", "ids"}
+ALGORITHMS = OPTIMAL | UNWEIGHTED_OPTIMAL | {"best_first", "beam"}
+
+
+class LRUCache:
+    """Small least-recently-used cache on top of OrderedDict."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.data = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.data.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        if self.capacity <= 0:
+            return
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.capacity:
+            self.data.popitem(last=False)
+
+
+class ShortestPathService:
+    """Answers (start, goal, algorithm) queries on one graph with result and tree caching."""
+
+    def __init__(self, graph, cache_size=10000, tree_cache_size=32, landmarks=None, beam_width=4, hierarchy=None):
+        self.graph = graph
+        self.results = LRUCache(cache_size)
+        self.trees = LRUCache(tree_cache_size)  # start node -> (dist, parent) of its Dijkstra tree
+        self.landmarks = landmarks
+        self.hierarchy = hierarchy  # ContractionHierarchy, built on the first "ch" query
+        self.beam_width = beam_width
+        self.trees_built = 0
+        self.tree_answers = 0
+        self.last_report = None
+
+    # --- single queries ---
+
+    def _run(self, algorithm, s, t):
+        graph = self.graph
+        if algorithm == "dijkstra":
+            return astar(graph, s, t, heuristic=_zero)
+        if algorithm == "astar":
+            return astar(graph, s, t)
+        if algorithm == "bidirectional_astar":
+            return bidirectional_astar(graph, s, t)
+        if algorithm == "alt":
+            if self.landmarks is None:
+                self.landmarks = Landmarks.build(graph)
+            return alt_query(graph, self.landmarks, s, t)
+        if algorithm == "ch":
+            if self.hierarchy is None:
+                self.hierarchy = ContractionHierarchy.build(graph)
+            return self.hierarchy.query(s, t)
+        if algorithm == "bfs":
+            tree = bfs_tree(graph, s)
+            path = tree.path_to(t)
+            return SearchResult(path, len(path) - 1, stats=tree.stats) if path else SearchResult(stats=tree.stats)
+        if algorithm == "bidirectional":
+            return bidirectional_search(graph, s, t)
+        if algorithm == "ids":
+            return ids(graph, s, t)
+        if algorithm == "best_first":
+            return best_first_search(graph, s, t)
+        if algorithm == "beam":
+            return beam_search(graph, s, t, self.beam_width)
+        raise ValueError(f"unknown algorithm {algorithm!r}")
+
+    def _tree_answers(self, algorithm):
+        return algorithm in OPTIMAL or (algorithm in UNWEIGHTED_OPTIMAL and self.graph.weights is None)
+
+    def _from_tree(self, tree, s, t):
+        dist, parent = tree
+        self.tree_answers += 1
+        if dist[t] == float("inf"):
+            return SearchResult(stats={"from_tree": True})
+        # hop counts are ints, as the searches on an unweighted graph return them
+        cost = dist[t] if self.graph.weights is not None else int(dist[t])
+        path = []
+        node = t
+        while node != -1:
+            path.append(node)
+            node = parent[node]
+        path.reverse()
+        return SearchResult(path, cost, stats={"from_tree": True})
+
+    def _tree(self, s, build=True):
+        tree = self.trees.get(s)
+        if tree is None and build:
+            tree = dijkstra_tree(self.graph, s)
+            self.trees_built += 1
+            self.trees.put(s, tree)
+        return tree
+
+    def _error(self, start, goal, algorithm):
+        """Why a query can't be answered, or None."""
+        if start not in self.graph.ids or goal not in self.graph.ids:
+            return "unknown node"
+        if algorithm not in ALGORITHMS:
+            return "unknown algorithm"
+        return None
+
+    def query(self, start, goal, algorithm="astar"):
+        """Answers one query (node names). Uses a cached result or search tree when there is one."""
+        key = (start, goal, algorithm)
+        result = self.results.get(key)
+        if result is not None:
+            return result
+        error = self._error(start, goal, algorithm)
+        if error:
+            return SearchResult(stats={"error": error})
+        s, t = self.graph.id(start), self.graph.id(goal)
+        tree = self._tree(s, build=False) if self._tree_answers(algorithm) else None
+        result = self._from_tree(tree, s, t) if tree is not None else self._run(algorithm, s, t)
+        self.results.put(key, result)
+        return result
+
+    # --- batches ---
+
+    def batch(self, queries, tree_threshold=2):
+        """Answers a list of (start, goal[, algorithm]) queries; results come back in order.
+
+        Starts with at least `tree_threshold` uncached tree-answerable queries get one
+        shortest-path tree each. A throughput/latency report is left in self.last_report.
+        """
+        queries = [(q[0], q[1], q[2] if len(q) > 2 else "astar") for q in queries]
+        hits_before, trees_before = self.results.hits, self.trees_built
+        tree_answers_before = self.tree_answers
+
+        per_start = {}
+        for start, goal, algorithm in queries:
+            if (self._tree_answers(algorithm) and (start, goal, algorithm) not in self.results.data
+                    and not self._error(start, goal, algorithm)):
+                per_start.setdefault(start, set()).add(goal)
+
+        results = []
+        latencies = []
+        t_batch = time.perf_counter()
+        for start, goal, algorithm in queries:
+            t0 = time.perf_counter()
+            if len(per_start.get(start, ())) >= tree_threshold and self._tree_answers(algorithm):
+                self._tree(self.graph.id(start))
+            results.append(self.query(start, goal, algorithm))
+            latencies.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - t_batch
+
+        ordered = sorted(latencies)
+        pick = lambda q: ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000 if ordered else 0
+        self.last_report = {
+            "queries": len(queries),
+            "seconds": round(elapsed, 6),
+            "queries_per_sec": round(len(queries) / elapsed, 1) if elapsed > 0 else None,
+            "p50_ms": round(pick(0.50), 3),
+            "p95_ms": round(pick(0.95), 3),
+            "max_ms": round(ordered[-1] * 1000, 3) if ordered else 0,
+            "cache_hits": self.results.hits - hits_before,
+            "trees_built": self.trees_built - trees_before,
+            "tree_answers": self.tree_answers - tree_answers_before,
+        }
+        return results
+
+
+def read_queries(lines):
+    queries = []
+    for line in lines:
+        parts = line.split("#", 1)[0].split()
+        if parts:
+            queries.append(tuple(parts[:3]))
+    return queries
+
+
+def print_answers(graph, queries, results):
+    for (start, goal, *_), result in zip(queries, results):
+        if "error" in result.stats:
+            print(f"{start} {goal} {result.stats['error']}")
+        elif result.found:
+            print(f"{start} {goal} {result.cost:g} {' -> '.join(graph.path_names(result.path))}")
+        else:
+            print(f"{start} {goal} unreachable")
+
+
+if __name__ == "__main__":
+    parser = graph_arg_parser("Answer batches of shortest-path queries on one graph.")
+    parser.add_argument("--queries", help="file with one 'start goal [algorithm]' query per line")
+    parser.add_argument("--algorithm", default="astar", help="default algorithm for queries that don't name one")
+    parser.add_argument("--cache-size", type=int, default=10000)
+    parser.add_argument("--ch", help="contraction hierarchy file for 'ch' queries (Contraction_hierarchy.py)")
+    args = parser.parse_args()
+    if not args.edges:
+        sys.exit("usage: python Shortest_path_service.py EDGES [--queries FILE]")
+    graph = graph_from_args(args)
+    hierarchy = ContractionHierarchy.load(args.ch) if args.ch else None
+    if hierarchy is not None and hierarchy.names != graph.names:
+        sys.exit(f"{args.ch} was built for another graph; rebuild it with Contraction_hierarchy.py")
+    service = ShortestPathService(graph, cache_size=args.cache_size, hierarchy=hierarchy)
+
+    if args.queries:
+        with open(args.queries, encoding="utf-8") as f:
+            queries = [q if len(q) > 2 else (*q, args.algorithm) for q in read_queries(f)]
+        print_answers(graph, queries, service.batch(queries))
+        print(service.last_report, file=sys.stderr)
+    else:
+        while True:
+            line = input("Query (start goal [algorithm]): ")
+            if not line.strip():
+                break
+            queries = [q if len(q) > 2 else (*q, args.algorithm) for q in read_queries([line])]
+            print_answers(graph, queries, service.batch(queries))
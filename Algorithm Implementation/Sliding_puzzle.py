@@ -0,0 +1,180 @@
+"""8-puzzle / 15-puzzle as an implicit state space for State_space_search.py.
+
+A board is packed into one int holding both directions of the tile <-> cell map, 4 bits
+per entry: the low half gives each tile's cell (tile t at bits 4t .. 4t + 3, the blank
+being tile 0, so state & 15 is the blank's cell) and the high half gives each cell's tile.
+A move is a few shifts and adds on that int. The Manhattan distance is updated from a
+precomputed table for the one tile that moved instead of being recomputed over the whole
+board, and pattern-database indexes (Pattern_database.py) are bit slices of the low half.
+
+    python Sliding_puzzle.py 1 2 3 4 0 6 7 5 8                  # tiles row by row, 0 = blank
+    python Sliding_puzzle.py --size 4 --random 50 --algorithm rbfs
+    python Sliding_puzzle.py --size 4 --random 80 --pdb puzzle15.pdb
+    python Sliding_puzzle.py                                     # type the board in
+"""
+import argparse
+import random
+import sys
+import time
+
+from State_space_search import StateSpace, ida_star, rbfs, sma_star
+from Pattern_database import load_or_build
+
+ALGORITHMS = {"ida": ida_star, "rbfs": rbfs, "sma": sma_star}
+
+
+class SlidingPuzzle(StateSpace):
+    """size x size sliding-tile puzzle; the goal is 1, 2, ..., n-1 with the blank last.
+
+    The heuristic is the Manhattan distance, or the additive pattern database `pdb`.
+    """
+
+    def __init__(self, size=3, pdb=None):
+        if not 2 <= size <= 4:
+            raise ValueError("sizes 2 to 4 fit in 4 bits per cell")
+        if pdb is not None and pdb.size != size:
+            raise ValueError(f"pattern database is for size {pdb.size}, not {size}")
+        self.size = size
+        self.pdb = pdb
+        cells = self.cells = size * size
+        board = self.board_shift = 4 * cells  # where the cell -> tile half starts
+        goal_cell = [cells - 1] + list(range(cells - 1))  # goal_cell[tile]; tile 0 is the blank
+        # distance[tile * cells + cell]: Manhattan distance of `tile` standing on `cell`
+        self.distance = [0] * (cells * cells)
+        for tile in range(1, cells):
+            gr, gc = divmod(goal_cell[tile], size)
+            for cell in range(cells):
+                r, c = divmod(cell, size)
+                self.distance[tile * cells + cell] = abs(r - gr) + abs(c - gc)
+        # moves[blank]: (cell the blank moves to, its bit shift) for each legal move
+        self.moves = []
+        for blank in range(cells):
+            r, c = divmod(blank, size)
+            targets = []
+            for dr, dc in ((-1, 0), (1, 0), (0, -1), (0, 1)):
+                if 0 <= r + dr < size and 0 <= c + dc < size:
+                    cell = (r + dr) * size + c + dc
+                    targets.append((cell, board + 4 * cell))
+            self.moves.append(targets)
+        self.goal = self.pack(list(range(1, cells)) + [0])
+
+    # --- packed boards ---
+
+    def pack(self, tiles):
+        if sorted(tiles) != list(range(self.cells)):
+            raise ValueError(f"a {self.size}x{self.size} board needs each of 0..{self.cells - 1} once")
+        state = 0
+        for cell, tile in enumerate(tiles):
+            state |= (tile << (self.board_shift + 4 * cell)) | (cell << (4 * tile))
+        return state
+
+    def unpack(self, state):
+        board = state >> self.board_shift
+        return [(board >> (4 * cell)) & 15 for cell in range(self.cells)]
+
+    def is_solvable(self, tiles):
+        """Standard inversion-parity test (the blank's row counts on even widths)."""
+        order = [t for t in tiles if t]
+        inversions = sum(1 for i in range(len(order)) for j in range(i + 1, len(order)) if order[i] > order[j])
+        if self.size % 2:
+            return inversions % 2 == 0
+        blank_row_from_bottom = self.size - tiles.index(0) // self.size
+        return (inversions + blank_row_from_bottom) % 2 == 1
+
+    # --- StateSpace ---
+
+    def h(self, state):
+        if self.pdb is not None:
+            return self.pdb.h(state)
+        cells, distance = self.cells, self.distance
+        return sum(distance[tile * cells + ((state >> (4 * tile)) & 15)] for tile in range(1, cells))
+
+    def is_goal(self, state):
+        return state == self.goal
+
+    def successors(self, state):
+        return [(child, 1) for child, _, _ in self.expand(state, 0)]
+
+    def expand(self, state, h):
+        blank = state & 15
+        blank_shift = self.board_shift + 4 * blank
+        cells, distance = self.cells, self.distance
+        groups = self.pdb.tile_groups if self.pdb is not None else None
+        out = []
+        for cell, shift in self.moves[blank]:
+            tile = (state >> shift) & 15
+            # board: tile moves from `cell` to the blank's cell; positions: tile and blank swap cells
+            child = state - (tile << shift) + (tile << blank_shift) + ((blank - cell) << (4 * tile)) + cell - blank
+            if groups is None:
+                out.append((child, 1, h + distance[tile * cells + blank] - distance[tile * cells + cell]))
+            else:
+                table, group_shift, mask = groups[tile]
+                out.append((child, 1, h - table[(state >> group_shift) & mask] + table[(child >> group_shift) & mask]))
+        return out
+
+    # --- helpers ---
+
+    def moved_tiles(self, path):
+        """Tile slid at each step of a path of states."""
+        return [(a >> (self.board_shift + 4 * (b & 15))) & 15 for a, b in zip(path, path[1:])]
+
+    def random_state(self, moves, seed=None):
+        """Board reached by `moves` random moves from the goal (never undoing the last one)."""
+        rng = random.Random(seed)
+        state, previous = self.goal, None
+        for _ in range(moves):
+            options = [child for child, _, _ in self.expand(state, 0) if child != previous]
+            previous, state = state, rng.choice(options)
+        return state
+
+    def format(self, state):
+        width = len(str(self.cells - 1))
+        tiles = self.unpack(state)
+        rows = []
+        for r in range(self.size):
+            row = tiles[r * self.size:(r + 1) * self.size]
+            rows.append(" ".join(str(t).rjust(width) if t else "_".rjust(width) for t in row))
+        return "\n".join(rows)
+
+
+def solve(puzzle, state, algorithm="ida", max_nodes=100000):
+    search = ALGORITHMS[algorithm]
+    if algorithm == "sma":
+        return search(puzzle, state, max_nodes)
+    return search(puzzle, state)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve the 8-puzzle or 15-puzzle optimally.")
+    parser.add_argument("tiles", nargs="*", type=int, help="tiles row by row, 0 for the blank")
+    parser.add_argument("--size", type=int, help="board width (default: from the tiles, or 3)")
+    parser.add_argument("--random", type=int, metavar="MOVES", help="scramble the goal with MOVES random moves")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--algorithm", choices=sorted(ALGORITHMS), default="ida")
+    parser.add_argument("--max-nodes", type=int, default=100000, help="memory bound for sma")
+    parser.add_argument("--pdb", metavar="FILE", help="use this pattern database (built and saved if missing)")
+    args = parser.parse_args()
+
+    tiles = None
+    if args.random is None:
+        tiles = args.tiles or [int(t) for t in input("Enter the tiles row by row (0 = blank): ").split()]
+    size = args.size or (round(len(tiles) ** 0.5) if tiles else 3)
+    puzzle = SlidingPuzzle(size, load_or_build(args.pdb, size) if args.pdb else None)
+    if tiles is None:
+        start = puzzle.random_state(args.random, args.seed)
+    else:
+        start = puzzle.pack(tiles)
+        if not puzzle.is_solvable(tiles):
+            sys.exit("This board can't reach the goal.")
+
+    print(puzzle.format(start))
+    print(f"{'Pattern database' if args.pdb else 'Manhattan distance'}: {puzzle.h(start)}")
+    t = time.perf_counter()
+    result = solve(puzzle, start, args.algorithm, args.max_nodes)
+    elapsed = time.perf_counter() - t
+    if result.found:
+        print(f"Solved in {result.cost} moves, sliding tiles:", " ".join(map(str, puzzle.moved_tiles(result.path))))
+    else:
+        print("No solution found")
+    stats = {k: v for k, v in result.stats.items() if k != "bounds"}
+    print(f"{args.algorithm}: {stats}, {elapsed:.2f}s")
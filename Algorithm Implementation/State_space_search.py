@@ -0,0 +1,322 @@
+"""Informed search on implicit state spaces, with memory that doesn't grow with the open list.
+
+Astar.py and Best_First_Search.py need the whole graph up front and keep every generated
+node. Puzzles like the 15-puzzle have too many states for that, so here the caller
+describes the space with a StateSpace: a successor function, a heuristic and a goal test.
+States can be anything hashable (Sliding_puzzle.py packs boards into ints).
+
+    ida_star(space, start)                 memory O(depth): iterative deepening on f = g + h
+    rbfs(space, start)                     memory O(depth * branching): recursive best-first
+    sma_star(space, start, max_nodes)      A* that forgets its worst leaves at max_nodes
+
+All three are optimal with an admissible heuristic and return a Graph_library.SearchResult
+whose path is the list of states from start to goal.
+"""
+import heapq
+from abc import ABC, abstractmethod
+from itertools import count
+
+from Graph_library import INF, SearchResult
+
+
+class StateSpace(ABC):
+    """Implicit search space. Subclass it (successors and is_goal are abstract, so a
+    subclass missing one fails when it is created), or build one from plain functions
+    with StateSpace.from_functions.
+
+    successors(state) yields (next_state, step_cost) pairs, heuristic(state) estimates the
+    remaining cost and is_goal(state) tests for the goal. Spaces that can update the
+    heuristic per move (like the sliding puzzle's Manhattan distance) override expand().
+    """
+
+    @classmethod
+    def from_functions(cls, successors, is_goal, heuristic=None):
+        return _FunctionSpace(successors, is_goal, heuristic)
+
+    @abstractmethod
+    def successors(self, state):
+        """(next_state, step_cost) pairs of state."""
+
+    def h(self, state):
+        return 0
+
+    @abstractmethod
+    def is_goal(self, state):
+        """True when state is a goal."""
+
+    def expand(self, state, h):
+        """(next_state, step_cost, next_h) for every successor; h is the heuristic of state."""
+        return [(s, cost, self.h(s)) for s, cost in self.successors(state)]
+
+
+class _FunctionSpace(StateSpace):
+    """StateSpace from a successor function, a goal test and an optional heuristic."""
+
+    def __init__(self, successors, is_goal, heuristic=None):
+        self._successors = successors
+        self._is_goal = is_goal
+        if heuristic is not None:
+            self.h = heuristic
+
+    def successors(self, state):
+        return self._successors(state)
+
+    def is_goal(self, state):
+        return self._is_goal(state)
+
+
+# --- IDA* ---
+
+def ida_star(space, start, max_cost=INF):
+    """Iterative deepening A*: depth-first passes bounded by f = g + h, raising the bound each pass.
+
+    Runs on an explicit stack of child iterators, so the only memory used is the current
+    path (plus an on-path set to skip cycles).
+    """
+    h0 = space.h(start)
+    stats = {"iterations": 0, "expanded": 0, "generated": 0, "bounds": []}
+    if space.is_goal(start):
+        return SearchResult([start], 0, stats=stats)
+    bound = h0
+    while bound <= max_cost:
+        stats["iterations"] += 1
+        stats["bounds"].append(bound)
+        next_bound = INF
+        path = [start]
+        on_path = {start}
+        g_stack = [0]
+        children = [iter(space.expand(start, h0))]
+        expanded, generated = 1, 0
+        while children:
+            child = next(children[-1], None)
+            if child is None:
+                children.pop()
+                g_stack.pop()
+                on_path.discard(path.pop())
+                continue
+            state, cost, h = child
+            generated += 1
+            g = g_stack[-1] + cost
+            f = g + h
+            if f > bound:
+                if f < next_bound:
+                    next_bound = f
+                continue
+            if state in on_path:
+                continue
+            path.append(state)
+            if space.is_goal(state):
+                stats["expanded"] += expanded
+                stats["generated"] += generated
+                return SearchResult(path, g, stats=stats)
+            on_path.add(state)
+            g_stack.append(g)
+            children.append(iter(space.expand(state, h)))
+            expanded += 1
+        stats["expanded"] += expanded
+        stats["generated"] += generated
+        if next_bound == INF:
+            break  # nothing was pruned: the whole space was searched
+        bound = next_bound
+    return SearchResult(stats=stats)
+
+
+# --- RBFS ---
+
+def rbfs(space, start, max_cost=INF):
+    """Recursive best-first search (Korf): best-first order in linear memory.
+
+    Each frame on the path keeps its children with backed-up f values; a subtree is
+    abandoned (and its best f remembered) once its f exceeds the best alternative above
+    it. Frames live on an explicit stack rather than Python's call stack.
+    """
+    stats = {"expanded": 0, "generated": 0, "max_depth": 0}
+    # frame: [state, g, h, backed-up F, f limit, children or None, best child index]
+    # child: [F, g, h, state]
+    h0 = space.h(start)
+    frames = [[start, 0, h0, h0, max_cost, None, -1]]
+    on_path = {start}
+    returned = None
+    while frames:
+        frame = frames[-1]
+        state, g, h, F, limit, children, best = frame
+        if returned is not None:  # a child frame just gave up; remember its backed-up f
+            children[best][0] = returned
+            returned = None
+        if children is None:
+            if space.is_goal(state):
+                return SearchResult([fr[0] for fr in frames], g, stats=stats)
+            stats["expanded"] += 1
+            children = frame[5] = []
+            for child, cost, child_h in space.expand(state, h):
+                stats["generated"] += 1
+                if child in on_path:
+                    continue
+                child_g = g + cost
+                child_f = child_g + child_h
+                # A parent whose F was backed up above its own f passes that bound down.
+                children.append([max(F, child_f) if g + h < F else child_f, child_g, child_h, child])
+        if not children:
+            returned = INF
+        else:
+            best = min(range(len(children)), key=lambda i: children[i][0])
+            best_f = children[best][0]
+            if best_f <= limit and best_f < INF:  # INF backed up means no goal below
+                alternative = min((c[0] for i, c in enumerate(children) if i != best), default=INF)
+                frame[6] = best
+                child_F, child_g, child_h, child = children[best]
+                frames.append([child, child_g, child_h, child_F, min(limit, alternative), None, -1])
+                on_path.add(child)
+                stats["max_depth"] = max(stats["max_depth"], len(frames) - 1)
+                continue
+            returned = best_f
+        on_path.discard(state)
+        frames.pop()
+    return SearchResult(stats=stats)
+
+
+# --- SMA* ---
+
+class _Node:
+    __slots__ = ("state", "g", "h", "f", "parent", "depth", "live", "forgotten", "alive")
+
+    def __init__(self, state, g, h, f, parent, depth):
+        self.state = state
+        self.g = g
+        self.h = h
+        self.f = f
+        self.parent = parent
+        self.depth = depth
+        self.live = None         # states of the children in memory; None until expanded
+        self.forgotten = None    # state -> f of children dropped to save memory
+        self.alive = True
+
+    def open_key(self):
+        """f of a leaf; for an expanded node, the lowest f among its dropped children."""
+        if self.live is None:
+            return self.f
+        return min(self.forgotten.values()) if self.forgotten else INF
+
+    def on_path(self, state):
+        node = self
+        while node is not None:
+            if node.state == state:
+                return True
+            node = node.parent
+        return False
+
+
+def sma_star(space, start, max_nodes=100000):
+    """Simplified memory-bounded A*: keeps about max_nodes nodes in memory.
+
+    When memory is full the shallowest leaf with the highest f is dropped and its parent
+    remembers that f. The parent goes back on the open list under its lowest remembered
+    f, so a dropped child is regenerated (with its remembered f) once it would have been
+    the best choice again; a parent left with no children in memory becomes a plain leaf.
+    A node's children are added before the worst leaves are dropped, so the count can pass
+    max_nodes by a few. Nodes too deep to fit are not generated. Optimal as long as the optimal
+    path fits in max_nodes.
+    """
+    stats = {"expanded": 0, "generated": 0, "forgotten": 0, "peak_nodes": 1}
+    tick = count()
+    h0 = space.h(start)
+    root = _Node(start, 0, h0, h0, None, 0)
+    best_heap = [(root.f, 0, next(tick), root)]  # lowest f first, deeper first on ties
+    worst_heap = []                              # leaves: highest f first, shallower first on ties
+    in_memory = 1
+
+    def push(node):
+        key = node.open_key()
+        if key == INF:
+            return
+        seq = next(tick)
+        heapq.heappush(best_heap, (key, -node.depth, seq, node))
+        if node.live is None and node.parent is not None:
+            heapq.heappush(worst_heap, (-key, node.depth, seq, node))
+
+    def forget(node):
+        nonlocal in_memory
+        while True:
+            node.alive = False
+            in_memory -= 1
+            stats["forgotten"] += 1
+            parent = node.parent
+            parent.live.discard(node.state)
+            if parent.forgotten is None:
+                parent.forgotten = {}
+            parent.forgotten[node.state] = node.f
+            if not parent.live:  # nothing of it left in memory: a leaf again
+                parent.live = None
+                parent.f = max(parent.f, min(parent.forgotten.values()))
+                if parent.f == INF and parent.parent is not None:
+                    node = parent  # a hopeless leaf: drop it as well
+                    continue
+            push(parent)
+            return
+
+    while best_heap:
+        key, _, _, node = heapq.heappop(best_heap)
+        if not node.alive or key != node.open_key():
+            continue  # outdated entry
+        if node.live is None and space.is_goal(node.state):
+            cost = node.g
+            path = []
+            while node is not None:
+                path.append(node.state)
+                node = node.parent
+            path.reverse()
+            return SearchResult(path, cost, stats=stats)
+
+        # Expand a leaf, or bring back the best dropped children of an expanded node.
+        stats["expanded"] += 1
+        regenerating = node.live is not None
+        remembered = node.forgotten or {}
+        live = node.live if regenerating else set()
+        kids = []
+        cheapest = {}  # a state generated more than once from this node: keep its cheapest step
+        for child, cost, h in space.expand(node.state, node.h):
+            stats["generated"] += 1
+            if child not in cheapest or cost < cheapest[child][0]:
+                cheapest[child] = (cost, h)
+        for child, (cost, h) in cheapest.items():
+            if child in live or (regenerating and remembered.get(child) != key) or node.on_path(child):
+                continue
+            f = max(node.f, node.g + cost + h, remembered.pop(child, 0))
+            if f == INF or node.depth + 1 >= max_nodes:  # hopeless, or no room for the path down to it
+                continue
+            g = node.g + cost
+            live.add(child)
+            kids.append(_Node(child, g, h, f, node, node.depth + 1))
+        if not regenerating:
+            node.forgotten = None
+        node.live = live
+        if not live:  # dead end
+            node.live = None
+            node.f = INF
+            if node.parent is None:
+                break
+            forget(node)
+            continue
+        push(node)  # any dropped children still remembered
+        for kid in kids:
+            push(kid)
+        in_memory += len(kids)
+        stats["peak_nodes"] = max(stats["peak_nodes"], in_memory)
+        # Make room, but keep the best new child so that this expansion makes progress.
+        keep = min(kids, key=lambda kid: kid.f) if kids else None
+        held = None
+        while in_memory > max_nodes and worst_heap:
+            entry = heapq.heappop(worst_heap)
+            leaf = entry[3]
+            if leaf is keep:
+                held = entry
+            elif leaf.alive and leaf.live is None and -entry[0] == leaf.f:
+                forget(leaf)
+        if held is not None:
+            heapq.heappush(worst_heap, held)
+        if len(best_heap) > 4 * max_nodes:  # keep outdated heap entries from piling up
+            best_heap = [e for e in best_heap if e[3].alive and e[0] == e[3].open_key()]
+            worst_heap = [e for e in worst_heap if e[3].alive and e[3].live is None and -e[0] == e[3].f]
+            heapq.heapify(best_heap)
+            heapq.heapify(worst_heap)
+    return SearchResult(stats=stats)
@@ -0,0 +1,53 @@
+"""Tests for Shortest_path_service.py (python -m unittest, or pytest)."""
+import contextlib
+import io
+import unittest
+
+from Graph_library import GraphBuilder
+from Shortest_path_service import ShortestPathService, print_answers
+
+
+def small_graph():
+    builder = GraphBuilder(weighted=True)
+    for u, v, w in [("A", "B", 1), ("B", "C", 2), ("A", "C", 5), ("C", "D", 1)]:
+        builder.add_edge(u, v, w)
+    builder.add_node("E")  # isolated
+    return builder.build()
+
+
+class MixedBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.graph = small_graph()
+        self.service = ShortestPathService(self.graph)
+        self.queries = [("A", "D", "dijkstra"), ("A", "Z", "dijkstra"), ("A", "C", "dijkstra"),
+                        ("A", "D", "teleport"), ("Q", "A", "astar"), ("A", "E", "astar"), ("B", "D", "bfs")]
+
+    def test_bad_queries_get_errors_and_the_rest_are_answered(self):
+        results = self.service.batch(self.queries)
+        self.assertEqual(len(results), len(self.queries))
+        self.assertEqual([r.stats.get("error") for r in results],
+                         [None, "unknown node", None, "unknown algorithm", "unknown node", None, None])
+        self.assertEqual(results[0].cost, 4)
+        self.assertEqual(self.graph.path_names(results[2].path), ["A", "B", "C"])
+        self.assertFalse(results[5].found)
+        self.assertEqual(self.graph.path_names(results[6].path), ["B", "C", "D"])
+        self.assertEqual(self.service.last_report["queries"], len(self.queries))
+
+    def test_single_bad_query(self):
+        self.assertEqual(self.service.query("A", "Z").stats["error"], "unknown node")
+        self.assertEqual(self.service.query("A", "B", "nope").stats["error"], "unknown algorithm")
+        self.assertEqual(self.service.query("A", "B").cost, 1)
+
+    def test_printed_answers(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            print_answers(self.graph, self.queries, self.service.batch(self.queries))
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[0], "A D 4 A -> B -> C -> D")
+        self.assertEqual(lines[1], "A Z unknown node")
+        self.assertEqual(lines[3], "A D unknown algorithm")
+        self.assertEqual(lines[5], "A E unreachable")
+
+
+if __name__ == "__main__":
+    unittest.main()
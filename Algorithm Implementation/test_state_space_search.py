@@ -0,0 +1,48 @@
+"""Regression tests for State_space_search.py (python -m unittest, or pytest)."""
+import random
+import unittest
+
+from State_space_search import StateSpace, ida_star, rbfs, sma_star
+
+ALGORITHMS = {"ida_star": ida_star, "rbfs": rbfs, "sma_star": sma_star}
+
+
+class UnsolvableSpaceTest(unittest.TestCase):
+    def test_every_algorithm_reports_not_found(self):
+        # two states swapping forever, the goal never reachable
+        space = StateSpace.from_functions(lambda x: [(1 - x, 1.0)], lambda x: x == 9)
+        for name, search in ALGORITHMS.items():
+            with self.subTest(name):
+                self.assertFalse(search(space, 0).found)
+
+    def test_dead_end(self):
+        space = StateSpace.from_functions(lambda x: [(x + 1, 1.0)] if x < 3 else [], lambda x: x == 9)
+        for name, search in ALGORITHMS.items():
+            with self.subTest(name):
+                self.assertFalse(search(space, 0).found)
+
+
+class DuplicateSuccessorTest(unittest.TestCase):
+    def test_cheapest_duplicate_is_used(self):
+        space = StateSpace.from_functions(lambda x: [(1, 5.0), (1, 1.0)] if x == 0 else [], lambda x: x == 1)
+        for name, search in ALGORITHMS.items():
+            with self.subTest(name):
+                result = search(space, 0)
+                self.assertEqual(result.cost, 1.0)
+                self.assertEqual(result.path, [0, 1])
+
+    def test_random_multigraphs_agree(self):
+        rng = random.Random(0)
+        for trial in range(200):
+            n = rng.randint(2, 8)
+            edges = {u: [(rng.randrange(n), rng.choice([1.0, 2.0, 3.0, 5.0])) for _ in range(rng.randint(0, 4))]
+                     for u in range(n)}
+            space = StateSpace.from_functions(edges.__getitem__, lambda x, goal=n - 1: x == goal)
+            answers = {name: (r.found, r.cost) for name, r in
+                       (("ida_star", ida_star(space, 0)), ("rbfs", rbfs(space, 0)),
+                        ("sma_star", sma_star(space, 0, 10 ** 6)))}
+            self.assertEqual(len(set(answers.values())), 1, (trial, edges, answers))
+
+
+if __name__ == "__main__":
+    unittest.main()